@@ -15,6 +15,7 @@ import pandas as pd
 import streamlit as st
 import matplotlib.pyplot as plt
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
 # Get the directory of this script for proper imports
@@ -25,9 +26,8 @@ if str(SCRIPT_DIR) not in sys.path:
 
 # Import custom data structures
 from data_structures import (
-    LoginLinkedList, CheckInLinkedList, EventLinkedList,
-    GuardNode, flatten_bst_bfs, assign_guards_to_locations,
-    AlertSystem, CampusGraph, create_giki_campus_graph
+    assign_guards_to_locations,
+    dispatch_guards, post_location, plan_evacuation, PATH_TABLE_MAX_NODES
 )
 
 # Import utilities
@@ -35,13 +35,18 @@ from utils import (
     hash_password, verify_password, is_valid_giki_email,
     validate_registration_number, validate_employee_id,
     validate_password_strength, sanitize_input,
-    save_checkins, load_checkins, save_logins, load_logins,
-    save_guards, load_guards, save_alerts, load_alerts,
+    save_checkins, save_logins,
+    load_core_state, JournalReplicator, AlertEscalator,
     detect_faces, save_face_image, train_face_recognizer,
     load_face_recognizer, recognize_face, get_registered_users,
-    sort_reg_numbers, binary_search
+    sort_reg_numbers, binary_search,
+    EXPORT_DIR, CHECKIN_FIELDS, ALERT_FIELDS, EVENT_FIELDS,
+    iter_checkin_records, iter_alert_records, iter_event_records,
+    export_records
 )
 
+from utils.persistence import DATA_DIR
+
 # ============================================================================
 # PAGE CONFIGURATION (Must be first Streamlit command)
 # ============================================================================
@@ -402,18 +407,52 @@ st.markdown("""
 # ============================================================================
 # SESSION STATE INITIALIZATION
 # ============================================================================
+@st.cache_resource
+def load_startup_state() -> dict:
+    """Core state shared by all sessions, each section loaded on first use
+    from the warm-start snapshot
+    """
+    state, _ = load_core_state()
+    return state
+
+
+@st.cache_resource
+def start_replication():
+    """Ship journals to INTRUWATCH_REPLICA_DIR when this terminal is a primary"""
+    replica_dir = os.environ.get("INTRUWATCH_REPLICA_DIR")
+    if not replica_dir:
+        return None
+    replicator = JournalReplicator(DATA_DIR, replica_dir)
+    replicator.start(interval=1.0)
+    return replicator
+
+
+@st.cache_resource
+def start_escalation():
+    """Escalate unacknowledged alerts in the background, shared by all sessions"""
+    core = load_startup_state()
+    escalator = AlertEscalator(core["alert_store"], event_store=core["event_store"])
+    escalator.start(interval=1.0)
+    return escalator
+
+
 def init_session_state():
     """Initialize all session state variables"""
+    core = load_startup_state()
+    start_replication()
+    start_escalation()
     defaults = {
         "logged_in": False,
         "current_user": None,
         "started": False,
-        "login_list": LoginLinkedList(),
-        "checkin_list": CheckInLinkedList(),
-        "event_log": EventLinkedList(max_size=20),
-        "alert_system": AlertSystem(),
-        "guard_tree": GuardNode(),
-        "campus_graph": create_giki_campus_graph(),
+        "login_list": core["login_list"],
+        "checkin_list": core["checkin_list"],
+        "guard_store": core["guard_store"],
+        "alert_store": core["alert_store"],
+        "event_store": core["event_store"],
+        "event_log": core["event_store"].state,
+        "alert_system": core["alert_store"].state,
+        "guard_tree": core["guard_store"].state,
         "face_recognizer": None,
         "face_labels": {},
         "face_capture_count": {}
@@ -423,22 +462,16 @@ def init_session_state():
         if key not in st.session_state:
             st.session_state[key] = value
     
-    # Load persisted data
-    loaded_logins = load_logins()
-    if loaded_logins:
-        st.session_state.login_list = loaded_logins
-    
-    loaded_checkins = load_checkins()
-    if loaded_checkins:
-        st.session_state.checkin_list = loaded_checkins
-    
     # Create default admin if no admins exist
-    if not st.session_state.login_list.head:
-        st.session_state.login_list.insert("admin", hash_password("admin123"), "admin@giki.edu.pk", "admin")
-        save_logins(st.session_state.login_list)
+    login_list = st.session_state.login_list
+    if len(login_list) == 0:
+        with login_list.lock:
+            if len(login_list) == 0:
+                login_list.insert("admin", hash_password("admin123"), "admin@giki.edu.pk", "admin")
+                save_logins(login_list)
     
     # Initialize guards with sample data
-    if st.session_state.guard_tree.guard_id is None:
+    if st.session_state.guard_tree.count_nodes() == 0:
         sample_guards = [
             ("John", 101, "Main Gate"),
             ("Alice", 102, "Library"),
@@ -450,7 +483,7 @@ def init_session_state():
             ("Grace", 108, "Faculty Residence"),
         ]
         for name, gid, duty in sample_guards:
-            st.session_state.guard_tree.insert(name, gid, duty)
+            st.session_state.guard_store.execute("insert", name, gid, duty)
 
 init_session_state()
 
@@ -488,52 +521,43 @@ def login_page():
             username = sanitize_input(username)
             if username and password:
                 password_hash = hash_password(password)
-                # Try new authenticate method, fallback to find for backward compatibility
-                try:
-                    success, user = st.session_state.login_list.authenticate(username, password_hash)
-                    if success:
-                        # Verify email is valid GIKI format
-                        if user.email and is_valid_giki_email(user.email):
-                            st.session_state.logged_in = True
-                            st.session_state.current_user = username
-                            st.session_state.event_log.add_event(f"Operator {username} authenticated")
-                            st.success(f"ACCESS GRANTED - Welcome, {username}")
-                            st.rerun()
-                        else:
-                            # SECURITY ALERT: Invalid email format attempt
-                            st.session_state.alert_system.add_alert(
-                                1,  # High priority
-                                f"SECURITY THREAT: Unverified email login attempt by '{username}'",
-                                "Authentication System"
-                            )
-                            st.session_state.event_log.add_event(f"BLOCKED: Invalid email format for user {username}")
-                            st.error("🚨 AUTHENTICATION BLOCKED - Account email is not verified GIKI format")
-                    else:
-                        # SECURITY ALERT: Failed login attempt
-                        st.session_state.alert_system.add_alert(
-                            2,  # Medium priority
-                            f"Failed login attempt for operator ID: '{username}'",
-                            "Authentication System"
-                        )
-                        st.session_state.event_log.add_event(f"FAILED LOGIN: Invalid credentials for {username}")
-                        st.error("🚨 AUTHENTICATION FAILED - Invalid credentials")
-                except AttributeError:
-                    # Fallback for old data structure - admin bypass only
-                    if username == "admin" and password == "admin123":
+                success, user = st.session_state.login_list.authenticate(username, password_hash)
+                if success and user.email is None and username == "admin":
+                    # Accounts migrated from the legacy login list carry no email;
+                    # only the built-in admin is let through
+                    st.session_state.logged_in = True
+                    st.session_state.current_user = username
+                    st.session_state.event_store.execute("add_event", f"Operator {username} authenticated (legacy)")
+                    st.success(f"ACCESS GRANTED - Welcome, {username}")
+                    st.rerun()
+                elif success:
+                    # Verify email is valid GIKI format
+                    if user.email and is_valid_giki_email(user.email):
                         st.session_state.logged_in = True
                         st.session_state.current_user = username
-                        st.session_state.event_log.add_event(f"Operator {username} authenticated (legacy)")
+                        st.session_state.event_store.execute("add_event", f"Operator {username} authenticated")
                         st.success(f"ACCESS GRANTED - Welcome, {username}")
                         st.rerun()
                     else:
-                        # SECURITY ALERT: Suspicious login with legacy system
-                        st.session_state.alert_system.add_alert(
-                            1,  # High priority - potential breach attempt
-                            f"SUSPICIOUS: Legacy auth attempt by '{username}' - system migration needed",
+                        # SECURITY ALERT: Invalid email format attempt
+                        st.session_state.alert_store.execute(
+                            "add_alert",
+                            1,  # High priority
+                            f"SECURITY THREAT: Unverified email login attempt by '{username}'",
                             "Authentication System"
                         )
-                        st.session_state.event_log.add_event(f"SUSPICIOUS: Legacy login attempt by {username}")
-                        st.error("🚨 AUTHENTICATION FAILED - Please register with a valid GIKI email")
+                        st.session_state.event_store.execute("add_event", f"BLOCKED: Invalid email format for user {username}")
+                        st.error("🚨 AUTHENTICATION BLOCKED - Account email is not verified GIKI format")
+                else:
+                    # SECURITY ALERT: Failed login attempt
+                    st.session_state.alert_store.execute(
+                        "add_alert",
+                        2,  # Medium priority
+                        f"Failed login attempt for operator ID: '{username}'",
+                        "Authentication System"
+                    )
+                    st.session_state.event_store.execute("add_event", f"FAILED LOGIN: Invalid credentials for {username}")
+                    st.error("🚨 AUTHENTICATION FAILED - Invalid credentials")
             else:
                 st.warning("All fields required for authentication")
     
@@ -574,9 +598,17 @@ def login_page():
                     st.error(msg)
                 else:
                     password_hash = hash_password(new_password)
-                    st.session_state.login_list.insert(new_username, password_hash, new_email)
-                    save_logins(st.session_state.login_list)
-                    st.success(f"OPERATOR REGISTERED - {new_username} access granted")
+                    login_list = st.session_state.login_list
+                    # Another session may have taken the name since the check above
+                    with login_list.lock:
+                        registered = not login_list.username_exists(new_username)
+                        if registered:
+                            login_list.insert(new_username, password_hash, new_email)
+                            save_logins(login_list)
+                    if registered:
+                        st.success(f"OPERATOR REGISTERED - {new_username} access granted")
+                    else:
+                        st.error("Operator ID already registered")
 
 # ============================================================================
 # CHECK-IN / CHECK-OUT PAGES
@@ -660,13 +692,17 @@ def checkin_page():
                         validation_passed = False
                 
                 if validation_passed:
-                    st.session_state.checkin_list.insert(
-                        username, reg_no, designation, gender_code, room_no, employee_no
-                    )
-                    save_checkins(st.session_state.checkin_list)
-                    st.session_state.event_log.add_event(f"{designation} {username} checked in via profile")
-                    st.success(f"{designation} {username} successfully checked in!")
-                    st.balloons()
+                    checkin_list = st.session_state.checkin_list
+                    with checkin_list.lock:
+                        checked_in = checkin_list.insert(username, reg_no, designation, gender_code, room_no, employee_no)
+                        if checked_in:
+                            save_checkins(checkin_list)
+                    if checked_in:
+                        st.session_state.event_store.execute("add_event", f"{designation} {username} checked in via profile")
+                        st.success(f"{designation} {username} successfully checked in!")
+                        st.balloons()
+                    else:
+                        st.error(f"DUPLICATE ENTRY: {reg_no} is already checked in")
     
     else:
         # Face recognition check-in
@@ -782,20 +818,24 @@ def checkin_page():
                     
                     if id_valid:
                         st.success("IDENTITY VERIFIED - Entry Authorized")
-                        st.balloons()
                         # Auto check-in on successful verification
-                        st.session_state.checkin_list.insert(
-                            person_name, reg_no, designation, gender_code, room_no, None
-                        )
-                        save_checkins(st.session_state.checkin_list)
-                        st.session_state.event_log.add_event(f"{designation} {person_name} checked in via face recognition")
+                        checkin_list = st.session_state.checkin_list
+                        with checkin_list.lock:
+                            checked_in = checkin_list.insert(person_name, reg_no, designation, gender_code, room_no, None)
+                            if checked_in:
+                                save_checkins(checkin_list)
+                        if checked_in:
+                            st.balloons()
+                            st.session_state.event_store.execute("add_event", f"{designation} {person_name} checked in via face recognition")
+                        else:
+                            st.info(f"{person_name} is already checked in")
                 elif recognized_name:
                     st.warning(f"Face recognized as {recognized_name}, not {person_name}")
-                    st.session_state.alert_system.add_alert(2, f"Identity mismatch: {person_name}", "Main Gate")
+                    st.session_state.alert_store.execute("add_alert", 2, f"Identity mismatch: {person_name}", "Main Gate")
                 else:
                     st.error("INTRUSION ALERT - Unknown Person Detected")
-                    st.session_state.alert_system.add_alert(1, f"Unknown person: {person_name}", "Main Gate")
-                    st.session_state.event_log.add_event(f"Intrusion detected: Unknown person")
+                    st.session_state.alert_store.execute("add_alert", 1, f"Unknown person: {person_name}", "Main Gate")
+                    st.session_state.event_store.execute("add_event", f"Intrusion detected: Unknown person")
 
 def checkout_page():
     """Resident access exit portal"""
@@ -817,9 +857,13 @@ def checkout_page():
     
     if st.button("PROCESS EXIT", use_container_width=True):
         username = sanitize_input(username)
-        if st.session_state.checkin_list.remove(username, identifier, designation, location):
-            save_checkins(st.session_state.checkin_list)
-            st.session_state.event_log.add_event(f"{designation} {username} access revoked")
+        checkin_list = st.session_state.checkin_list
+        with checkin_list.lock:
+            checked_out = checkin_list.remove(username, identifier, designation, location)
+            if checked_out:
+                save_checkins(checkin_list)
+        if checked_out:
+            st.session_state.event_store.execute("add_event", f"{designation} {username} access revoked")
             st.success(f"ACCESS REVOKED - {designation} {username} exit processed")
         else:
             st.error("NO MATCH FOUND - Verify credentials")
@@ -1184,12 +1228,11 @@ def alerts_page():
     with st.form("alert_form"):
         message = st.text_input("Threat Description")
         priority = st.selectbox("Severity Level", [1, 2, 3], format_func=lambda x: f"LEVEL {x} - {'CRITICAL' if x==1 else 'WARNING' if x==2 else 'NOTICE'}")
-        location = st.selectbox("Affected Zone", st.session_state.campus_graph.get_all_locations())
+        location = st.selectbox("Affected Zone", load_startup_state()["graph_store"].state.get_all_locations())
         
         if st.form_submit_button("SUBMIT ALERT"):
             if message:
-                st.session_state.alert_system.add_alert(priority, sanitize_input(message), location)
-                save_alerts(st.session_state.alert_system)
+                st.session_state.alert_store.execute("add_alert", priority, sanitize_input(message), location)
                 st.success("ALERT REGISTERED - Dispatching to security personnel")
     
     st.markdown("---")
@@ -1201,13 +1244,87 @@ def alerts_page():
     </h3>
     """, unsafe_allow_html=True)
     
-    alerts_data = st.session_state.alert_system.to_dataframe_format()
+    alert_system = st.session_state.alert_system
+    # Only the most urgent alerts are rendered; the rest stay in the heap
+    alerts_data = alert_system.to_dataframe_format(limit=200)
     if alerts_data:
         df = pd.DataFrame(alerts_data)
         st.dataframe(df, use_container_width=True)
+        if alert_system.count_alerts() > len(alerts_data):
+            st.caption(f"Showing the {len(alerts_data)} most urgent of {alert_system.count_alerts()} active alerts")
+        
+        # Act on a single alert by ID
+        action_col1, action_col2, action_col3, action_col4 = st.columns(4)
+        with action_col1:
+            alert_id = st.number_input("Alert ID", min_value=0, step=1, value=int(alerts_data[0]["ID"]), key="alert_action_id")
+        with action_col2:
+            if st.button("ACKNOWLEDGE", use_container_width=True):
+                if st.session_state.alert_store.execute("acknowledge", int(alert_id)):
+                    start_escalation().cancel(int(alert_id))
+                    st.session_state.event_store.execute("add_event", f"Alert {int(alert_id)} acknowledged by {st.session_state.current_user}")
+                    st.rerun()
+                st.error("NO MATCH - Alert not found")
+        with action_col3:
+            if st.button("ESCALATE", use_container_width=True):
+                if st.session_state.alert_store.execute("escalate", int(alert_id)):
+                    st.session_state.event_store.execute("add_event", f"Alert {int(alert_id)} escalated by {st.session_state.current_user}")
+                    st.rerun()
+                st.error("Alert not found or already critical")
+        with action_col4:
+            if st.button("RESOLVE", use_container_width=True):
+                if st.session_state.alert_store.execute("resolve", int(alert_id)):
+                    start_escalation().cancel(int(alert_id))
+                    st.session_state.event_store.execute("add_event", f"Alert {int(alert_id)} resolved by {st.session_state.current_user}")
+                    st.rerun()
+                st.error("NO MATCH - Alert not found")
+        
+        # Nearest guard posts to the selected alert, from one Dijkstra search
+        selected = alert_system.get_alert(int(alert_id))
+        graph = load_startup_state()["graph_store"].state
+        if selected is not None and selected.location in graph.adjacency:
+            posts = {}
+            for node in st.session_state.guard_tree.iter_inorder():
+                post = post_location(node.duty, graph.adjacency)
+                if post is not None:
+                    posts.setdefault(post, node.name)
+            nearest = graph.find_k_nearest(selected.location, list(posts), k=3)
+            if nearest:
+                st.markdown("**Nearest Responders**")
+                st.dataframe(pd.DataFrame([
+                    {"Guard": posts[post], "Post": post, "Distance (m)": distance, "Route": " → ".join(path)}
+                    for post, distance, path in nearest
+                ]), use_container_width=True)
+        
+        # One guard per alert, minimizing total priority-weighted distance
+        dispatch = dispatch_guards(
+            graph, ((node.name, node.duty) for node in st.session_state.guard_tree.iter_inorder()), alert_system
+        )
+        if dispatch:
+            st.markdown("**Optimal Dispatch**")
+            st.dataframe(pd.DataFrame([
+                {"Alert ID": alert.alert_id, "Priority": alert.priority, "Location": alert.location,
+                 "Guard": guard, "Post": post, "Distance (m)": distance}
+                for alert, guard, post, distance in dispatch
+            ]), use_container_width=True)
+        
+        escalator = start_escalation()
+        st.caption(
+            f"Auto-escalation: {escalator.pending()} alerts pending; unacknowledged alerts move up a level after "
+            + ", ".join(f"{seconds // 60:.0f} min at level {level}" for level, seconds in sorted(escalator.deadlines.items(), reverse=True))
+        )
+        
+        with st.expander("ALERT COALESCING"):
+            window = st.number_input(
+                "Merge repeats within (minutes, 0 = off)", min_value=0, step=1,
+                value=int(alert_system.coalesce_window // 60), key="coalesce_window"
+            )
+            if st.button("APPLY WINDOW") and window * 60 != alert_system.coalesce_window:
+                st.session_state.alert_store.execute("set_coalesce_window", window * 60)
+                st.session_state.event_store.execute("add_event", f"Alert coalescing window set to {window} min")
+                st.rerun()
         
         # Priority distribution
-        counts = st.session_state.alert_system.count_by_priority()
+        counts = alert_system.count_by_priority()
         st.markdown("**Threat Level Distribution**")
         st.bar_chart({"Critical": counts[1], "Warning": counts[2], "Notice": counts[3]})
     else:
@@ -1241,9 +1358,10 @@ def guards_page():
         
         if st.button("REGISTER", use_container_width=True):
             if name and duty:
-                st.session_state.guard_tree.insert(sanitize_input(name), int(guard_id), sanitize_input(duty))
-                save_guards(st.session_state.guard_tree)
-                st.success(f"REGISTERED - {name} added to system")
+                if st.session_state.guard_store.execute("insert", sanitize_input(name), int(guard_id), sanitize_input(duty)):
+                    st.success(f"REGISTERED - {name} added to system")
+                else:
+                    st.error(f"DUPLICATE - Badge ID {int(guard_id)} is already registered")
     
     with col2:
         st.markdown("""
@@ -1258,6 +1376,20 @@ def guards_page():
                 st.success(f"FOUND: {result.name} - Zone: {result.duty}")
             else:
                 st.error("NO MATCH - Personnel not found")
+        if st.button("DECOMMISSION", use_container_width=True):
+            if st.session_state.guard_store.execute("delete", int(search_id)):
+                st.success(f"REMOVED - Badge ID {int(search_id)} decommissioned")
+            else:
+                st.error("NO MATCH - Personnel not found")
+        
+        st.markdown("**Badge Range**")
+        range_col1, range_col2 = st.columns(2)
+        with range_col1:
+            range_lo = st.number_input("From Badge ID", min_value=1, step=1, value=101, key="badge_range_lo")
+        with range_col2:
+            range_hi = st.number_input("To Badge ID", min_value=1, step=1, value=199, key="badge_range_hi")
+        in_range = st.session_state.guard_tree.count_in_range(int(range_lo), int(range_hi))
+        st.info(f"{in_range} personnel registered in badge block {int(range_lo)}-{int(range_hi)}")
     
     st.markdown("---")
     
@@ -1267,7 +1399,17 @@ def guards_page():
         ACTIVE ROSTER (Sorted by ID)
     </h3>
     """, unsafe_allow_html=True)
-    guards = st.session_state.guard_tree.inorder()
+    guard_tree = st.session_state.guard_tree
+    page_size = 50
+    pages = max(1, -(-guard_tree.count_nodes() // page_size))
+    roster_page = 1
+    if pages > 1:
+        roster_page = st.number_input("Roster Page", min_value=1, max_value=pages, value=1, step=1, key="roster_page")
+    # Resume after the last badge of the previous page - O(log n) to seek
+    start_after = None
+    if roster_page > 1:
+        start_after = guard_tree.select((roster_page - 1) * page_size - 1).guard_id
+    guards = guard_tree.page(start_after=start_after, limit=page_size)
     if guards:
         df = pd.DataFrame(guards, columns=["Name", "Badge ID", "Zone"])
         st.dataframe(df, use_container_width=True)
@@ -1481,11 +1623,10 @@ def analytics_page():
     
     with col7:
         st.markdown("**Guard Deployment**")
-        guards = st.session_state.guard_tree.inorder()
-        if guards:
+        if st.session_state.guard_tree.count_nodes():
             guard_locations = {}
-            for name, gid, duty in guards:
-                guard_locations[duty] = guard_locations.get(duty, 0) + 1
+            for node in st.session_state.guard_tree.iter_inorder():
+                guard_locations[node.duty] = guard_locations.get(node.duty, 0) + 1
             
             fig7, ax7 = plt.subplots(figsize=(8, 5))
             ax7.barh(list(guard_locations.keys()), list(guard_locations.values()), color='#00ff88')
@@ -1522,7 +1663,10 @@ def graph_page():
     """, unsafe_allow_html=True)
     st.markdown("### Campus Navigation Map")
     
-    graph = st.session_state.campus_graph
+    graph_store = load_startup_state()["graph_store"]
+    graph = graph_store.state
+    if graph.source_error:
+        st.error(f"Campus map could not be loaded, showing the built-in campus instead - {graph.source_error}")
     
     col1, col2 = st.columns(2)
     
@@ -1532,11 +1676,36 @@ def graph_page():
         start = st.selectbox("From", locations, key="start_loc")
         end = st.selectbox("To", locations, key="end_loc")
         
+        methods = ["Dijkstra", "A*", "Bidirectional A*"]
+        # The all-pairs table takes O(V^2) memory, so only small maps offer it
+        if len(locations) <= PATH_TABLE_MAX_NODES:
+            methods.append("Precomputed table")
+        method = st.radio("Method", methods, horizontal=True, key="path_method")
+        alternatives = st.number_input("Backup routes", min_value=0, max_value=5, value=0, key="backup_routes")
+        
         if st.button("Find Path"):
-            distance, path = graph.dijkstra(start, end)
+            stats = {}
+            if not graph.is_reachable(start, end):
+                distance, path = float('inf'), []
+            elif method == "Dijkstra":
+                distance, path = graph.dijkstra(start, end)
+            elif method == "Precomputed table":
+                distance, path = graph.shortest_path(start, end)
+            else:
+                distance, path = graph.astar(start, end, bidirectional=(method == "Bidirectional A*"), stats=stats)
             if distance != float('inf'):
-                st.success(f"Distance: {distance}m")
+                st.success(f"Distance: {distance:g}m")
                 st.info(f"Path: {' → '.join(path)}")
+                if stats:
+                    st.caption(f"Expanded {stats['expanded']} of {len(locations)} locations")
+                    if 0 < graph.heuristic_scale() < 1:
+                        st.caption(f"Some paths are shorter than their straight-line distance; heuristic scaled by {graph.heuristic_scale():.3f}")
+                # Next-shortest loopless routes, computed only as far as asked
+                backups = list(islice(graph.k_shortest_paths(start, end), 1, 1 + alternatives))
+                for rank, (backup_distance, backup_path) in enumerate(backups, start=1):
+                    st.caption(f"Backup {rank}: {backup_distance:g}m - {' → '.join(backup_path)}")
+                if len(backups) < alternatives:
+                    st.caption(f"Only {len(backups)} backup route(s) exist")
             else:
                 st.error("No path found")
     
@@ -1549,6 +1718,162 @@ def graph_page():
         if st.button("DFS from Main Gate"):
             dfs_result = graph.dfs_traversal("Main Gate")
             st.write(dfs_result)
+    
+    st.markdown("### Chokepoints")
+    connectivity = graph.connectivity()
+    chokepoints = connectivity.articulation_points()
+    bridges = connectivity.bridges()
+    col7, col8 = st.columns(2)
+    with col7:
+        st.markdown("**Single-Point-of-Failure Locations**")
+        if chokepoints:
+            st.warning(", ".join(chokepoints))
+        else:
+            st.success("No single location can cut the campus apart")
+    with col8:
+        st.markdown("**Single-Route Paths**")
+        if bridges:
+            st.dataframe(pd.DataFrame(bridges, columns=["From", "To"]), use_container_width=True)
+        else:
+            st.success("Every path has an alternative")
+    if connectivity.component_count > 1:
+        st.error(f"Campus split into {connectivity.component_count} disconnected areas: " + " | ".join(
+            ", ".join(group) for group in connectivity.components()[1:]
+        ) + " cut off")
+    
+    st.markdown("### Path Closures")
+    col3, col4 = st.columns(2)
+    
+    with col3:
+        st.subheader("Update Path")
+        loc1 = st.selectbox("Between", locations, key="closure_loc1")
+        neighbors = sorted({neighbor for neighbor, _ in graph.get_neighbors(loc1)})
+        loc2 = st.selectbox("And", neighbors, key="closure_loc2")
+        weight = st.number_input("Distance (m)", min_value=1.0, value=100.0, step=10.0, key="closure_weight")
+        b1, b2 = st.columns(2)
+        with b1:
+            if st.button("CLOSE PATH", disabled=loc2 is None):
+                if graph_store.execute("close_path", loc1, loc2):
+                    st.session_state.event_store.execute("add_event", f"Path closed: {loc1} - {loc2}")
+                st.rerun()
+        with b2:
+            if st.button("SET DISTANCE", disabled=loc2 is None):
+                if graph_store.execute("set_weight", loc1, loc2, weight):
+                    st.session_state.event_store.execute("add_event", f"Path {loc1} - {loc2} set to {weight:g}m")
+                st.rerun()
+    
+    with col4:
+        st.subheader("Closed Paths")
+        closed = graph.closed_paths()
+        if not closed:
+            st.info("All paths open")
+        for a, b, distance in closed:
+            if st.button(f"REOPEN {a} - {b} ({distance:g}m)", key=f"reopen_{a}_{b}"):
+                if graph_store.execute("reopen_path", a, b):
+                    st.session_state.event_store.execute("add_event", f"Path reopened: {a} - {b}")
+                st.rerun()
+    
+    st.markdown("### Evacuation Planner")
+    col5, col6 = st.columns(2)
+    
+    with col5:
+        st.subheader("Walkway Capacity")
+        cap_loc1 = st.selectbox("Between", locations, key="capacity_loc1")
+        cap_neighbors = sorted({neighbor for neighbor, _ in graph.get_neighbors(cap_loc1)})
+        cap_loc2 = st.selectbox("And", cap_neighbors, key="capacity_loc2")
+        capacity = st.number_input(
+            "People per minute", min_value=0.0, step=10.0, key="capacity_value",
+            value=float(graph.capacity(cap_loc1, cap_loc2)) if cap_loc2 else 60.0
+        )
+        if st.button("SET CAPACITY", disabled=cap_loc2 is None):
+            graph_store.execute("set_capacity", cap_loc1, cap_loc2, capacity)
+            st.session_state.event_store.execute(
+                "add_event", f"Path {cap_loc1} - {cap_loc2} capacity set to {capacity:g}/min"
+            )
+            st.rerun()
+    
+    with col6:
+        st.subheader("Hostel Evacuation")
+        # Residences are checked in as D/E/F; map them to their graph locations
+        occupancy = {}
+        for room, people in st.session_state.checkin_list.count_by_room().items():
+            location = room if room in graph.adjacency else f"Faculty Residence {room}"
+            if location in graph.adjacency:
+                occupancy[location] = occupancy.get(location, 0) + people
+        plan = plan_evacuation(graph, occupancy if occupancy else None)
+        st.metric("Evacuation Rate", f"{plan.rate:g} people/min")
+        if occupancy:
+            st.caption(f"{sum(plan.occupancy.values())} residents checked in; at least {plan.clearance_minutes:.1f} min to clear")
+        else:
+            st.caption("No residents checked in; showing capacity from all hostels")
+        st.caption("Per exit: " + ", ".join(f"{exit} {flow:g}/min" for exit, flow in plan.exits.items()))
+        if plan.bottlenecks:
+            st.markdown("**Bottleneck Walkways**")
+            st.dataframe(pd.DataFrame([
+                {"From": loc1, "To": loc2, "Capacity (people/min)": capacity}
+                for loc1, loc2, capacity in plan.bottlenecks
+            ]), use_container_width=True)
+
+# ============================================================================
+# RECORDS EXPORT (Streaming NDJSON/CSV)
+# ============================================================================
+def export_page():
+    """Stream registry, alert and event records to an export file"""
+    st.markdown("""
+    <h3 style="font-family: 'Orbitron', monospace; color: #00c8ff;">
+        RECORDS EXPORT
+    </h3>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        dataset = st.selectbox("Dataset", ["Personnel Registry", "Active Alerts", "Event Log"], key="export_dataset")
+    with col2:
+        fmt = st.selectbox("Format", ["ndjson", "csv"], key="export_format")
+    
+    if dataset == "Personnel Registry":
+        designation = st.selectbox("Designation", ["All", "Student", "Faculty", "Other"], key="export_designation")
+        records = iter_checkin_records(
+            st.session_state.checkin_list,
+            designation=None if designation == "All" else designation
+        )
+        fieldnames, name = CHECKIN_FIELDS, "registry"
+    else:
+        col3, col4 = st.columns(2)
+        with col3:
+            since = st.date_input("From", value=None, key="export_since")
+        with col4:
+            until = st.date_input("Until", value=None, key="export_until")
+        since = datetime.combine(since, datetime.min.time()) if since else None
+        until = datetime.combine(until, datetime.max.time()) if until else None
+        
+        if dataset == "Active Alerts":
+            priority = st.selectbox("Severity Level", ["All", 1, 2, 3], key="export_priority")
+            records = iter_alert_records(
+                st.session_state.alert_system,
+                priority=None if priority == "All" else priority,
+                since=since, until=until
+            )
+            fieldnames, name = ALERT_FIELDS, "alerts"
+        else:
+            records = iter_event_records(st.session_state.event_log, since=since, until=until)
+            fieldnames, name = EVENT_FIELDS, "events"
+    
+    if st.button("GENERATE EXPORT", use_container_width=True):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = EXPORT_DIR / f"{name}_{timestamp}.{fmt}"
+        count = export_records(records, path, fmt, fieldnames)
+        st.session_state.export_path = str(path)
+        st.success(f"EXPORT READY - {count} records written to {path}")
+    
+    export_path = st.session_state.get("export_path")
+    if export_path and Path(export_path).exists():
+        with open(export_path, "rb") as f:
+            st.download_button(
+                "DOWNLOAD EXPORT", f, file_name=Path(export_path).name,
+                mime="text/csv" if export_path.endswith(".csv") else "application/x-ndjson",
+                use_container_width=True
+            )
 
 # ============================================================================
 # ABOUT PAGE
@@ -1757,7 +2082,7 @@ def main():
         """, unsafe_allow_html=True)
         
         if st.sidebar.button("TERMINATE SESSION", use_container_width=True):
-            st.session_state.event_log.add_event(f"Operator {st.session_state.current_user} session terminated")
+            st.session_state.event_store.execute("add_event", f"Operator {st.session_state.current_user} session terminated")
             st.session_state.logged_in = False
             st.session_state.current_user = None
             st.rerun()
@@ -1791,6 +2116,33 @@ def main():
                 st.dataframe(df, use_container_width=True)
             else:
                 st.info("No events recorded in system logs")
+            
+            event_log = st.session_state.event_log
+            with st.expander(f"FULL HISTORY ({event_log.history_size()} events)"):
+                page_size = 50
+                pages = max(1, -(-event_log.history_size() // page_size))
+                page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key="event_history_page")
+                history = event_log.get_history(offset=(page - 1) * page_size, limit=page_size)
+                if history:
+                    st.dataframe(pd.DataFrame({
+                        "Time": [node.timestamp for node in history],
+                        "Event": [node.data for node in history]
+                    }), use_container_width=True)
+                st.caption(f"Page {page} of {pages}, newest first")
+            
+            export_page()
+            
+            replicator = start_replication()
+            if replicator is not None:
+                with st.expander("STANDBY REPLICATION"):
+                    lag = replicator.lag()
+                    st.dataframe(pd.DataFrame.from_dict(lag, orient="index"), use_container_width=True)
+                    st.caption(f"Replica: {replicator.replica_dir}")
+            
+            with st.expander("STARTUP PROFILE"):
+                profile = load_startup_state().loader.timings
+                st.dataframe(pd.DataFrame(profile), use_container_width=True)
+                st.caption(f"Total: {sum(row['Load (ms)'] for row in profile):.1f} ms")
     
     # Pre-login navigation (Public Mode)
     else:
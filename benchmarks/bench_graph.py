@@ -0,0 +1,132 @@
+# Routing Engine Benchmark for IntruWatch
+#
+# Builds synthetic square walkway grids as GeoJSON (one LineString per row
+# and column, so junctions are only shared through coordinate snapping),
+# loads them with the campus map loader and times Dijkstra on the CSR view
+# against the same search on the adjacency dict (the layout it used before
+# the CSR view), then BFS and DFS, which run on the adjacency dict.
+#
+# Usage: python benchmarks/bench_graph.py [--sizes 1000 10000 100000] [--spacing 10]
+
+import argparse
+import heapq
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.graph_loader import METERS_PER_DEGREE, load_geojson
+
+
+ORIGIN = (34.0691, 72.6441)     # Main Gate
+
+
+def grid_geojson(side: int, spacing: float) -> dict:
+    """side x side junctions ``spacing`` meters apart"""
+    lat0, lon0 = ORIGIN
+    dlat = spacing / METERS_PER_DEGREE
+    dlon = dlat / math.cos(math.radians(lat0))
+    rows = [[[lon0 + j * dlon, lat0 + i * dlat] for j in range(side)] for i in range(side)]
+    cols = [[[lon0 + j * dlon, lat0 + i * dlat] for i in range(side)] for j in range(side)]
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "properties": {}, "geometry": {"type": "LineString", "coordinates": line}}
+            for line in rows + cols
+        ]
+    }
+
+
+Adjacency = Dict[str, List[Tuple[str, float]]]
+
+
+def dict_dijkstra(adjacency: Adjacency, start: str, end: str) -> Tuple[float, List[str]]:
+    """Baseline: Dijkstra over the adjacency dict with name-keyed maps"""
+    distances = {loc: float('inf') for loc in adjacency}
+    distances[start] = 0
+    previous = {loc: None for loc in adjacency}
+    pq = [(0, start)]
+    visited = set()
+    while pq:
+        current_dist, current_node = heapq.heappop(pq)
+        if current_node in visited:
+            continue
+        visited.add(current_node)
+        if current_node == end:
+            break
+        for neighbor, weight in adjacency[current_node]:
+            if neighbor in visited:
+                continue
+            new_dist = current_dist + weight
+            if new_dist < distances[neighbor]:
+                distances[neighbor] = new_dist
+                previous[neighbor] = current_node
+                heapq.heappush(pq, (new_dist, neighbor))
+    path = []
+    node = end
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    path.reverse()
+    return distances[end], path
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def run(size: int, spacing: float) -> dict:
+    side = max(2, round(math.sqrt(size)))
+    document = grid_geojson(side, spacing)
+    graph, load_time = timed(lambda: load_geojson(document))
+    locations = graph.get_all_locations()
+    start, end = locations[0], locations[-1]
+    
+    adjacency = graph.adjacency
+    (base_distance, _), dict_dijkstra_time = timed(lambda: dict_dijkstra(adjacency, start, end))
+    csr, csr_time = timed(graph.csr)
+    (distance, path), dijkstra_time = timed(lambda: graph.dijkstra(start, end))
+    assert math.isclose(distance, base_distance)
+    bfs, bfs_time = timed(lambda: graph.bfs_traversal(start))
+    dfs, dfs_time = timed(lambda: graph.dfs_traversal(start))
+    assert len(bfs) == len(dfs) == len(locations)
+    return {
+        "nodes": len(locations),
+        "edges": graph.get_edge_count(),
+        "load": load_time,
+        "csr": csr_time,
+        "csr_mb": csr.nbytes / 2 ** 20,
+        "dijkstra": (dict_dijkstra_time, dijkstra_time),
+        "bfs": bfs_time,
+        "dfs": dfs_time,
+        "distance": distance
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark campus routing on synthetic grids")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Approximate node counts")
+    parser.add_argument("--spacing", type=float, default=10.0, help="Meters between junctions")
+    args = parser.parse_args()
+    
+    # Dijkstra column is dict s / CSR s (speedup)
+    header = (f"{'nodes':>8} {'edges':>8} {'load s':>8} {'csr s':>8} {'csr MB':>7} "
+              f"{'dijkstra':>23} {'bfs s':>8} {'dfs s':>8}")
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        r = run(size, args.spacing)
+        before, after = r['dijkstra']
+        dijkstra = f"{before:.3f}/{after:.3f} ({before / after:.1f}x)"
+        print(f"{r['nodes']:>8} {r['edges']:>8} {r['load']:>8.3f} {r['csr']:>8.3f} {r['csr_mb']:>7.2f} "
+              f"{dijkstra:>23} {r['bfs']:>8.3f} {r['dfs']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
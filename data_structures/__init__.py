@@ -9,24 +9,51 @@ from .linked_list import (
     EventLinkedList
 )
 
+from .credentials import (
+    CredentialRecord,
+    CredentialStore
+)
+
 from .bst import (
     GuardNode,
+    GuardTree,
+    iter_bst_bfs,
     flatten_bst_bfs,
     assign_guards_to_locations
 )
 
-from .heap import AlertSystem
+from .expiring_map import ExpiringMap
+
+from .timer_wheel import Timer, TimerWheel
+
+from .heap import Alert, AlertSystem, alert_template
+
+from .csr import CSRGraph
+
+from .connectivity import ConnectivityIndex
+
+from .shortest_paths import PATH_TABLE_MAX_NODES, ShortestPathTable
 
 from .graph import (
     CampusGraph,
+    haversine,
     create_giki_campus_graph
 )
 
+from .dispatch import PRIORITY_WEIGHTS, post_location, solve_assignment, dispatch_guards
+
+from .flow import EVACUATION_SOURCES, EVACUATION_EXITS, FlowNetwork, EvacuationPlan, plan_evacuation
+
 __all__ = [
     'LoginNode', 'LoginLinkedList',
     'CheckInNode', 'CheckInLinkedList',
     'EventNode', 'EventLinkedList',
-    'GuardNode', 'flatten_bst_bfs', 'assign_guards_to_locations',
-    'AlertSystem',
-    'CampusGraph', 'create_giki_campus_graph'
+    'CredentialRecord', 'CredentialStore',
+    'GuardNode', 'GuardTree', 'iter_bst_bfs', 'flatten_bst_bfs', 'assign_guards_to_locations',
+    'ExpiringMap', 'Timer', 'TimerWheel',
+    'Alert', 'AlertSystem', 'alert_template',
+    'CSRGraph', 'ConnectivityIndex', 'ShortestPathTable', 'PATH_TABLE_MAX_NODES',
+    'CampusGraph', 'haversine', 'create_giki_campus_graph',
+    'PRIORITY_WEIGHTS', 'post_location', 'solve_assignment', 'dispatch_guards',
+    'EVACUATION_SOURCES', 'EVACUATION_EXITS', 'FlowNetwork', 'EvacuationPlan', 'plan_evacuation'
 ]
@@ -1,6 +1,8 @@
-# Binary Search Tree for Guard Management
+# Binary Search Trees for Guard Management
 
-from typing import Optional, List, Tuple
+from collections import deque
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
 
 
 class GuardNode:
@@ -11,6 +13,9 @@ class GuardNode:
         self.duty = duty
         self.left: Optional[GuardNode] = None
         self.right: Optional[GuardNode] = None
+        # Only maintained for nodes owned by a GuardTree
+        self.height = 1
+        self.size = 1       # Guards in this subtree
     
     def insert(self, name: str, guard_id: int, duty: str) -> None:
         """Insert a new guard into the BST"""
@@ -98,37 +103,356 @@ class GuardNode:
         return count
 
 
-def flatten_bst_bfs(root: Optional[GuardNode]) -> List[GuardNode]:
-    """BFS traversal - flatten BST to list (level order)"""
-    if not root or root.guard_id is None:
-        return []
+def _height(node: Optional[GuardNode]) -> int:
+    return node.height if node is not None else 0
+
+
+def _size(node: Optional[GuardNode]) -> int:
+    return node.size if node is not None else 0
+
+
+def _update(node: GuardNode) -> None:
+    node.height = 1 + max(_height(node.left), _height(node.right))
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+
+def _rotate_right(node: GuardNode) -> GuardNode:
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+def _rotate_left(node: GuardNode) -> GuardNode:
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+def _rebalance(node: GuardNode) -> GuardNode:
+    """Restore the AVL invariant at a node, returning the subtree's new root"""
+    _update(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
+
+
+class GuardTree:
+    """Self-balancing (AVL) guard registry keyed by badge ID
+    
+    Same interface as GuardNode, but insert, find and delete are iterative
+    and O(log n) even when IDs are issued sequentially. Nodes are
+    GuardNode objects, so find() results and flatten_bst_bfs work as before.
+    Each node also stores its subtree size, which makes count_nodes O(1)
+    and select/rank/count_in_range O(log n).
+    """
+    
+    def __init__(self):
+        self.root: Optional[GuardNode] = None
+    
+    @classmethod
+    def from_node(cls, root: Optional[GuardNode]) -> 'GuardTree':
+        """Migrate a plain (possibly degenerate) GuardNode BST"""
+        guards = []
+        stack = [root] if root is not None else []
+        while stack:
+            node = stack.pop()
+            if node.name is not None:
+                guards.append((node.name, node.guard_id, node.duty))
+            if node.left:
+                stack.append(node.left)
+            if node.right:
+                stack.append(node.right)
+        guards.sort(key=lambda guard: guard[1])
+        tree = cls()
+        tree._build(guards)
+        return tree
+    
+    def _build(self, guards: List[Tuple[str, int, str]]) -> None:
+        """Build a perfectly balanced tree from guards sorted by ID - O(n)"""
+        def build(lo: int, hi: int) -> Optional[GuardNode]:
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = GuardNode(*guards[mid])
+            node.left = build(lo, mid)
+            node.right = build(mid + 1, hi)
+            _update(node)
+            return node
+        
+        # Recursion depth is log2(n), not n
+        self.root = build(0, len(guards))
+    
+    def __getstate__(self) -> dict:
+        # Pickle as a sorted flat list; rebuilding from it is O(n)
+        return {"guards": self.inorder()}
+    
+    def __setstate__(self, state: dict) -> None:
+        self.__init__()
+        self._build(state["guards"])
+    
+    def insert(self, name: str, guard_id: int, duty: str) -> bool:
+        """Insert a new guard - O(log n)
+        
+        Returns:
+            False if the badge ID is already registered
+        """
+        path = []
+        current = self.root
+        while current is not None:
+            if guard_id == current.guard_id:
+                return False
+            path.append(current)
+            current = current.left if guard_id < current.guard_id else current.right
+        
+        new_node = GuardNode(name, guard_id, duty)
+        if not path:
+            self.root = new_node
+        elif guard_id < path[-1].guard_id:
+            path[-1].left = new_node
+        else:
+            path[-1].right = new_node
+        self._retrace(path)
+        return True
+    
+    def delete(self, guard_id: int) -> bool:
+        """Remove a guard by badge ID - O(log n)"""
+        path = []
+        current = self.root
+        while current is not None and current.guard_id != guard_id:
+            path.append(current)
+            current = current.left if guard_id < current.guard_id else current.right
+        if current is None:
+            return False
+        
+        parent = path[-1] if path else None
+        if current.left is not None and current.right is not None:
+            # Unlink the in-order successor and move that node into the
+            # deleted node's place, so every other node keeps its identity
+            index = len(path)
+            path.append(current)
+            above, successor = current, current.right
+            while successor.left is not None:
+                path.append(successor)
+                above, successor = successor, successor.left
+            if above is current:
+                above.right = successor.right
+            else:
+                above.left = successor.right
+            successor.left, successor.right = current.left, current.right
+            path[index] = successor
+            replacement = successor
+        else:
+            replacement = current.left if current.left is not None else current.right
+        
+        if parent is None:
+            self.root = replacement
+        elif parent.left is current:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+        self._retrace(path)
+        return True
+    
+    def _retrace(self, path: List[GuardNode]) -> None:
+        """Rebalance and resize the nodes on a root-to-leaf path, bottom-up"""
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            subtree = _rebalance(node)
+            if subtree is node:
+                continue
+            if i == 0:
+                self.root = subtree
+            elif path[i - 1].left is node:
+                path[i - 1].left = subtree
+            else:
+                path[i - 1].right = subtree
+    
+    def find(self, target_id: int) -> Optional[GuardNode]:
+        """Binary search for a guard by ID - O(log n)"""
+        current = self.root
+        while current is not None:
+            if target_id == current.guard_id:
+                return current
+            current = current.left if target_id < current.guard_id else current.right
+        return None
+    
+    def get_min(self) -> Optional[GuardNode]:
+        """Get guard with minimum ID"""
+        current = self.root
+        while current is not None and current.left is not None:
+            current = current.left
+        return current
+    
+    def get_max(self) -> Optional[GuardNode]:
+        """Get guard with maximum ID"""
+        current = self.root
+        while current is not None and current.right is not None:
+            current = current.right
+        return current
     
-    queue = [root]
-    result = []
+    def count_nodes(self) -> int:
+        """Count total guards - O(1)"""
+        return _size(self.root)
+    
+    def __len__(self) -> int:
+        return _size(self.root)
+    
+    def select(self, k: int) -> Optional[GuardNode]:
+        """k-th guard in badge order, counting from 0 - O(log n)"""
+        if k < 0 or k >= _size(self.root):
+            return None
+        current = self.root
+        while current is not None:
+            left = _size(current.left)
+            if k < left:
+                current = current.left
+            elif k == left:
+                return current
+            else:
+                k -= left + 1
+                current = current.right
+        return None
+    
+    def rank(self, guard_id: int, inclusive: bool = False) -> int:
+        """Number of guards with a lower badge ID (or equal, if inclusive) - O(log n)"""
+        count = 0
+        current = self.root
+        while current is not None:
+            if guard_id < current.guard_id or (guard_id == current.guard_id and not inclusive):
+                current = current.left
+            else:
+                count += _size(current.left) + 1
+                current = current.right
+        return count
+    
+    def count_in_range(self, lo: int, hi: int) -> int:
+        """Number of guards with lo <= badge ID <= hi - O(log n)"""
+        if lo > hi:
+            return 0
+        return self.rank(hi, inclusive=True) - self.rank(lo)
+    
+    def iter_inorder(self, start_after: int = None) -> Iterator[GuardNode]:
+        """Yield guards in badge order without building a list
+        
+        Args:
+            start_after: Resume after this badge ID (for pagination); the
+                first node is reached in O(log n)
+        """
+        stack = []
+        current = self.root
+        while current is not None:
+            if start_after is None or current.guard_id > start_after:
+                stack.append(current)
+                current = current.left
+            else:
+                current = current.right
+        while stack:
+            node = stack.pop()
+            yield node
+            current = node.right
+            while current is not None:
+                stack.append(current)
+                current = current.left
+    
+    def iter_preorder(self) -> Iterator[GuardNode]:
+        """Yield guards root-first"""
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+    
+    def iter_postorder(self) -> Iterator[GuardNode]:
+        """Yield guards children-first"""
+        stack = []
+        last = None
+        current = self.root
+        while stack or current is not None:
+            if current is not None:
+                stack.append(current)
+                current = current.left
+                continue
+            node = stack[-1]
+            if node.right is not None and node.right is not last:
+                current = node.right
+            else:
+                stack.pop()
+                yield node
+                last = node
+    
+    def iter_level_order(self) -> Iterator[GuardNode]:
+        """Yield guards breadth-first"""
+        return iter_bst_bfs(self.root)
+    
+    def page(self, start_after: int = None, limit: int = 50) -> List[Tuple[str, int, str]]:
+        """One page of the roster in badge order, after a given badge ID"""
+        return [_as_tuple(node) for node in islice(self.iter_inorder(start_after), limit)]
     
+    def inorder(self) -> List[Tuple[str, int, str]]:
+        """Inorder traversal - returns sorted list of guards"""
+        return [_as_tuple(node) for node in self.iter_inorder()]
+    
+    def preorder(self) -> List[Tuple[str, int, str]]:
+        """Preorder traversal"""
+        return [_as_tuple(node) for node in self.iter_preorder()]
+    
+    def postorder(self) -> List[Tuple[str, int, str]]:
+        """Postorder traversal"""
+        return [_as_tuple(node) for node in self.iter_postorder()]
+
+
+def _as_tuple(node: GuardNode) -> Tuple[str, int, str]:
+    return node.name, node.guard_id, node.duty
+
+
+def iter_bst_bfs(root) -> Iterator[GuardNode]:
+    """Yield guards in level order using a deque - O(1) per node
+    
+    Accepts a GuardTree or a GuardNode root.
+    """
+    if isinstance(root, GuardTree):
+        root = root.root
+    if not root or root.guard_id is None:
+        return
+    
+    queue = deque([root])
     while queue:
-        node = queue.pop(0)  # Dequeue
-        if node and node.name is not None:
-            result.append(node)
+        node = queue.popleft()
+        if node.name is not None:
+            yield node
             if node.left:
                 queue.append(node.left)
             if node.right:
                 queue.append(node.right)
-    
-    return result
 
 
-def assign_guards_to_locations(root: GuardNode, locations: dict) -> dict:
+def flatten_bst_bfs(root) -> List[GuardNode]:
+    """BFS traversal - flatten BST to list (level order)"""
+    return list(iter_bst_bfs(root))
+
+
+def assign_guards_to_locations(root, locations: dict) -> dict:
     """Assign guards from BST to campus locations"""
     assigned = {}
-    all_guards = flatten_bst_bfs(root)
-    index = 0
+    guards = iter_bst_bfs(root)
     
     for location, count in locations.items():
-        assigned[location] = []
-        for _ in range(count):
-            if index < len(all_guards):
-                assigned[location].append(all_guards[index].name)
-                index += 1
+        assigned[location] = [node.name for node in islice(guards, count)]
     
     return assigned
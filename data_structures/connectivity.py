@@ -0,0 +1,103 @@
+# Connectivity Index for the Campus Graph
+
+from typing import List, Tuple
+
+import numpy as np
+
+from .csr import CSRGraph
+
+
+class ConnectivityIndex:
+    """Connected components, bridges and articulation points of a CSR view
+    
+    Built in one iterative Tarjan pass - O(V + E) - so long corridors
+    cannot overflow the recursion limit. Bridges are paths and
+    articulation points locations whose loss disconnects the campus;
+    parallel paths between two locations are not bridges.
+    """
+    
+    def __init__(self, csr: CSRGraph):
+        self.names = csr.names
+        self.index = csr.index
+        self.version = csr.version
+        n = len(self.names)
+        offsets, targets = memoryview(csr.offsets), memoryview(csr.targets)
+        
+        component = [-1] * n
+        disc = [-1] * n
+        low = [0] * n
+        parent = [-1] * n
+        current = [offsets[node] for node in range(n)]   # Next edge to scan
+        skipped = bytearray(n)      # Whether the edge back to the parent was skipped
+        articulation = bytearray(n)
+        bridges = []
+        timer = 0
+        count = 0
+        
+        for root in range(n):
+            if disc[root] != -1:
+                continue
+            disc[root] = low[root] = timer
+            timer += 1
+            component[root] = count
+            root_children = 0
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                if current[u] < offsets[u + 1]:
+                    v = targets[current[u]]
+                    current[u] += 1
+                    if v == parent[u] and not skipped[u]:
+                        skipped[u] = 1
+                        continue
+                    if disc[v] == -1:
+                        parent[v] = u
+                        disc[v] = low[v] = timer
+                        timer += 1
+                        component[v] = count
+                        stack.append(v)
+                        if u == root:
+                            root_children += 1
+                    elif disc[v] < low[u]:
+                        low[u] = disc[v]
+                    continue
+                
+                stack.pop()
+                p = parent[u]
+                if p == -1:
+                    continue
+                if low[u] < low[p]:
+                    low[p] = low[u]
+                if low[u] > disc[p]:
+                    bridges.append((p, u))
+                if p != root and low[u] >= disc[p]:
+                    articulation[p] = 1
+            if root_children > 1:
+                articulation[root] = 1
+            count += 1
+        
+        self.component = np.array(component, dtype=np.int32)
+        self.component_count = count
+        self._articulation = [node for node in range(n) if articulation[node]]
+        self._bridges = bridges
+    
+    def reachable(self, start: str, end: str) -> bool:
+        """Whether a route exists between two locations - O(1)"""
+        i, j = self.index.get(start), self.index.get(end)
+        return i is not None and j is not None and self.component[i] == self.component[j]
+    
+    def components(self) -> List[List[str]]:
+        """Locations grouped by connected component, largest first"""
+        groups = [[] for _ in range(self.component_count)]
+        for name, label in zip(self.names, self.component.tolist()):
+            groups[label].append(name)
+        groups.sort(key=len, reverse=True)
+        return groups
+    
+    def articulation_points(self) -> List[str]:
+        """Locations whose loss splits their component"""
+        return [self.names[node] for node in self._articulation]
+    
+    def bridges(self) -> List[Tuple[str, str]]:
+        """Paths whose closure splits their component"""
+        return [(self.names[u], self.names[v]) for u, v in self._bridges]
@@ -0,0 +1,120 @@
+# Hash Table Credential Store for IntruWatch
+
+import hmac
+import pickle
+import threading
+from typing import Dict, Optional, Tuple
+
+
+class CredentialRecord:
+    """Stored operator credentials"""
+    __slots__ = ("username", "password_hash", "email", "role")
+    
+    def __init__(self, username: str, password_hash: str, email: str = None, role: str = "operator"):
+        self.username = username
+        self.password_hash = password_hash
+        self.email = email
+        self.role = role
+    
+    def __getstate__(self):
+        return (self.username, self.password_hash, self.email, self.role)
+    
+    def __setstate__(self, state):
+        self.username, self.password_hash, self.email, self.role = state
+
+
+class CredentialStore:
+    """Dict-backed operator credentials - O(1) lookup by username
+    
+    Drop-in replacement for LoginLinkedList (insert, find, username_exists)
+    that also offers authenticate(). When unpickled, the records stay as a
+    serialized blob until the first lookup needs them; the record count is
+    stored next to the blob, so len() does not decode it. One store is
+    shared by every session; hold ``lock`` around a change and its save.
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._records: Optional[Dict[str, CredentialRecord]] = {}
+        self._blob: Optional[bytes] = None
+        self._count: Optional[int] = None   # Records in the blob, if known
+    
+    @classmethod
+    def from_linked_list(cls, login_list) -> 'CredentialStore':
+        """Migrate a legacy LoginLinkedList (newest entry wins)"""
+        store = cls()
+        nodes = []
+        current = login_list.head
+        while current:
+            nodes.append(current)
+            current = current.next
+        for node in reversed(nodes):
+            store.insert(node.username, node.password_hash,
+                         getattr(node, "email", None), getattr(node, "role", "operator"))
+        return store
+    
+    @property
+    def lock(self) -> threading.RLock:
+        """Held by changes and pickling; hold it around a change and its save"""
+        return self._lock
+    
+    @property
+    def records(self) -> Dict[str, CredentialRecord]:
+        if self._records is None:
+            with self._lock:
+                if self._records is None:
+                    self._records = pickle.loads(self._blob)
+                    self._blob = None
+        return self._records
+    
+    def __getstate__(self) -> dict:
+        with self._lock:
+            if self._records is None:
+                return {"blob": self._blob, "count": self._count}
+            return {"blob": pickle.dumps(self._records, protocol=pickle.HIGHEST_PROTOCOL),
+                    "count": len(self._records)}
+    
+    def __setstate__(self, state: dict) -> None:
+        self._lock = threading.RLock()
+        self._records = None
+        self._blob = state["blob"]
+        # Stores pickled before the count was kept decode the blob on len()
+        self._count = state.get("count")
+    
+    def __len__(self) -> int:
+        if self._records is None and self._count is not None:
+            return self._count
+        return len(self.records)
+    
+    def __contains__(self, username: str) -> bool:
+        return username in self.records
+    
+    def insert(self, username: str, password_hash: str, email: str = None, role: str = "operator") -> None:
+        """Add or replace an operator's credentials - O(1)"""
+        with self._lock:
+            self.records[username] = CredentialRecord(username, password_hash, email, role)
+    
+    def get(self, username: str) -> Optional[CredentialRecord]:
+        return self.records.get(username)
+    
+    def find(self, username: str, password_hash: str) -> bool:
+        """Check a username/password-hash pair - O(1)"""
+        return self.authenticate(username, password_hash)[0]
+    
+    def authenticate(self, username: str, password_hash: str) -> Tuple[bool, Optional[CredentialRecord]]:
+        """Verify credentials
+        
+        Returns:
+            Tuple of (success, record or None)
+        """
+        record = self.records.get(username)
+        if record is None or not hmac.compare_digest(record.password_hash, password_hash):
+            return False, None
+        return True, record
+    
+    def username_exists(self, username: str) -> bool:
+        return username in self.records
+    
+    def remove(self, username: str) -> bool:
+        with self._lock:
+            return self.records.pop(username, None) is not None
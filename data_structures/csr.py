@@ -0,0 +1,284 @@
+# Compressed Sparse Row View of the Campus Graph
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+
+# Shortest-path trees kept per view; each holds 12 bytes per location
+TREE_CACHE_SIZE = 4
+
+
+class CSRGraph:
+    """Frozen, integer-indexed snapshot of a CampusGraph
+    
+    Location i's neighbors are ``targets[offsets[i]:offsets[i + 1]]`` with
+    matching ``weights``. Searches work on node IDs over these contiguous
+    arrays (read through memoryviews, which yield plain ints), and names
+    are only looked up at the ends. The view is a cache next to the
+    adjacency dict, built only when Dijkstra, k-shortest routes or the
+    connectivity index ask for it; plain BFS and DFS stay on the dict,
+    where they are just as fast without building it.
+    """
+    
+    def __init__(self, adjacency: Dict[str, List[Tuple[str, float]]], version: int = None):
+        self.names: List[str] = list(adjacency)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+        degrees = np.fromiter((len(adjacency[name]) for name in self.names), dtype=np.int64, count=n)
+        self.offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=self.offsets[1:])
+        edges = int(self.offsets[-1])
+        self.targets = np.fromiter(
+            (self.index[neighbor] for name in self.names for neighbor, _ in adjacency[name]),
+            dtype=np.int32, count=edges
+        )
+        self.weights = np.fromiter(
+            (weight for name in self.names for _, weight in adjacency[name]),
+            dtype=np.float64, count=edges
+        )
+        self.version = version
+        # Least recently used root first
+        self._trees: "OrderedDict[int, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._trees_lock = threading.Lock()
+    
+    def __getstate__(self) -> dict:
+        # Cached trees are rebuilt on demand rather than pickled
+        state = self.__dict__.copy()
+        del state["_trees_lock"]
+        state["_trees"] = OrderedDict()
+        return state
+    
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._trees_lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the CSR arrays"""
+        return self.offsets.nbytes + self.targets.nbytes + self.weights.nbytes
+    
+    def neighbors(self, node: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Neighbor IDs and weights of a node ID"""
+        lo, hi = self.offsets[node], self.offsets[node + 1]
+        return self.targets[lo:hi], self.weights[lo:hi]
+    
+    def dijkstra(self, start: str, end: str) -> Tuple[float, List[str]]:
+        """Shortest path over the CSR arrays - O((V+E) log V)
+        
+        Returns:
+            Tuple of (distance, path_list)
+        """
+        source, target = self.index.get(start), self.index.get(end)
+        if source is None or target is None:
+            return float('inf'), []
+        
+        n = len(self.names)
+        offsets, targets, weights = memoryview(self.offsets), memoryview(self.targets), memoryview(self.weights)
+        dist_array = np.full(n, np.inf)
+        prev_array = np.full(n, -1, dtype=np.int32)
+        dist, prev = memoryview(dist_array), memoryview(prev_array)
+        visited = bytearray(n)
+        dist[source] = 0.0
+        pq = [(0.0, source)]
+        
+        while pq:
+            current_dist, node = heapq.heappop(pq)
+            if visited[node]:
+                continue
+            visited[node] = 1
+            if node == target:
+                break
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[edge]
+                if visited[neighbor]:
+                    continue
+                new_dist = current_dist + weights[edge]
+                if new_dist < dist[neighbor]:
+                    dist[neighbor] = new_dist
+                    prev[neighbor] = node
+                    heapq.heappush(pq, (new_dist, neighbor))
+        
+        if not visited[target]:
+            return float('inf'), []
+        path = []
+        node = target
+        while node != -1:
+            path.append(self.names[node])
+            node = prev[node]
+        path.reverse()
+        return dist[target], path
+    
+    def distances_to(self, root: int, targets: List[int]) -> np.ndarray:
+        """Distances from a node ID to each of the given node IDs
+        
+        Dijkstra from the root that stops once every target is settled -
+        O((V+E) log V) at worst, and much less when the targets are near.
+        Unreachable targets get inf.
+        """
+        n = len(self.names)
+        offsets, targets_view, weights = memoryview(self.offsets), memoryview(self.targets), memoryview(self.weights)
+        dist_array = np.full(n, np.inf)
+        dist = memoryview(dist_array)
+        visited = bytearray(n)
+        remaining = set(targets)
+        dist[root] = 0.0
+        pq = [(0.0, root)]
+        while pq and remaining:
+            current_dist, node = heapq.heappop(pq)
+            if visited[node]:
+                continue
+            visited[node] = 1
+            remaining.discard(node)
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbor = targets_view[edge]
+                new_dist = current_dist + weights[edge]
+                if new_dist < dist[neighbor]:
+                    dist[neighbor] = new_dist
+                    heapq.heappush(pq, (new_dist, neighbor))
+        # Every target is settled or unreachable, so its distance is final
+        return dist_array[np.asarray(targets, dtype=np.intp)]
+    
+    def shortest_path_tree(self, root: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Distances to a node ID and each node's next hop towards it
+        
+        Full Dijkstra from the root (edges are undirected). The view is
+        frozen, so the last TREE_CACHE_SIZE roots asked for are cached. Next
+        hop is -1 at the root and for unreachable nodes.
+        """
+        with self._trees_lock:
+            tree = self._trees.get(root)
+            if tree is not None:
+                self._trees.move_to_end(root)
+                return tree
+        n = len(self.names)
+        offsets, targets, weights = memoryview(self.offsets), memoryview(self.targets), memoryview(self.weights)
+        dist_array = np.full(n, np.inf)
+        hop_array = np.full(n, -1, dtype=np.int32)
+        dist, hop = memoryview(dist_array), memoryview(hop_array)
+        visited = bytearray(n)
+        dist[root] = 0.0
+        pq = [(0.0, root)]
+        while pq:
+            current_dist, node = heapq.heappop(pq)
+            if visited[node]:
+                continue
+            visited[node] = 1
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[edge]
+                new_dist = current_dist + weights[edge]
+                if new_dist < dist[neighbor]:
+                    dist[neighbor] = new_dist
+                    hop[neighbor] = node
+                    heapq.heappush(pq, (new_dist, neighbor))
+        tree = (dist_array, hop_array)
+        with self._trees_lock:
+            self._trees[root] = tree
+            if len(self._trees) > TREE_CACHE_SIZE:
+                self._trees.popitem(last=False)
+        return tree
+    
+    def _edge_weight(self, u: int, v: int) -> float:
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        return float(self.weights[lo:hi][self.targets[lo:hi] == v].min())
+    
+    def _spur_path(self, spur: int, target: int, banned_nodes: set,
+                   banned_edges: set) -> Tuple[float, List[int]]:
+        """Shortest spur -> target path avoiding the given nodes and first hops
+        
+        Distances to the target in the full graph are an exact-when-unblocked
+        lower bound: if the cached tree path is not blocked it is returned
+        directly, otherwise it guides an A* search.
+        """
+        to_target, toward = self.shortest_path_tree(target)
+        if to_target[spur] == np.inf:
+            return float('inf'), []
+        
+        path = [spur]
+        node = spur
+        while node != target:
+            node = int(toward[node])
+            if node in banned_nodes:
+                break
+            path.append(node)
+        else:
+            if len(path) < 2 or (spur, path[1]) not in banned_edges:
+                return float(to_target[spur]), path
+        
+        offsets, targets, weights = memoryview(self.offsets), memoryview(self.targets), memoryview(self.weights)
+        h = memoryview(to_target)
+        g_score = {spur: 0.0}
+        previous = {spur: -1}
+        pq = [(h[spur], 0.0, spur)]
+        closed = set(banned_nodes)
+        while pq:
+            _, current_dist, node = heapq.heappop(pq)
+            if node in closed:
+                continue
+            closed.add(node)
+            if node == target:
+                path = []
+                while node != -1:
+                    path.append(node)
+                    node = previous[node]
+                path.reverse()
+                return current_dist, path
+            for edge in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[edge]
+                if neighbor in closed or (node == spur and (spur, neighbor) in banned_edges):
+                    continue
+                new_dist = current_dist + weights[edge]
+                if new_dist < g_score.get(neighbor, float('inf')):
+                    g_score[neighbor] = new_dist
+                    previous[neighbor] = node
+                    heapq.heappush(pq, (new_dist + h[neighbor], new_dist, neighbor))
+        return float('inf'), []
+    
+    def k_shortest_paths(self, start: str, end: str) -> Iterator[Tuple[float, List[str]]]:
+        """Loopless paths in order of length, generated lazily (Yen's algorithm)
+        
+        Each next path deviates from an earlier one at a spur node; only
+        spur nodes from the earlier path's own deviation point onwards are
+        tried (Lawler's refinement), and spur searches share one cached
+        shortest-path tree towards ``end``.
+        """
+        source, target = self.index.get(start), self.index.get(end)
+        if source is None or target is None:
+            return
+        distance, first = self.dijkstra(start, end)
+        if not first:
+            return
+        yield distance, first
+        if source == target:
+            return
+        
+        path = tuple(self.index[name] for name in first)
+        accepted = [path]
+        found = {path}
+        candidates = []         # (distance, path, deviation index)
+        deviation = 0
+        while True:
+            prefix = [0.0]
+            for u, v in zip(path, path[1:]):
+                prefix.append(prefix[-1] + self._edge_weight(u, v))
+            for i in range(deviation, len(path) - 1):
+                spur, root = path[i], path[:i + 1]
+                banned_edges = {(spur, other[i + 1]) for other in accepted if other[:i + 1] == root}
+                spur_dist, spur_path = self._spur_path(spur, target, set(root[:-1]), banned_edges)
+                if not spur_path:
+                    continue
+                candidate = root[:-1] + tuple(spur_path)
+                if candidate not in found:
+                    found.add(candidate)
+                    heapq.heappush(candidates, (prefix[i] + spur_dist, candidate, i))
+            if not candidates:
+                return
+            distance, path, deviation = heapq.heappop(candidates)
+            accepted.append(path)
+            yield distance, [self.names[node] for node in path]
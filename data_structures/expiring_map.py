@@ -0,0 +1,55 @@
+# Expiring Hash Map for IntruWatch
+
+from collections import OrderedDict
+from typing import Any, Hashable, Iterator, Optional, Tuple
+
+
+class ExpiringMap:
+    """Hash map whose entries expire ``ttl`` seconds after their last touch
+    
+    Entries are kept in an OrderedDict in last-touched order, so expired
+    ones are always at the front: get, put and purge are amortized O(1).
+    Times are passed in explicitly (seconds), which keeps the map
+    deterministic when a journal is replayed.
+    """
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __iter__(self) -> Iterator[Tuple[Hashable, Any, float]]:
+        """Yield (key, value, last touched) from oldest to newest"""
+        for key, (value, touched) in self._entries.items():
+            yield key, value, touched
+    
+    def purge(self, now: float) -> int:
+        """Drop entries not touched within ttl of ``now``"""
+        dropped = 0
+        while self._entries:
+            key, (_, touched) = next(iter(self._entries.items()))
+            if now - touched <= self.ttl:
+                break
+            del self._entries[key]
+            dropped += 1
+        return dropped
+    
+    def get(self, key: Hashable, now: float) -> Optional[Any]:
+        """Value for a live key, or None"""
+        self.purge(now)
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+    
+    def put(self, key: Hashable, value: Any, now: float) -> None:
+        """Insert or refresh a key"""
+        self._entries[key] = (value, now)
+        self._entries.move_to_end(key)
+    
+    def pop(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.pop(key, None)
+        return entry[0] if entry is not None else None
+    
+    def clear(self) -> None:
+        self._entries.clear()
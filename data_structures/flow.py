@@ -0,0 +1,205 @@
+# Max-Flow Evacuation Planning for IntruWatch
+#
+# Walkways carry at most a given number of people per minute. The best
+# evacuation rate from occupied hostels to the gates is a maximum flow, and
+# the walkways that limit it form a minimum cut.
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+# Hostels evacuated in drills and the gates they evacuate to
+EVACUATION_SOURCES = ("H1", "H2", "H3", "H4", "H5", "H6", "H7", "GH", "NGH")
+EVACUATION_EXITS = ("Main Gate", "Ayaan Gate")
+
+INF = float('inf')
+
+
+class FlowNetwork:
+    """Residual network solved with Dinic's algorithm - O(V^2 E)
+    
+    Edges are stored in pairs, so edge e's residual twin is e ^ 1.
+    """
+    
+    def __init__(self, n: int):
+        self.n = n
+        self.adj: List[List[int]] = [[] for _ in range(n)]
+        self.to: List[int] = []
+        self.cap: List[float] = []          # Residual capacity
+        self.capacity: List[float] = []     # Original capacity
+    
+    def add_edge(self, u: int, v: int, capacity: float, reverse: float = 0.0) -> int:
+        """Add u -> v (and v -> u with ``reverse`` capacity, e.g. for a two-way walkway)
+        
+        Returns:
+            Index of the u -> v edge
+        """
+        edge = len(self.to)
+        self.to += [v, u]
+        self.cap += [capacity, reverse]
+        self.capacity += [capacity, reverse]
+        self.adj[u].append(edge)
+        self.adj[v].append(edge + 1)
+        return edge
+    
+    def flow(self, edge: int) -> float:
+        """Net flow along an edge"""
+        # Read off the twin, whose capacity is finite even for unbounded edges
+        return self.cap[edge ^ 1] - self.capacity[edge ^ 1]
+    
+    def _levels(self, source: int, sink: int) -> List[int]:
+        """BFS distances from the source in the residual network"""
+        level = [-1] * self.n
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            if 0 <= level[sink] <= level[u]:
+                break       # Nodes this deep cannot be on a shortest path
+            for edge in self.adj[u]:
+                v = self.to[edge]
+                if level[v] < 0 and self.cap[edge] > 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        return level
+    
+    def _blocking_flow(self, source: int, sink: int, level: List[int]) -> float:
+        """Saturate every shortest augmenting path (iterative DFS with current arcs)"""
+        adj, to, cap = self.adj, self.to, self.cap
+        current = [0] * self.n
+        total = 0.0
+        path = []
+        u = source
+        while True:
+            if u == sink:
+                pushed = min(cap[edge] for edge in path)
+                if pushed == INF:
+                    return INF
+                total += pushed
+                # Push, then resume from the tail of the first saturated edge
+                first = None
+                for i, edge in enumerate(path):
+                    cap[edge] -= pushed
+                    cap[edge ^ 1] += pushed
+                    if first is None and cap[edge] <= 0:
+                        first = i
+                u = to[path[first] ^ 1]
+                del path[first:]
+                continue
+            edges = adj[u]
+            while current[u] < len(edges):
+                edge = edges[current[u]]
+                if cap[edge] > 0 and level[to[edge]] == level[u] + 1:
+                    break
+                current[u] += 1
+            else:
+                # Dead end: never enter u again this phase
+                if not path:
+                    return total
+                level[u] = -1
+                u = to[path.pop() ^ 1]
+                current[u] += 1
+                continue
+            path.append(edge)
+            u = to[edge]
+    
+    def max_flow(self, source: int, sink: int) -> float:
+        """Maximum flow from source to sink"""
+        total = 0.0
+        while True:
+            level = self._levels(source, sink)
+            if level[sink] < 0:
+                return total
+            pushed = self._blocking_flow(source, sink, level)
+            if pushed == INF:
+                return INF
+            total += pushed
+    
+    def reachable(self, source: int) -> bytearray:
+        """Nodes reachable in the residual network: the source side of a min cut"""
+        seen = bytearray(self.n)
+        seen[source] = 1
+        stack = [source]
+        while stack:
+            u = stack.pop()
+            for edge in self.adj[u]:
+                v = self.to[edge]
+                if not seen[v] and self.cap[edge] > 0:
+                    seen[v] = 1
+                    stack.append(v)
+        return seen
+
+
+class EvacuationPlan:
+    """Result of plan_evacuation"""
+    
+    def __init__(self, rate: float, flows: Dict[str, float], exits: Dict[str, float],
+                 bottlenecks: List[Tuple[str, str, float]], occupancy: Dict[str, int]):
+        self.rate = rate                # People per minute reaching the exits
+        self.flows = flows              # Source -> people per minute leaving it
+        self.exits = exits              # Exit -> people per minute arriving
+        self.bottlenecks = bottlenecks  # Saturated walkways of a min cut (loc1, loc2, capacity)
+        self.occupancy = occupancy
+    
+    @property
+    def clearance_minutes(self) -> float:
+        """Lower bound on the time to evacuate everyone at the maximum rate"""
+        people = sum(self.occupancy.values())
+        if not people:
+            return 0.0
+        return people / self.rate if self.rate else INF
+
+
+def plan_evacuation(graph, occupancy: Dict[str, int] = None,
+                    sources: Iterable[str] = EVACUATION_SOURCES,
+                    exits: Iterable[str] = EVACUATION_EXITS) -> EvacuationPlan:
+    """Maximum evacuation rate from occupied locations to the exits
+    
+    Args:
+        graph: CampusGraph whose open paths and capacities form the network
+        occupancy: Location -> people to evacuate; locations with nobody are
+            not sources. Defaults to every location in ``sources``.
+        sources, exits: Candidate source locations and exit locations
+    
+    Returns:
+        EvacuationPlan with the rate, per-source and per-exit flows and the
+        bottleneck walkways
+    """
+    exits = [exit for exit in exits if exit in graph.adjacency]
+    if occupancy is None:
+        occupancy = {source: 0 for source in sources}
+        active = [source for source in sources if source in graph.adjacency]
+    else:
+        active = [location for location, people in occupancy.items() if people > 0]
+    active = [location for location in active if location in graph.adjacency and location not in exits]
+    
+    names = list(graph.adjacency)
+    index = {name: i for i, name in enumerate(names)}
+    n = len(names)
+    source, sink = n, n + 1
+    network = FlowNetwork(n + 2)
+    walkways = {}
+    for loc1, neighbors in graph.adjacency.items():
+        for loc2, _ in neighbors:
+            u, v = index[loc1], index[loc2]
+            if u < v and (u, v) not in walkways:
+                capacity = graph.capacity(loc1, loc2)
+                walkways[(u, v)] = (network.add_edge(u, v, capacity, capacity), capacity)
+    source_edges = {location: network.add_edge(source, index[location], INF) for location in active}
+    exit_edges = {exit: network.add_edge(index[exit], sink, INF) for exit in exits}
+    
+    rate = network.max_flow(source, sink) if active and exits else 0.0
+    side = network.reachable(source)
+    bottlenecks = [
+        (names[u], names[v], capacity)
+        for (u, v), (_, capacity) in walkways.items()
+        if side[u] != side[v]
+    ]
+    bottlenecks.sort(key=lambda walkway: walkway[2])
+    return EvacuationPlan(
+        rate,
+        {location: network.flow(edge) for location, edge in source_edges.items()},
+        {exit: network.flow(edge) for exit, edge in exit_edges.items()},
+        bottlenecks,
+        {location: occupancy.get(location, 0) for location in active}
+    )
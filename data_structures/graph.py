@@ -1,7 +1,30 @@
 # Graph Data Structure for Campus Map with Dijkstra's Algorithm
 
 import heapq
-from typing import Dict, List, Tuple, Optional
+import math
+import threading
+import warnings
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional
+
+from .connectivity import ConnectivityIndex
+from .csr import CSRGraph
+from .shortest_paths import PATH_TABLE_MAX_NODES, ShortestPathTable
+
+
+EARTH_RADIUS_M = 6371000.0
+
+# People per minute a walkway carries unless set otherwise
+DEFAULT_PATH_CAPACITY = 60.0
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters between two GPS coordinates"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    h = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(h)))
 
 
 class CampusGraph:
@@ -11,137 +34,518 @@ class CampusGraph:
     - Finding shortest path between locations
     - Finding nearest guard to alert location
     - Visualizing campus connectivity
+    
+    One graph is shared by every session: path changes and the cached
+    shortest-path table, CSR view and connectivity index are guarded by a
+    lock, so readers never see a half-applied change.
     """
     
     def __init__(self):
         self.adjacency: Dict[str, List[Tuple[str, float]]] = {}
         self.locations: Dict[str, Tuple[float, float]] = {}  # GPS coordinates
+        self.closed: Dict[Tuple[str, str], List[float]] = {}  # Closed paths -> their distances
+        self.capacities: Dict[Tuple[str, str], float] = {}    # People per minute, if not the default
+        self.length_changes: Dict[Tuple[str, str], float] = {}     # Lengths an operator set
+        self.capacity_changes: Dict[Tuple[str, str], float] = {}   # Capacities an operator set
+        self.source = None  # Fingerprint of the map the graph was built from, if known
+        self.source_error: Optional[str] = None     # Why the map file was not used, if it failed
+        self.version = 0    # Bumped on every change; derived caches compare against it
+        self._path_table: Optional[ShortestPathTable] = None
+        self._heuristic_scale: Optional[Tuple[int, float]] = None   # (version, scale)
+        self._csr: Optional[CSRGraph] = None
+        self._connectivity: Optional[ConnectivityIndex] = None
+        self._lock = threading.RLock()
+    
+    def __getstate__(self) -> dict:
+        with self._lock:
+            state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+    
+    def __setstate__(self, state: dict) -> None:
+        # Graphs pickled before caching carry only adjacency and locations
+        self.__init__()
+        self.__dict__.update(state)
+    
+    def _changed(self, repair: Callable[[ShortestPathTable], None] = None) -> None:
+        """Record a change, repairing the shortest-path table in place if possible"""
+        table = self._path_table
+        current = table is not None and table.version == self.version
+        self.version += 1
+        if current and repair is not None:
+            repair(table)
+            table.version = self.version
     
     def add_location(self, name: str, lat: float = 0, lon: float = 0) -> None:
         """Add a location node to the graph"""
         if name not in self.adjacency:
             self.adjacency[name] = []
             self.locations[name] = (lat, lon)
+            self._changed(lambda table: table.add_node(name))
     
-    def add_path(self, loc1: str, loc2: str, distance: float) -> None:
+    def add_path(self, loc1: str, loc2: str, distance: float, capacity: float = None) -> None:
         """Add undirected edge (path) between two locations"""
         if loc1 not in self.adjacency:
             self.add_location(loc1)
         if loc2 not in self.adjacency:
             self.add_location(loc2)
+        if capacity is not None:
+            self._set_capacity(loc1, loc2, capacity)
         
         self.adjacency[loc1].append((loc2, distance))
         self.adjacency[loc2].append((loc1, distance))
+        self._changed(lambda table: table.relax_edge(loc1, loc2, distance))
+    
+    def bulk_load(self, locations: Iterable[Tuple[str, float, float]], paths: Iterable[tuple]) -> None:
+        """Add many locations and paths at once - O(V + E)
+        
+        Paths are (loc1, loc2, distance) or (loc1, loc2, distance, capacity).
+        Cached tables are rebuilt on next use instead of repaired per path.
+        
+        Raises:
+            ValueError: If a path names a location that has no coordinates
+        """
+        locations = list(locations)
+        paths = list(paths)
+        known = set(self.adjacency).union(name for name, _, _ in locations)
+        for path in paths:
+            for location in path[:2]:
+                if location not in known:
+                    # Made-up coordinates would corrupt the A* heuristic scale
+                    raise ValueError(f"Path {path[0]} - {path[1]} names unknown location {location!r}")
+        
+        for name, lat, lon in locations:
+            if name not in self.adjacency:
+                self.adjacency[name] = []
+                self.locations[name] = (lat, lon)
+        for path in paths:
+            loc1, loc2, distance = path[:3]
+            self.adjacency[loc1].append((loc2, distance))
+            self.adjacency[loc2].append((loc1, distance))
+            if len(path) > 3 and path[3] is not None:
+                self._set_capacity(loc1, loc2, path[3])
+        self._changed()
+    
+    def _set_capacity(self, loc1: str, loc2: str, capacity: float) -> None:
+        if capacity < 0:
+            raise ValueError("Path capacity cannot be negative")
+        self.capacities[tuple(sorted((loc1, loc2)))] = capacity
+    
+    def set_capacity(self, loc1: str, loc2: str, capacity: float) -> None:
+        """Set how many people per minute a path carries, in both directions"""
+        with self._lock:
+            self._set_capacity(loc1, loc2, capacity)
+            self.capacity_changes[tuple(sorted((loc1, loc2)))] = capacity
+            # Distances are unaffected, so the shortest-path table stays valid
+            self._changed(lambda table: None)
+    
+    def capacity(self, loc1: str, loc2: str) -> float:
+        """People per minute a path carries"""
+        return self.capacities.get(tuple(sorted((loc1, loc2))), DEFAULT_PATH_CAPACITY)
+    
+    def _path_weight(self, loc1: str, loc2: str) -> float:
+        """Shortest open edge between two locations, inf if there is none"""
+        return min((weight for neighbor, weight in self.adjacency.get(loc1, []) if neighbor == loc2),
+                   default=float('inf'))
+    
+    def _reweighted(self, loc1: str, loc2: str, old: float, new: float) -> None:
+        """Record a change of the effective weight between two locations
+        
+        Shortening is repaired like a new edge; lengthening or closing
+        recomputes only the sources whose shortest paths used the edge.
+        """
+        if new < old:
+            self._changed(lambda table: table.relax_edge(loc1, loc2, new))
+        elif new > old:
+            self._changed(lambda table: table.raise_edge(self.adjacency, loc1, loc2, old))
+        else:
+            self._changed(lambda table: None)
+    
+    def set_weight(self, loc1: str, loc2: str, distance: float) -> bool:
+        """Change the length of an open path, e.g. when crowds slow it down
+        
+        Returns:
+            False if no open path connects the locations
+        """
+        if distance < 0:
+            raise ValueError("Path distance cannot be negative")
+        with self._lock:
+            old = self._path_weight(loc1, loc2)
+            if old == float('inf'):
+                return False
+            for a, b in ((loc1, loc2), (loc2, loc1)):
+                self.adjacency[a] = [(neighbor, distance if neighbor == b else weight)
+                                     for neighbor, weight in self.adjacency[a]]
+            self.length_changes[tuple(sorted((loc1, loc2)))] = distance
+            self._reweighted(loc1, loc2, old, distance)
+            return True
+    
+    def close_path(self, loc1: str, loc2: str) -> bool:
+        """Take a path out of routing, e.g. a blocked gate; reopen_path restores it
+        
+        Returns:
+            False if no open path connects the locations
+        """
+        with self._lock:
+            old = self._path_weight(loc1, loc2)
+            if old == float('inf'):
+                return False
+            weights = [weight for neighbor, weight in self.adjacency[loc1] if neighbor == loc2]
+            self.closed.setdefault(tuple(sorted((loc1, loc2))), []).extend(weights)
+            self.adjacency[loc1] = [edge for edge in self.adjacency[loc1] if edge[0] != loc2]
+            self.adjacency[loc2] = [edge for edge in self.adjacency[loc2] if edge[0] != loc1]
+            self._reweighted(loc1, loc2, old, float('inf'))
+            return True
+    
+    def reopen_path(self, loc1: str, loc2: str) -> bool:
+        """Restore a path removed by close_path
+        
+        Returns:
+            False if the path is not closed
+        """
+        with self._lock:
+            weights = self.closed.pop(tuple(sorted((loc1, loc2))), None)
+            if weights is None:
+                return False
+            old = self._path_weight(loc1, loc2)
+            # New lists, so readers iterating the old ones are unaffected
+            self.adjacency[loc1] = self.adjacency[loc1] + [(loc2, weight) for weight in weights]
+            self.adjacency[loc2] = self.adjacency[loc2] + [(loc1, weight) for weight in weights]
+            self._reweighted(loc1, loc2, old, min(old, *weights))
+            return True
+    
+    def closed_paths(self) -> List[Tuple[str, str, float]]:
+        """Closed paths as (loc1, loc2, distance)"""
+        with self._lock:
+            return [(loc1, loc2, min(weights)) for (loc1, loc2), weights in self.closed.items()]
+    
+    def carry_changes(self, other: 'CampusGraph') -> None:
+        """Re-apply another graph's closures and operator-set lengths and
+        capacities, e.g. when the map it was built from has changed; paths
+        that no longer exist are skipped"""
+        for (loc1, loc2), distance in other.length_changes.items():
+            self.set_weight(loc1, loc2, distance)
+        for (loc1, loc2), capacity in other.capacity_changes.items():
+            if self._path_weight(loc1, loc2) != float('inf'):
+                self.set_capacity(loc1, loc2, capacity)
+        for loc1, loc2 in other.closed:
+            self.close_path(loc1, loc2)
+    
+    def shortest_paths(self) -> ShortestPathTable:
+        """All-pairs shortest-path table, rebuilt only if the graph changed
+        since it was last built or repaired"""
+        with self._lock:
+            if self._path_table is None or self._path_table.version != self.version:
+                self._path_table = ShortestPathTable.build(self.adjacency, self.version)
+            return self._path_table
+    
+    def shortest_path(self, start: str, end: str) -> Tuple[float, List[str]]:
+        """Shortest path from the precomputed table - O(path length)
+        
+        Same result as dijkstra(start, end); the first call builds the table.
+        Graphs over PATH_TABLE_MAX_NODES locations use dijkstra instead, as
+        their table would take O(V^2) memory.
+        
+        Returns:
+            Tuple of (distance, path_list)
+        """
+        if len(self.adjacency) > PATH_TABLE_MAX_NODES:
+            return self.dijkstra(start, end)
+        with self._lock:
+            return self.shortest_paths().path(start, end)
     
     def get_neighbors(self, location: str) -> List[Tuple[str, float]]:
         """Get all connected locations with distances"""
         return self.adjacency.get(location, [])
     
+    def csr(self) -> CSRGraph:
+        """Frozen integer-indexed view of the graph, rebuilt only if the
+        graph changed since it was last built - O(V + E)"""
+        with self._lock:
+            if self._csr is None or self._csr.version != self.version:
+                self._csr = CSRGraph(self.adjacency, self.version)
+            return self._csr
+    
+    def connectivity(self) -> ConnectivityIndex:
+        """Components, bridges and articulation points, recomputed only if
+        the graph changed since they were last computed - O(V + E)"""
+        with self._lock:
+            if self._connectivity is None or self._connectivity.version != self.version:
+                self._connectivity = ConnectivityIndex(self.csr())
+            return self._connectivity
+    
+    def is_reachable(self, start: str, end: str) -> bool:
+        """Whether any open route connects two locations - O(1) once indexed"""
+        return self.connectivity().reachable(start, end)
+    
     def dijkstra(self, start: str, end: str) -> Tuple[float, List[str]]:
         """Find shortest path using Dijkstra's algorithm - O((V+E) log V)
         
+        Runs on the CSR view, so the search touches integer arrays only.
+        
         Returns:
             Tuple of (distance, path_list)
         """
+        return self.csr().dijkstra(start, end)
+    
+    def k_shortest_paths(self, start: str, end: str) -> Iterator[Tuple[float, List[str]]]:
+        """Alternative routes without repeated locations, shortest first
+        
+        A lazy generator: the first path costs one dijkstra call, and each
+        further one is only computed when asked for. Runs on the CSR view
+        current when it is called, so later graph changes are not seen.
+        
+        Yields:
+            Tuples of (distance, path_list)
+        """
+        return self.csr().k_shortest_paths(start, end)
+    
+    def heuristic_scale(self) -> float:
+        """Factor that keeps the straight-line heuristic admissible
+        
+        The haversine distance is a lower bound only if no path is shorter
+        than the straight line between its ends. Edges that are (from
+        inaccurate coordinates or weights) trigger a warning, and the
+        heuristic is scaled by the smallest weight/straight-line ratio so
+        it stays admissible and consistent. Returns 0 (plain Dijkstra) when
+        some location has no coordinates. Cached per graph version.
+        """
+        if self._heuristic_scale is not None and self._heuristic_scale[0] == self.version:
+            return self._heuristic_scale[1]
+        
+        scale = 1.0
+        if any(coords == (0, 0) for coords in self.locations.values()):
+            scale = 0.0
+        else:
+            violations = 0
+            for loc1, neighbors in self.adjacency.items():
+                for loc2, weight in neighbors:
+                    straight = haversine(*self.locations[loc1], *self.locations[loc2])
+                    if straight > 0 and weight < straight:
+                        violations += 1
+                        scale = min(scale, weight / straight)
+            if violations:
+                warnings.warn(
+                    f"{violations // 2} path(s) are shorter than the straight-line distance "
+                    f"between their ends; scaling the A* heuristic by {scale:.3f} to keep it admissible",
+                    RuntimeWarning, stacklevel=2
+                )
+        self._heuristic_scale = (self.version, scale)
+        return scale
+    
+    def _heuristic(self, target: str) -> Callable[[str], float]:
+        scale = self.heuristic_scale()
+        if scale == 0:
+            return lambda location: 0.0
+        lat, lon = self.locations[target]
+        locations = self.locations
+        return lambda location: scale * haversine(*locations[location], lat, lon)
+    
+    def astar(self, start: str, end: str, bidirectional: bool = False,
+              stats: dict = None) -> Tuple[float, List[str]]:
+        """Shortest path with A* guided by GPS coordinates
+        
+        Args:
+            start, end: Locations
+            bidirectional: Search from both ends at once
+            stats: Optional dict that receives the number of nodes expanded
+        
+        Returns:
+            Tuple of (distance, path_list), like dijkstra
+        """
         if start not in self.adjacency or end not in self.adjacency:
             return float('inf'), []
+        if bidirectional and start != end:
+            return self._bidirectional_astar(start, end, stats)
         
-        # Distance from start to each node
-        distances = {loc: float('inf') for loc in self.adjacency}
-        distances[start] = 0
+        h = self._heuristic(end)
+        g_score = {start: 0}
+        previous = {start: None}
+        pq = [(h(start), 0, start)]
+        closed = set()
         
-        # Track previous node for path reconstruction
-        previous = {loc: None for loc in self.adjacency}
+        while pq:
+            _, current_dist, current_node = heapq.heappop(pq)
+            if current_node in closed:
+                continue
+            closed.add(current_node)
+            if current_node == end:
+                break
+            for neighbor, weight in self.adjacency[current_node]:
+                if neighbor in closed:
+                    continue
+                new_dist = current_dist + weight
+                if new_dist < g_score.get(neighbor, float('inf')):
+                    g_score[neighbor] = new_dist
+                    previous[neighbor] = current_node
+                    heapq.heappush(pq, (new_dist + h(neighbor), new_dist, neighbor))
+        
+        if stats is not None:
+            stats["expanded"] = len(closed)
+        if end not in closed:
+            return float('inf'), []
+        path = []
+        node = end
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        path.reverse()
+        return g_score[end], path
+    
+    def _bidirectional_astar(self, start: str, end: str, stats: dict = None) -> Tuple[float, List[str]]:
+        """Bidirectional A* with average potentials
+        
+        Both searches use p(v) = (h_end(v) - h_start(v)) / 2 (negated in
+        reverse), which keeps reduced edge costs non-negative, so the
+        search can stop once the two queue minima sum to the best meeting
+        distance found.
+        """
+        h_end, h_start = self._heuristic(end), self._heuristic(start)
+        
+        def potential(location: str) -> float:
+            return (h_end(location) - h_start(location)) / 2
+        
+        dist = ({start: 0}, {end: 0})
+        parent = ({start: None}, {end: None})
+        queues = ([(potential(start), start)], [(-potential(end), end)])
+        closed = (set(), set())
+        best, meeting = float('inf'), None
+        
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            sign = 1 if side == 0 else -1
+            _, node = heapq.heappop(queues[side])
+            if node in closed[side]:
+                continue
+            closed[side].add(node)
+            node_dist = dist[side][node]
+            for neighbor, weight in self.adjacency[node]:
+                new_dist = node_dist + weight
+                if new_dist < dist[side].get(neighbor, float('inf')):
+                    dist[side][neighbor] = new_dist
+                    parent[side][neighbor] = node
+                    heapq.heappush(queues[side], (new_dist + sign * potential(neighbor), neighbor))
+                other = dist[1 - side].get(neighbor)
+                if other is not None and dist[side][neighbor] + other < best:
+                    best, meeting = dist[side][neighbor] + other, neighbor
+        
+        if stats is not None:
+            stats["expanded"] = len(closed[0]) + len(closed[1])
+        if meeting is None:
+            return float('inf'), []
+        
+        path = []
+        node = meeting
+        while node is not None:
+            path.append(node)
+            node = parent[0][node]
+        path.reverse()
+        node = parent[1][meeting]
+        while node is not None:
+            path.append(node)
+            node = parent[1][node]
+        return best, path
+    
+    def find_k_nearest(self, start: str, targets: List[str], k: int = 1) -> List[Tuple[str, float, List[str]]]:
+        """Find the k nearest targets with one Dijkstra search - O((V+E) log V)
         
-        # Priority queue: (distance, node)
+        The search stops as soon as k targets are settled, so nearby
+        targets are found after expanding only part of the graph.
+        
+        Returns:
+            List of (target, distance, path), nearest first
+        """
+        if start not in self.adjacency or k <= 0:
+            return []
+        remaining = set(targets) & self.adjacency.keys()
+        
+        distances = {start: 0}
+        previous = {start: None}
         pq = [(0, start)]
         visited = set()
+        found = []
         
-        while pq:
+        while pq and remaining:
             current_dist, current_node = heapq.heappop(pq)
-            
             if current_node in visited:
                 continue
             visited.add(current_node)
             
-            if current_node == end:
-                break
+            if current_node in remaining:
+                remaining.discard(current_node)
+                path = []
+                node = current_node
+                while node is not None:
+                    path.append(node)
+                    node = previous[node]
+                path.reverse()
+                found.append((current_node, current_dist, path))
+                if len(found) == k:
+                    break
             
             for neighbor, weight in self.adjacency[current_node]:
                 if neighbor in visited:
                     continue
-                
                 new_dist = current_dist + weight
-                if new_dist < distances[neighbor]:
+                if new_dist < distances.get(neighbor, float('inf')):
                     distances[neighbor] = new_dist
                     previous[neighbor] = current_node
                     heapq.heappush(pq, (new_dist, neighbor))
         
-        # Reconstruct path
-        path = []
-        current = end
-        while current is not None:
-            path.append(current)
-            current = previous[current]
-        path.reverse()
-        
-        if path[0] != start:
-            return float('inf'), []
-        
-        return distances[end], path
+        return found
     
     def find_nearest_location(self, start: str, targets: List[str]) -> Tuple[str, float, List[str]]:
         """Find nearest location from a list of targets
         
-        Useful for finding nearest guard to an alert location
+        Useful for finding nearest guard to an alert location. One search
+        that stops at the first target reached, instead of one per target.
         """
-        nearest = None
-        min_distance = float('inf')
-        best_path = []
-        
-        for target in targets:
-            distance, path = self.dijkstra(start, target)
-            if distance < min_distance:
-                min_distance = distance
-                nearest = target
-                best_path = path
-        
-        return nearest, min_distance, best_path
+        nearest = self.find_k_nearest(start, targets, k=1)
+        if not nearest:
+            return None, float('inf'), []
+        return nearest[0]
     
     def bfs_traversal(self, start: str) -> List[str]:
         """Breadth-First Search traversal - O(V + E)"""
         if start not in self.adjacency:
             return []
-        
-        visited = set()
-        queue = [start]
+        visited = {start}
+        queue = deque([start])
         result = []
-        
         while queue:
-            node = queue.pop(0)
-            if node not in visited:
-                visited.add(node)
-                result.append(node)
-                for neighbor, _ in self.adjacency[node]:
-                    if neighbor not in visited:
-                        queue.append(neighbor)
-        
+            node = queue.popleft()
+            result.append(node)
+            for neighbor, _ in self.adjacency[node]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.append(neighbor)
         return result
     
     def dfs_traversal(self, start: str, visited: set = None) -> List[str]:
-        """Depth-First Search traversal - O(V + E)"""
+        """Depth-First Search traversal - O(V + E)
+        
+        Iterative, so long corridors cannot overflow the recursion limit,
+        and visits neighbors in adjacency order like the recursive version.
+        Locations in ``visited`` are skipped, and the ones reached are added.
+        """
         if visited is None:
             visited = set()
-        
         if start not in self.adjacency or start in visited:
             return []
-        
-        visited.add(start)
-        result = [start]
-        
-        for neighbor, _ in self.adjacency[start]:
-            result.extend(self.dfs_traversal(neighbor, visited))
-        
+        result = []
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            result.append(node)
+            # Push in reverse so the first neighbor is explored first
+            for neighbor, _ in reversed(self.adjacency[node]):
+                if neighbor not in visited:
+                    stack.append(neighbor)
         return result
     
     def get_all_locations(self) -> List[str]:
@@ -1,78 +1,433 @@
 # Heap/Priority Queue for Alert System
 
 import heapq
+import re
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
+
+from .expiring_map import ExpiringMap
+
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_COALESCE_WINDOW = 5 * 60  # seconds
+
+_QUOTED = re.compile(r"'[^']*'|\"[^\"]*\"")
+_NUMBER = re.compile(r"\d+")
+
+
+def alert_template(message: str) -> str:
+    """Message with quoted values and numbers masked, so repeats of one kind match"""
+    return _NUMBER.sub("#", _QUOTED.sub("'*'", message))
+
+
+TimeValue = Union[int, float, str, datetime, None]
+
+# Location names are interned to small integer IDs shared by all alerts
+_LOCATION_IDS: Dict[str, int] = {}
+_LOCATION_NAMES: List[str] = []
+
+
+def intern_location(name: str) -> int:
+    """ID for a location name, assigning one on first use"""
+    location_id = _LOCATION_IDS.get(name)
+    if location_id is None:
+        location_id = _LOCATION_IDS[name] = len(_LOCATION_NAMES)
+        _LOCATION_NAMES.append(name)
+    return location_id
+
+
+def to_ns(value: TimeValue) -> Optional[int]:
+    """Epoch nanoseconds from ns ints, epoch seconds, datetimes or timestamp strings"""
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value * 1_000_000_000)
+    if isinstance(value, str):
+        value = datetime.strptime(value, TIMESTAMP_FORMAT)
+    return int(value.timestamp() * 1_000_000) * 1000
+
+
+def format_ns(ns: int) -> str:
+    return datetime.fromtimestamp(ns / 1_000_000_000).strftime(TIMESTAMP_FORMAT)
+
+
+class Alert:
+    """Queued security alert
+    
+    Times are epoch nanoseconds and the location is an interned ID; the
+    string forms are only produced on demand. Unpacks and indexes like
+    the (priority, timestamp, message, location) tuples the queue used
+    to hold.
+    """
+    __slots__ = ("alert_id", "priority", "time_ns", "message", "location_id", "acknowledged",
+                 "count", "last_seen_ns", "sort_key")
+    
+    def __init__(self, alert_id: int, priority: int, time_ns: int, message: str,
+                 location: str, acknowledged: bool = False, count: int = 1, last_seen_ns: int = None):
+        self.alert_id = alert_id        # Monotonic; breaks ties between equal times
+        self.priority = priority
+        self.time_ns = time_ns          # First seen
+        self.message = message
+        self.location_id = intern_location(location)
+        self.acknowledged = acknowledged
+        self.count = count              # Occurrences coalesced into this alert
+        self.last_seen_ns = last_seen_ns or time_ns
+        self.sort_key = (priority, time_ns, alert_id)
+    
+    @property
+    def location(self) -> str:
+        return _LOCATION_NAMES[self.location_id]
+    
+    @property
+    def timestamp(self) -> str:
+        return format_ns(self.time_ns)
+    
+    @property
+    def last_seen(self) -> str:
+        return format_ns(self.last_seen_ns)
+    
+    def key(self) -> tuple:
+        """Heap ordering: priority, then age, then arrival order"""
+        return self.sort_key
+    
+    def as_tuple(self) -> Tuple[int, str, str, str]:
+        return self.priority, self.timestamp, self.message, self.location
+    
+    def __iter__(self):
+        return iter(self.as_tuple())
+    
+    def __getitem__(self, index):
+        return self.as_tuple()[index]
+    
+    def __repr__(self) -> str:
+        return f"Alert({self.alert_id}, {self.as_tuple()!r})"
 
 
 class AlertSystem:
-    """Priority Queue (Min-Heap) for security alerts
+    """Indexed Priority Queue (Min-Heap) for security alerts
     
     Priority levels:
     - 1: High (Critical - immediate action required)
     - 2: Medium (Warning - attention needed)
     - 3: Low (Info - routine notification)
+    
+    Every alert gets an ID. A position map from ID to heap slot allows
+    resolving or re-prioritising any alert in O(log n), and per-priority
+    and per-location indexes keep counts and filters off the heap.
+    
+    Repeats of an open alert with the same message template and location
+    within ``coalesce_window`` seconds of its last occurrence are merged into
+    it (count and last-seen time) instead of queued again, even after the
+    alert was escalated; a more urgent repeat raises the alert's priority.
     """
     
-    def __init__(self):
-        self.heap: List[Tuple[int, str, str, str]] = []
-        self.alert_count = 0
+    def __init__(self, coalesce_window: float = DEFAULT_COALESCE_WINDOW):
+        self.coalesce_window = coalesce_window
+        # (template, location) -> alert_id, expiring after the window
+        self._recent = ExpiringMap(coalesce_window)
+        self.heap: List[Alert] = []
+        self.alert_count = 0            # Alerts ever added; also the next alert ID
+        self._pos: Dict[int, int] = {}  # alert_id -> heap index
+        self._by_priority: Dict[int, Dict[int, Alert]] = {1: {}, 2: {}, 3: {}}
+        self._by_location: Dict[int, Dict[int, Alert]] = {}   # location ID -> alerts
+        # Arrival times and IDs sorted by time, for bisect range queries;
+        # entries of resolved alerts are skipped and compacted away lazily
+        self._times = array('q')
+        self._time_ids = array('q')
+    
+    def __getstate__(self) -> dict:
+        return {
+            "alert_count": self.alert_count,
+            "alerts": [
+                (a.alert_id, a.priority, a.time_ns, a.message, a.location, a.acknowledged,
+                 a.count, a.last_seen_ns)
+                for a in self.heap
+            ],
+            # Part of the state: replay must make the same coalescing decisions
+            "coalesce_window": self.coalesce_window,
+            "recent": list(self._recent)
+        }
+    
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state.get("coalesce_window", DEFAULT_COALESCE_WINDOW))
+        for key, alert_id, touched in state.get("recent", []):
+            # Keys from older states also carried the priority
+            self._recent.put(tuple(key[:2]), alert_id, touched)
+        if "alerts" in state:
+            alerts = []
+            for record in state["alerts"]:
+                # Records from before numeric times carry timestamp strings
+                alert_id, priority, first, message, location, acknowledged, *rest = record
+                count, last = rest if rest else (1, None)
+                alerts.append(Alert(alert_id, priority, to_ns(first), message, location,
+                                    acknowledged, count, to_ns(last)))
+            self.alert_count = state["alert_count"]
+        else:
+            # Queue pickled as bare tuples before alert IDs existed
+            alerts = [Alert(i, p, to_ns(t), m, l) for i, (p, t, m, l) in enumerate(sorted(state["heap"]))]
+            self.alert_count = len(alerts)
+        
+        alerts.sort(key=Alert.key)
+        self.heap = alerts
+        for index, alert in enumerate(alerts):
+            self._pos[alert.alert_id] = index
+            self._index(alert)
+        self._rebuild_time_index()
+    
+    def _swap(self, i: int, j: int) -> None:
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i].alert_id] = i
+        self._pos[heap[j].alert_id] = j
+    
+    def _sift_up(self, i: int) -> None:
+        heap = self.heap
+        key = heap[i].sort_key
+        while i > 0:
+            parent = (i - 1) // 2
+            if heap[parent].sort_key <= key:
+                break
+            self._swap(i, parent)
+            i = parent
+    
+    def _sift_down(self, i: int) -> None:
+        heap = self.heap
+        size = len(heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < size and heap[child].sort_key < heap[smallest].sort_key:
+                    smallest = child
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
+    
+    def _index(self, alert: Alert) -> None:
+        self._by_priority.setdefault(alert.priority, {})[alert.alert_id] = alert
+        self._by_location.setdefault(alert.location_id, {})[alert.alert_id] = alert
+    
+    def _unindex(self, alert: Alert) -> None:
+        self._by_priority.get(alert.priority, {}).pop(alert.alert_id, None)
+        same_location = self._by_location.get(alert.location_id, {})
+        same_location.pop(alert.alert_id, None)
+        if not same_location:
+            self._by_location.pop(alert.location_id, None)
+    
+    def _rebuild_time_index(self) -> None:
+        ordered = sorted(self.heap, key=lambda a: (a.time_ns, a.alert_id))
+        self._times = array('q', (a.time_ns for a in ordered))
+        self._time_ids = array('q', (a.alert_id for a in ordered))
+    
+    def _remove_at(self, i: int) -> Alert:
+        """Remove the alert in heap slot i - O(log n)"""
+        heap = self.heap
+        last = len(heap) - 1
+        if i != last:
+            self._swap(i, last)
+        alert = heap.pop()
+        del self._pos[alert.alert_id]
+        self._unindex(alert)
+        if i < len(heap):
+            self._sift_down(i)
+            self._sift_up(i)
+        if len(self._times) > 2 * len(heap) + 1024:
+            self._rebuild_time_index()
+        return alert
     
-    def add_alert(self, priority: int, message: str, location: str) -> None:
-        """Add an alert to the priority queue - O(log n)"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        heapq.heappush(self.heap, (priority, timestamp, message, location))
+    def add_alert(self, priority: int, message: str, location: str, timestamp: TimeValue = None) -> int:
+        """Add an alert to the priority queue - O(log n), O(1) when coalesced
+        
+        Args:
+            timestamp: Epoch nanoseconds (default now); datetimes and
+                timestamp strings from older journals are converted
+        
+        Returns:
+            The ID of the new alert, or of the open alert it was merged into
+        """
+        time_ns = time.time_ns() if timestamp is None else to_ns(timestamp)
+        
+        if self.coalesce_window:
+            now = time_ns / 1_000_000_000
+            key = (alert_template(message), location)
+            existing = self.get_alert(self._recent.get(key, now))
+            self._recent.put(key, self.alert_count if existing is None else existing.alert_id, now)
+            if existing is not None:
+                existing.count += 1
+                existing.last_seen_ns = time_ns
+                if priority < existing.priority:
+                    self.change_priority(existing.alert_id, priority)
+                return existing.alert_id
+        
+        alert = Alert(self.alert_count, priority, time_ns, message, location)
         self.alert_count += 1
+        self.heap.append(alert)
+        self._pos[alert.alert_id] = len(self.heap) - 1
+        self._index(alert)
+        self._sift_up(len(self.heap) - 1)
+        if not self._times or time_ns >= self._times[-1]:
+            self._times.append(time_ns)
+            self._time_ids.append(alert.alert_id)
+        else:
+            # Out-of-order timestamp: keep both arrays sorted by time
+            index = bisect_right(self._times, time_ns)
+            self._times.insert(index, time_ns)
+            self._time_ids.insert(index, alert.alert_id)
+        return alert.alert_id
     
-    def get_highest_priority_alert(self) -> Tuple[int, str, str, str]:
+    def alerts_between(self, since: TimeValue = None, until: TimeValue = None) -> List[Alert]:
+        """Open alerts first seen in [since, until], oldest first - O(log n + k)"""
+        since, until = to_ns(since), to_ns(until)
+        lo = 0 if since is None else bisect_left(self._times, since)
+        hi = len(self._times) if until is None else bisect_right(self._times, until)
+        alerts = []
+        for alert_id in self._time_ids[lo:hi]:
+            alert = self.get_alert(alert_id)
+            if alert is not None:
+                alerts.append(alert)
+        return alerts
+    
+    def set_coalesce_window(self, seconds: float) -> None:
+        """Change the coalescing window; 0 disables coalescing"""
+        self.coalesce_window = seconds
+        self._recent.ttl = seconds
+        if not seconds:
+            self._recent.clear()
+    
+    def get_alert(self, alert_id: int) -> Optional[Alert]:
+        """Look up an active alert by ID - O(1)"""
+        index = self._pos.get(alert_id)
+        return self.heap[index] if index is not None else None
+    
+    def acknowledge(self, alert_id: int) -> bool:
+        """Mark an alert as seen by an operator; it stays queued - O(1)"""
+        alert = self.get_alert(alert_id)
+        if alert is None:
+            return False
+        alert.acknowledged = True
+        return True
+    
+    def resolve(self, alert_id: int) -> bool:
+        """Remove an alert from the queue by ID - O(log n)"""
+        index = self._pos.get(alert_id)
+        if index is None:
+            return False
+        self._remove_at(index)
+        return True
+    
+    def change_priority(self, alert_id: int, priority: int) -> bool:
+        """Re-prioritise an alert in place - O(log n)"""
+        alert = self.get_alert(alert_id)
+        if alert is None:
+            return False
+        self._unindex(alert)
+        alert.priority = priority
+        alert.sort_key = (priority, alert.time_ns, alert.alert_id)
+        self._index(alert)
+        index = self._pos[alert_id]
+        self._sift_up(index)
+        self._sift_down(self._pos[alert_id])
+        return True
+    
+    def escalate(self, alert_id: int) -> bool:
+        """Raise an alert one priority level (towards 1) - O(log n)"""
+        alert = self.get_alert(alert_id)
+        if alert is None or alert.priority <= 1:
+            return False
+        return self.change_priority(alert_id, alert.priority - 1)
+    
+    def escalate_if_pending(self, alert_id: int, expected_priority: int) -> bool:
+        """Escalate an alert only if it is unacknowledged and still at ``expected_priority``
+        
+        Check and escalation are one operation, so a timed escalation cannot
+        override an acknowledgement or re-prioritisation made since the
+        deadline was set - O(log n)
+        """
+        alert = self.get_alert(alert_id)
+        if alert is None or alert.acknowledged or alert.priority != expected_priority:
+            return False
+        return self.escalate(alert_id)
+    
+    def get_highest_priority_alert(self) -> Optional[Alert]:
         """Get and remove the highest priority alert - O(log n)"""
         if self.heap:
-            return heapq.heappop(self.heap)
+            return self._remove_at(0)
         return None
     
-    def peek_highest_priority(self) -> Tuple[int, str, str, str]:
+    def peek_highest_priority(self) -> Optional[Alert]:
         """View highest priority alert without removing - O(1)"""
         if self.heap:
             return self.heap[0]
         return None
     
-    def get_all_alerts_sorted(self) -> List[Tuple[int, str, str, str]]:
+    def get_all_alerts_sorted(self) -> List[Alert]:
         """Get all alerts sorted by priority - O(n log n)"""
-        return sorted(self.heap)
+        return sorted(self.heap, key=Alert.key)
+    
+    def get_alerts_by_priority(self, priority: int) -> List[Alert]:
+        """Filter alerts by priority level - O(k) for k matches"""
+        return list(self._by_priority.get(priority, {}).values())
     
-    def get_alerts_by_priority(self, priority: int) -> List[Tuple[int, str, str, str]]:
-        """Filter alerts by priority level"""
-        return [alert for alert in self.heap if alert[0] == priority]
+    def get_alerts_by_location(self, location: str) -> List[Alert]:
+        """Filter alerts by location - O(k) for k matches"""
+        location_id = _LOCATION_IDS.get(location)
+        return list(self._by_location.get(location_id, {}).values())
     
-    def get_alerts_by_location(self, location: str) -> List[Tuple[int, str, str, str]]:
-        """Filter alerts by location"""
-        return [alert for alert in self.heap if alert[3] == location]
+    def count_by_location(self) -> dict:
+        """Count alerts per location - O(locations)"""
+        return {_LOCATION_NAMES[location_id]: len(alerts) for location_id, alerts in self._by_location.items()}
     
     def clear_alerts(self) -> None:
         """Clear all alerts"""
-        self.heap = []
+        alert_count = self.alert_count
+        self.__init__(self.coalesce_window)
+        self.alert_count = alert_count
     
     def count_alerts(self) -> int:
-        """Get total number of active alerts"""
+        """Get total number of active alerts - O(1)"""
         return len(self.heap)
     
     def count_by_priority(self) -> dict:
-        """Count alerts per priority level"""
+        """Count alerts per priority level - O(1)"""
         counts = {1: 0, 2: 0, 3: 0}
-        for alert in self.heap:
-            if alert[0] in counts:
-                counts[alert[0]] += 1
+        for priority, alerts in self._by_priority.items():
+            counts[priority] = len(alerts)
         return counts
     
-    def to_dataframe_format(self) -> List[dict]:
-        """Convert alerts to list of dicts for pandas DataFrame"""
+    def __len__(self) -> int:
+        return len(self.heap)
+    
+    def __iter__(self):
+        """Yield alerts in heap order without sorting or copying"""
+        return iter(self.heap)
+    
+    def to_dataframe_format(self, limit: int = None) -> List[dict]:
+        """Convert alerts to list of dicts for pandas DataFrame
+        
+        This is where times are formatted as strings, and only for the
+        alerts actually rendered.
+        
+        Args:
+            limit: Only the ``limit`` most urgent alerts - O(n log limit)
+        """
         priority_labels = {1: "High", 2: "Medium", 3: "Low"}
+        if limit is None:
+            alerts = self.get_all_alerts_sorted()
+        else:
+            alerts = heapq.nsmallest(limit, self.heap, key=Alert.key)
         return [
             {
-                "Priority": f"{p} ({priority_labels.get(p, 'Unknown')})",
-                "Time": t,
-                "Message": m,
-                "Location": l
+                "ID": a.alert_id,
+                "Priority": f"{a.priority} ({priority_labels.get(a.priority, 'Unknown')})",
+                "Time": a.timestamp,
+                "Message": a.message,
+                "Location": a.location,
+                "Count": a.count,
+                "Last Seen": a.last_seen,
+                "Acknowledged": a.acknowledged
             }
-            for p, t, m, l in sorted(self.heap)
+            for a in alerts
         ]
@@ -1,5 +1,8 @@
 # Linked List Data Structures for IntruWatch
 
+import threading
+from datetime import datetime
+
 class LoginNode:
     """Linked list node for admin login credentials"""
     def __init__(self, username: str, password_hash: str):
@@ -36,7 +39,7 @@ class LoginLinkedList:
 
 
 class CheckInNode:
-    """Linked list node for resident check-ins"""
+    """Doubly linked list node for resident check-ins"""
     def __init__(self, username: str, reg_no: str, designation: str, 
                  gender: str, room_no: str = None, employee_no: str = None):
         self.username = username
@@ -46,74 +49,181 @@ class CheckInNode:
         self.room_no = room_no
         self.employee_no = employee_no
         self.next = None
+        self.prev = None
 
 
 class CheckInLinkedList:
-    """Linked list to manage resident check-ins"""
+    """Linked list to manage resident check-ins
+    
+    Hash indexes on username, reg_no and employee_no give O(1) lookup, and
+    prev pointers give O(1) unlinking on checkout. One list is shared by
+    every session, so check-ins, checkouts and pickling hold a lock; hold
+    ``lock`` around a change and its save to keep saves in order.
+    """
     def __init__(self):
+        self._lock = threading.RLock()
         self.head = None
         self.student_count = 0
         self.faculty_count = 0
         self.other_count = 0
+        self._by_username = {}      # username -> {id(node): node}
+        self._by_reg_no = {}        # reg_no -> node
+        self._by_employee_no = {}   # employee_no -> node
+        self._room_counts = {}      # room_no -> residents checked in
     
-    def insert(self, username: str, reg_no: str, designation: str,
-               gender: str, room_no: str = None, employee_no: str = None) -> None:
-        new_node = CheckInNode(username, reg_no, designation, gender, room_no, employee_no)
-        new_node.next = self.head
-        self.head = new_node
+    def __len__(self) -> int:
+        return self.student_count + self.faculty_count + self.other_count
+    
+    @property
+    def lock(self) -> threading.RLock:
+        """Held by changes and pickling; hold it around a change and its save"""
+        return self._lock
+    
+    def __getstate__(self) -> dict:
+        # Pickle as flat records: avoids deep recursion over long chains
+        with self._lock:
+            records = [
+                (node.username, node.reg_no, node.designation, node.gender, node.room_no, node.employee_no)
+                for node in self
+            ]
+        records.reverse()
+        return {"records": records}
+    
+    def __setstate__(self, state: dict) -> None:
+        self.__init__()
+        if "records" in state:
+            for record in state["records"]:
+                self.insert(*record)
+            return
+        
+        # Lists pickled before indexing: relink oldest-first, newest stays at head
+        nodes = []
+        current = state.get("head")
+        while current:
+            nodes.append(current)
+            current = current.next
+        for node in reversed(nodes):
+            node.next = node.prev = None
+            self._link(node)
+    
+    def _link(self, node: CheckInNode) -> None:
+        """Push a node at the head, index it and update counters"""
+        node.next = self.head
+        if self.head is not None:
+            self.head.prev = node
+        self.head = node
+        
+        self._by_username.setdefault(node.username, {})[id(node)] = node
+        if node.reg_no is not None:
+            self._by_reg_no[node.reg_no] = node
+        if node.employee_no is not None:
+            self._by_employee_no[node.employee_no] = node
         
         # Update counters
-        if designation == "Student":
+        if node.room_no is not None:
+            self._room_counts[node.room_no] = self._room_counts.get(node.room_no, 0) + 1
+        if node.designation == "Student":
             self.student_count += 1
-        elif designation == "Faculty":
+        elif node.designation == "Faculty":
             self.faculty_count += 1
         else:
             self.other_count += 1
     
-    def remove(self, username: str, identifier: str, designation: str, location: str) -> bool:
-        current = self.head
-        previous = None
+    def _unlink(self, node: CheckInNode) -> None:
+        """Remove a node from the chain, indexes and counters - O(1)"""
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        node.next = node.prev = None
         
-        while current:
-            identifier_match = (current.reg_no == identifier) or (current.employee_no == identifier)
-            location_match = (current.room_no == location) or (current.employee_no == location)
+        same_name = self._by_username.get(node.username, {})
+        same_name.pop(id(node), None)
+        if not same_name:
+            self._by_username.pop(node.username, None)
+        if self._by_reg_no.get(node.reg_no) is node:
+            del self._by_reg_no[node.reg_no]
+        if self._by_employee_no.get(node.employee_no) is node:
+            del self._by_employee_no[node.employee_no]
+        
+        if node.room_no is not None:
+            self._room_counts[node.room_no] -= 1
+            if not self._room_counts[node.room_no]:
+                del self._room_counts[node.room_no]
+        if node.designation == "Student":
+            self.student_count -= 1
+        elif node.designation == "Faculty":
+            self.faculty_count -= 1
+        else:
+            self.other_count -= 1
+    
+    def insert(self, username: str, reg_no: str, designation: str,
+               gender: str, room_no: str = None, employee_no: str = None) -> bool:
+        """Check a resident in - O(1)
+        
+        Returns:
+            False if someone is already checked in with this reg/employee number
+        """
+        with self._lock:
+            if self.find_by_identifier(reg_no) or self.find_by_identifier(employee_no):
+                return False
+            self._link(CheckInNode(username, reg_no, designation, gender, room_no, employee_no))
+            return True
+    
+    def find_by_identifier(self, identifier: str):
+        """Find the check-in holding a registration or employee number - O(1)"""
+        if identifier is None:
+            return None
+        return self._by_reg_no.get(identifier) or self._by_employee_no.get(identifier)
+    
+    def find_by_username(self, username: str) -> list:
+        """All check-ins under a name - O(k) for k matches"""
+        return list(self._by_username.get(username, {}).values())
+    
+    def count_by_room(self) -> dict:
+        """Residents checked in per hostel or residence - O(rooms)"""
+        return dict(self._room_counts)
+    
+    def is_checked_in(self, identifier: str) -> bool:
+        return self.find_by_identifier(identifier) is not None
+    
+    def remove(self, username: str, identifier: str, designation: str, location: str) -> bool:
+        """Check a resident out by identifier - O(1)"""
+        with self._lock:
+            current = self.find_by_identifier(identifier)
+            if current is None:
+                return False
             
-            if (current.username == username and 
-                current.designation == designation and 
-                identifier_match and location_match):
-                
-                # Update counters
-                if designation == "Student":
-                    self.student_count -= 1
-                elif designation == "Faculty":
-                    self.faculty_count -= 1
-                else:
-                    self.other_count -= 1
-                
-                # Remove node
-                if previous is None:
-                    self.head = current.next
-                else:
-                    previous.next = current.next
+            location_match = (current.room_no == location) or (current.employee_no == location)
+            if (current.username == username and
+                    current.designation == designation and location_match):
+                self._unlink(current)
                 return True
-            
-            previous = current
-            current = current.next
-        return False
+            return False
     
     def to_list(self) -> list:
         data_list = []
+        with self._lock:
+            current = self.head
+            while current:
+                data_list.append({
+                    "Username": current.username,
+                    "Designation": current.designation,
+                    "Gender": current.gender,
+                    "Reg/Emp No": current.reg_no if current.designation == "Student" else current.employee_no,
+                    "Hostel No": current.room_no
+                })
+                current = current.next
+        return data_list
+    
+    def __iter__(self):
+        """Yield check-in nodes from newest to oldest without copying"""
         current = self.head
         while current:
-            data_list.append({
-                "Username": current.username,
-                "Designation": current.designation,
-                "Gender": current.gender,
-                "Reg/Emp No": current.reg_no if current.designation == "Student" else current.employee_no,
-                "Hostel No": current.room_no
-            })
+            yield current
             current = current.next
-        return data_list
     
     def get_student_reg_numbers(self) -> list:
         regs = []
@@ -129,37 +239,110 @@ class CheckInLinkedList:
 
 
 class EventNode:
-    """Linked list node for event logging"""
-    def __init__(self, data: str):
+    """Logged event (kept as a node for compatibility with older pickles)"""
+    def __init__(self, data: str, timestamp: str = None):
         self.data = data
+        self.timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.next = None
 
 
 class EventLinkedList:
-    """Fixed-size linked list for recent events (FIFO behavior)"""
-    def __init__(self, max_size: int = 10):
-        self.head = None
-        self.size = 0
+    """Fixed-size ring buffer for recent events (FIFO behavior)
+    
+    Appends are O(1). Evicted events are handed to an optional ``overflow``
+    store (see utils.segments.EventSegmentStore), so older history can be
+    paged back from disk. The overflow store is not pickled; its owner
+    re-attaches it after loading.
+    """
+    def __init__(self, max_size: int = 10, overflow=None):
         self.max_size = max_size
+        self._buffer = [None] * max_size
+        self._start = 0     # Slot of the oldest buffered event
+        self.size = 0
+        self.total = 0      # Events ever added; the next event's index
+        self.overflow = overflow
     
-    def add_event(self, event_data: str) -> None:
-        new_node = EventNode(event_data)
-        new_node.next = self.head
-        self.head = new_node
-        self.size += 1
-        
-        # Trim if exceeds max size
-        if self.size > self.max_size:
-            current = self.head
-            for _ in range(self.max_size - 1):
+    def __getstate__(self) -> dict:
+        return {
+            "max_size": self.max_size,
+            "total": self.total,
+            "events": [(node.data, node.timestamp) for node in reversed(self.recent())]
+        }
+    
+    def __setstate__(self, state: dict) -> None:
+        if "head" in state:
+            # Linked-list pickle from before the ring buffer
+            nodes = []
+            current = state["head"]
+            while current:
+                nodes.append(current)
                 current = current.next
-            current.next = None
-            self.size = self.max_size
+            events = [(n.data, getattr(n, "timestamp", None)) for n in reversed(nodes)]
+            total = len(events)
+        else:
+            events = state["events"]
+            total = state["total"]
+        
+        self.__init__(state["max_size"])
+        for data, timestamp in events:
+            self.add_event(data, timestamp)
+        self.total = total
+    
+    def add_event(self, event_data: str, timestamp: str = None) -> None:
+        """Append an event, evicting the oldest when full - O(1)"""
+        new_node = EventNode(event_data, timestamp)
+        if self.size < self.max_size:
+            self._buffer[(self._start + self.size) % self.max_size] = new_node
+            self.size += 1
+        else:
+            evicted = self._buffer[self._start]
+            self._buffer[self._start] = new_node
+            self._start = (self._start + 1) % self.max_size
+            if self.overflow is not None:
+                self.overflow.append(self.total - self.max_size, evicted)
+        self.total += 1
+    
+    def recent(self, count: int = None) -> list:
+        """Newest-first slice of buffered events - O(count)"""
+        if count is None or count > self.size:
+            count = self.size
+        last = self._start + self.size - 1
+        return [self._buffer[(last - i) % self.max_size] for i in range(count)]
     
     def get_all_events(self) -> list:
-        events = []
-        current = self.head
-        while current:
-            events.append(current.data)
-            current = current.next
-        return events
+        return [node.data for node in self.recent()]
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def __iter__(self):
+        """Yield buffered event nodes from newest to oldest"""
+        return iter(self.recent())
+    
+    def get_history(self, offset: int = 0, limit: int = 50) -> list:
+        """Page through all events newest-first, reading evicted ones from overflow
+        
+        Args:
+            offset: Number of newest events to skip
+            limit: Page size
+        """
+        newest = self.total - 1 - offset
+        oldest = max(newest - limit + 1, 0)
+        if newest < 0:
+            return []
+        
+        first_buffered = self.total - self.size
+        page = []
+        if newest >= first_buffered:
+            skip = self.total - 1 - newest
+            page = self.recent(skip + (newest - max(oldest, first_buffered) + 1))[skip:]
+        if oldest < first_buffered and self.overflow is not None:
+            older = self.overflow.read(oldest, min(newest, first_buffered - 1) + 1)
+            page.extend(EventNode(data, timestamp) for data, timestamp in reversed(older))
+        return page
+    
+    def history_size(self) -> int:
+        """Number of events reachable through get_history"""
+        if self.overflow is None:
+            return self.size
+        return self.total
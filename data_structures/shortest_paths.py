@@ -0,0 +1,168 @@
+# All-Pairs Shortest Paths for the Campus Graph
+
+import heapq
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+# Above this many locations, repeated Dijkstra beats the O(V^3) matrix passes
+FLOYD_WARSHALL_MAX_NODES = 400
+
+# Largest graph the table is built for; it holds 12 bytes per pair of locations
+PATH_TABLE_MAX_NODES = 1000
+
+INF = float('inf')
+
+
+class ShortestPathTable:
+    """Distance and next-hop matrices for every pair of locations
+    
+    ``dist[i, j]`` is the shortest distance and ``next_hop[i, j]`` the
+    first location after i on a shortest path to j (-1 if unreachable),
+    so a path is read off in O(path length). The table records the graph
+    version it matches; CampusGraph repairs it in place when paths are
+    added, reweighted or closed, and rebuilds it otherwise.
+    """
+    
+    def __init__(self, names: List[str]):
+        self.names = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+        self.dist = np.full((n, n), INF)
+        np.fill_diagonal(self.dist, 0.0)
+        self.next_hop = np.full((n, n), -1, dtype=np.int32)
+        np.fill_diagonal(self.next_hop, np.arange(n, dtype=np.int32))
+        self.version = None
+    
+    @classmethod
+    def build(cls, adjacency: Dict[str, List[Tuple[str, float]]], version: int = None) -> 'ShortestPathTable':
+        """Compute the table for an adjacency dict"""
+        table = cls(adjacency.keys())
+        if len(table.names) <= FLOYD_WARSHALL_MAX_NODES:
+            table._floyd_warshall(adjacency)
+        else:
+            table.recompute_rows(adjacency, range(len(table.names)))
+        table.version = version
+        return table
+    
+    def _floyd_warshall(self, adjacency: Dict[str, List[Tuple[str, float]]]) -> None:
+        """Vectorized Floyd-Warshall: one O(V^2) NumPy pass per intermediate node"""
+        index = self.index
+        dist, next_hop = self.dist, self.next_hop
+        for name, neighbors in adjacency.items():
+            i = index[name]
+            for neighbor, weight in neighbors:
+                j = index[neighbor]
+                if weight < dist[i, j]:
+                    dist[i, j] = weight
+                    next_hop[i, j] = j
+        
+        for k in range(len(self.names)):
+            via = dist[:, k, None] + dist[None, k, :]
+            better = via < dist
+            if better.any():
+                np.copyto(dist, via, where=better)
+                np.copyto(next_hop, np.broadcast_to(next_hop[:, k, None], next_hop.shape), where=better)
+    
+    def recompute_rows(self, adjacency: Dict[str, List[Tuple[str, float]]], sources: Iterable[int]) -> None:
+        """Recompute the rows of the given sources with Dijkstra - O(k (V+E) log V)"""
+        index, names = self.index, self.names
+        for source in sources:
+            dist = self.dist[source]
+            first = self.next_hop[source]
+            dist.fill(INF)
+            first.fill(-1)
+            dist[source] = 0.0
+            first[source] = source
+            pq = [(0.0, source)]
+            done = set()
+            while pq:
+                d, u = heapq.heappop(pq)
+                if u in done:
+                    continue
+                done.add(u)
+                for neighbor, weight in adjacency[names[u]]:
+                    v = index[neighbor]
+                    nd = d + weight
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        first[v] = v if u == source else first[u]
+                        heapq.heappush(pq, (nd, v))
+    
+    def add_node(self, name: str) -> None:
+        """Grow the table by an isolated location - O(V^2) copy"""
+        n = len(self.names)
+        self.names.append(name)
+        self.index[name] = n
+        dist = np.full((n + 1, n + 1), INF)
+        dist[:n, :n] = self.dist
+        dist[n, n] = 0.0
+        next_hop = np.full((n + 1, n + 1), -1, dtype=np.int32)
+        next_hop[:n, :n] = self.next_hop
+        next_hop[n, n] = n
+        self.dist, self.next_hop = dist, next_hop
+    
+    def relax_edge(self, loc1: str, loc2: str, weight: float) -> None:
+        """Repair the table after an undirected edge is added or shortened - O(V^2)
+        
+        Any pair whose shortest path improves must now use the edge, in one
+        direction or the other, so one vectorized pass per direction suffices.
+        """
+        u, v = self.index[loc1], self.index[loc2]
+        for a, b in ((u, v), (v, u)):
+            dist = self.dist
+            # Best route i -> a -> b -> j for every pair (i, j)
+            via = dist[:, a, None] + weight + dist[None, b, :]
+            better = via < dist
+            if not better.any():
+                continue
+            # First hop towards a, or b itself when starting at a
+            hop = self.next_hop[:, a].copy()
+            hop[a] = b
+            np.copyto(dist, via, where=better)
+            np.copyto(self.next_hop, np.broadcast_to(hop[:, None], self.next_hop.shape), where=better)
+    
+    def sources_using_edge(self, loc1: str, loc2: str, weight: float) -> np.ndarray:
+        """Sources with a shortest path over the undirected edge - O(V)
+        
+        Source i can route over the edge only if it is tight, i.e.
+        dist[i, v] == dist[i, u] + weight in one direction or the other.
+        """
+        u, v = self.index[loc1], self.index[loc2]
+        to_u, to_v = self.dist[:, u], self.dist[:, v]
+        tight = np.isfinite(to_u) & (np.isclose(to_u + weight, to_v) | np.isclose(to_v + weight, to_u))
+        return np.flatnonzero(tight)
+    
+    def raise_edge(self, adjacency: Dict[str, List[Tuple[str, float]]],
+                   loc1: str, loc2: str, old_weight: float) -> None:
+        """Repair the table after an undirected edge is lengthened or removed
+        
+        ``adjacency`` already reflects the change. Only pairs whose shortest
+        path used the edge can get longer, and every such pair has its
+        source among the tight rows, so only those rows are recomputed -
+        O(V + k (V+E) log V) for k affected sources.
+        """
+        self.recompute_rows(adjacency, self.sources_using_edge(loc1, loc2, old_weight).tolist())
+    
+    def distance(self, start: str, end: str) -> float:
+        i, j = self.index.get(start), self.index.get(end)
+        if i is None or j is None:
+            return INF
+        return float(self.dist[i, j])
+    
+    def path(self, start: str, end: str) -> Tuple[float, List[str]]:
+        """Shortest path by following next hops - O(path length)
+        
+        Returns:
+            Tuple of (distance, path_list), or (inf, []) if unreachable
+        """
+        i, j = self.index.get(start), self.index.get(end)
+        if i is None or j is None or self.next_hop[i, j] < 0:
+            return INF, []
+        path = [start]
+        current = i
+        while current != j:
+            current = int(self.next_hop[current, j])
+            path.append(self.names[current])
+        return float(self.dist[i, j]), path
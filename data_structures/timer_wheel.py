@@ -0,0 +1,116 @@
+# Hierarchical Timer Wheel for IntruWatch
+
+from typing import Any, Dict, List, Sequence
+
+
+class Timer:
+    """Handle for a scheduled timer"""
+    __slots__ = ("expires", "payload", "_slot")
+    
+    def __init__(self, expires: int, payload: Any):
+        self.expires = expires      # Absolute tick
+        self.payload = payload
+        self._slot = None           # Slot dict currently holding this timer
+    
+    @property
+    def active(self) -> bool:
+        return self._slot is not None
+
+
+class TimerWheel:
+    """Hierarchical hashed timer wheel
+    
+    Level 0 has one slot per tick; each slot of level k spans a full turn
+    of level k-1. Scheduling and cancelling are O(1), and advancing one
+    tick only touches the current slot (plus a cascade from the next level
+    once per turn), so idle timers cost nothing.
+    
+    The wheel has no clock of its own: callers pass the current time to
+    ``advance``, which makes it deterministic to drive from tests.
+    """
+    
+    def __init__(self, tick: float = 1.0, slots: Sequence[int] = (64, 64, 64), start: float = 0.0):
+        self.tick = tick
+        self.origin = start
+        self.current = 0            # Ticks processed so far
+        self.slots = tuple(slots)
+        self.levels: List[List[Dict[int, Timer]]] = [[{} for _ in range(n)] for n in self.slots]
+        self._spans = []            # Ticks covered by one slot of each level
+        span = 1
+        for n in self.slots:
+            self._spans.append(span)
+            span *= n
+        self._range = span
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _place(self, timer: Timer) -> None:
+        delta = max(timer.expires - self.current, 0)
+        level = 0
+        while level < len(self.slots) - 1 and delta >= self._spans[level + 1]:
+            level += 1
+        # Timers beyond the wheel's range wait in the top level and are
+        # re-placed when their slot cascades
+        expires = min(timer.expires, self.current + self._range - 1)
+        slot = self.levels[level][(expires // self._spans[level]) % self.slots[level]]
+        slot[id(timer)] = timer
+        timer._slot = slot
+    
+    def to_tick(self, when: float) -> int:
+        return int((when - self.origin) // self.tick)
+    
+    def schedule_at(self, when: float, payload: Any) -> Timer:
+        """Schedule a payload to expire at an absolute time - O(1)"""
+        timer = Timer(max(self.to_tick(when), self.current + 1), payload)
+        self._place(timer)
+        self._count += 1
+        return timer
+    
+    def schedule(self, now: float, delay: float, payload: Any) -> Timer:
+        """Schedule a payload to expire ``delay`` seconds after ``now`` - O(1)"""
+        return self.schedule_at(now + delay, payload)
+    
+    def cancel(self, timer: Timer) -> bool:
+        """Cancel a pending timer - O(1)"""
+        if timer._slot is None:
+            return False
+        del timer._slot[id(timer)]
+        timer._slot = None
+        self._count -= 1
+        return True
+    
+    def _cascade(self) -> None:
+        """Move timers down from higher levels whose slot just came up"""
+        for level in range(1, len(self.slots)):
+            if self.current % self._spans[level]:
+                break
+            index = (self.current // self._spans[level]) % self.slots[level]
+            slot = self.levels[level][index]
+            self.levels[level][index] = {}
+            for timer in slot.values():
+                self._place(timer)
+    
+    def advance(self, now: float) -> List[Any]:
+        """Process ticks up to ``now`` and return the payloads that expired"""
+        target = self.to_tick(now)
+        expired = []
+        while self.current < target:
+            if self._count == 0:
+                # Nothing pending: jump instead of walking empty slots
+                self.current = target
+                break
+            self.current += 1
+            self._cascade()
+            index = self.current % self.slots[0]
+            slot = self.levels[0][index]
+            self.levels[0][index] = {}
+            for timer in slot.values():
+                if timer.expires > self.current:
+                    self._place(timer)
+                    continue
+                timer._slot = None
+                self._count -= 1
+                expired.append(timer.payload)
+        return expired
@@ -0,0 +1,62 @@
+# Backup tests: chunked round trip and locking against other processes
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from utils import persistence
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def backup_dirs(tmp_path, monkeypatch):
+    data_dir, backup_dir = tmp_path / "data", tmp_path / "backups"
+    monkeypatch.setattr(persistence, "DATA_DIR", data_dir)
+    monkeypatch.setattr(persistence, "BACKUP_DIR", backup_dir)
+    monkeypatch.setattr(persistence, "CHUNK_DIR", backup_dir / "chunks")
+    monkeypatch.setattr(persistence, "MANIFEST_DIR", backup_dir / "manifests")
+    monkeypatch.setattr(persistence, "BACKUP_LOCK_FILE", backup_dir / "backup.lock")
+    persistence.ensure_directories()
+    return data_dir, backup_dir
+
+
+def test_backup_round_trip_and_prune(backup_dirs):
+    data_dir, _ = backup_dirs
+    source = data_dir / "guards.pkl"
+    versions = [os.urandom(200 * 1024) for _ in range(3)]
+    for i, payload in enumerate(versions):
+        source.write_bytes(payload)
+        assert persistence.create_backup("guards", keep=2)
+        time.sleep(0.001)
+    
+    backups = persistence.list_backups("guards")
+    assert len(backups) == 2
+    assert persistence.restore_backup(backups[-1], "guards")
+    assert source.read_bytes() == versions[1]
+    assert not (data_dir / "guards.pkl.restore").exists()
+
+
+@pytest.mark.skipif(persistence.fcntl is None, reason="needs fcntl file locks")
+def test_prune_waits_for_a_backup_in_another_process(backup_dirs, tmp_path):
+    holder = subprocess.Popen(
+        [sys.executable, "-c",
+         "import sys, time; sys.path.insert(0, sys.argv[1]);"
+         "from utils import persistence;"
+         "lock = persistence._backup_lock(); lock.__enter__();"
+         "print('locked', flush=True); time.sleep(1.0)",
+         str(ROOT)],
+        cwd=tmp_path, stdout=subprocess.PIPE, text=True
+    )
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        started = time.monotonic()
+        persistence.prune_backups("guards", keep=0)
+        assert time.monotonic() - started > 0.5
+    finally:
+        holder.wait()
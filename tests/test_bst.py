@@ -0,0 +1,111 @@
+# Guard tree tests: AVL invariants checked against a sorted list
+
+import math
+import pickle
+import random
+
+import pytest
+
+from data_structures.bst import GuardNode, GuardTree
+
+
+def check_invariants(node, lo=-math.inf, hi=math.inf):
+    """Height of a subtree whose ordering, balance and stored heights are valid"""
+    if node is None:
+        return 0
+    assert lo < node.guard_id < hi
+    left = check_invariants(node.left, lo, node.guard_id)
+    right = check_invariants(node.right, node.guard_id, hi)
+    assert abs(left - right) <= 1
+    assert node.height == 1 + max(left, right)
+    return node.height
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_inserts_and_deletes_match_a_sorted_list(seed):
+    rng = random.Random(seed)
+    tree = GuardTree()
+    ids = set()
+    for _ in range(2000):
+        guard_id = rng.randrange(500)
+        if rng.random() < 0.6:
+            assert tree.insert(f"g{guard_id}", guard_id, "Main Gate") == (guard_id not in ids)
+            ids.add(guard_id)
+        else:
+            assert tree.delete(guard_id) == (guard_id in ids)
+            ids.discard(guard_id)
+        if rng.random() < 0.05:
+            check_invariants(tree.root)
+    check_invariants(tree.root)
+    assert [guard_id for _, guard_id, _ in tree.inorder()] == sorted(ids)
+    assert all(tree.find(guard_id).guard_id == guard_id for guard_id in ids)
+    assert tree.find(500) is None
+
+
+def test_sequential_ids_stay_logarithmic():
+    tree = GuardTree()
+    n = 10000
+    for guard_id in range(n):
+        tree.insert(f"g{guard_id}", guard_id, "H1")
+    assert check_invariants(tree.root) <= 1.45 * math.log2(n + 2)
+
+
+def test_delete_keeps_the_identity_of_other_nodes():
+    tree = GuardTree()
+    for guard_id in range(1, 32):
+        tree.insert(f"g{guard_id}", guard_id, "TUC")
+    nodes = {guard_id: tree.find(guard_id) for guard_id in range(1, 32)}
+    two_children = tree.root.guard_id
+    assert tree.delete(two_children)
+    check_invariants(tree.root)
+    for guard_id, node in nodes.items():
+        if guard_id != two_children:
+            assert tree.find(guard_id) is node
+            assert node.name == f"g{guard_id}"
+
+
+def test_pickle_and_legacy_migration():
+    legacy = GuardNode()
+    for guard_id in range(100):      # Degenerate plain BST
+        legacy.insert(f"g{guard_id}", guard_id, "Library")
+    tree = GuardTree.from_node(legacy)
+    check_invariants(tree.root)
+    assert tree.inorder() == legacy.inorder()
+    restored = pickle.loads(pickle.dumps(tree))
+    check_invariants(restored.root)
+    assert restored.inorder() == tree.inorder()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_select_rank_and_range_counts_match_a_sorted_list(seed):
+    rng = random.Random(seed)
+    tree = GuardTree()
+    ids = set()
+    for _ in range(1500):
+        guard_id = rng.randrange(400)
+        if rng.random() < 0.7:
+            tree.insert(f"g{guard_id}", guard_id, "FCSE")
+            ids.add(guard_id)
+        else:
+            tree.delete(guard_id)
+            ids.discard(guard_id)
+    ordered = sorted(ids)
+    
+    def check_sizes(node):
+        if node is None:
+            return 0
+        size = 1 + check_sizes(node.left) + check_sizes(node.right)
+        assert node.size == size
+        return size
+    
+    assert check_sizes(tree.root) == len(tree) == tree.count_nodes() == len(ordered)
+    for k, guard_id in enumerate(ordered):
+        assert tree.select(k).guard_id == guard_id
+    assert tree.select(-1) is None and tree.select(len(ordered)) is None
+    for guard_id in range(-1, 402):
+        below = sum(1 for other in ordered if other < guard_id)
+        assert tree.rank(guard_id) == below
+        assert tree.rank(guard_id, inclusive=True) == below + (guard_id in ids)
+    for _ in range(200):
+        lo, hi = rng.randrange(-5, 405), rng.randrange(-5, 405)
+        assert tree.count_in_range(lo, hi) == sum(1 for other in ordered if lo <= other <= hi)
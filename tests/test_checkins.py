@@ -0,0 +1,78 @@
+# Check-in list tests: shared by every session, so changes run from many threads
+
+import pickle
+import threading
+
+from data_structures.credentials import CredentialStore
+from data_structures.linked_list import CheckInLinkedList
+
+
+def walk(checkin_list):
+    """Nodes head to tail, checking every prev pointer on the way"""
+    nodes = []
+    previous = None
+    current = checkin_list.head
+    while current:
+        assert current.prev is previous
+        nodes.append(current)
+        previous, current = current, current.next
+    return nodes
+
+
+def test_concurrent_checkins_keep_links_and_pickles_consistent():
+    checkin_list = CheckInLinkedList()
+    snapshots = []
+    
+    def worker(offset):
+        for i in range(300):
+            reg_no = f"2024{offset:02d}{i:04d}"
+            assert checkin_list.insert(f"user{offset}-{i}", reg_no, "Student", "M", "H1")
+            if i % 3 == 0:
+                assert checkin_list.remove(f"user{offset}-{i}", reg_no, "Student", "H1")
+            if i % 50 == 0:
+                snapshots.append(pickle.dumps(checkin_list))
+    
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(walk(checkin_list)) == len(checkin_list) == 8 * 200
+    assert checkin_list.count_by_room() == {"H1": 8 * 200}
+    for snapshot in snapshots:
+        restored = pickle.loads(snapshot)
+        assert len(walk(restored)) == len(restored)
+    assert len(pickle.loads(pickle.dumps(checkin_list))) == 8 * 200
+
+
+def test_duplicate_identifier_is_rejected_under_contention():
+    checkin_list = CheckInLinkedList()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(checkin_list.insert("Ali", "2024001", "Student", "M", "H1")))
+        for _ in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results.count(True) == 1
+    assert len(checkin_list) == 1
+
+
+def test_concurrent_registrations_survive_pickling():
+    store = pickle.loads(pickle.dumps(CredentialStore()))
+    
+    def worker(offset):
+        for i in range(200):
+            store.insert(f"op{offset}-{i}", "hash")
+            if i % 20 == 0:
+                pickle.dumps(store)
+    
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(pickle.loads(pickle.dumps(store))) == 8 * 200
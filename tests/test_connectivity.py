@@ -0,0 +1,90 @@
+# Connectivity index tests: bridges and articulation points by brute force
+
+import random
+
+import pytest
+
+from data_structures.graph import CampusGraph
+
+
+def count_components(adjacency, removed_node=None, removed_edge=None):
+    """Components left after deleting a node, or one copy of an edge"""
+    seen = set()
+    count = 0
+    for start in adjacency:
+        if start == removed_node or start in seen:
+            continue
+        count += 1
+        seen.add(start)
+        stack = [start]
+        while stack:
+            u = stack.pop()
+            skipped = False
+            for v, _ in adjacency[u]:
+                if v == removed_node:
+                    continue
+                if removed_edge is not None and not skipped and {u, v} == set(removed_edge):
+                    skipped = True
+                    continue
+                if v not in seen:
+                    seen.add(v)
+                    stack.append(v)
+    return count
+
+
+def random_graph(rng):
+    n = rng.randint(1, 12)
+    graph = CampusGraph()
+    for i in range(n):
+        graph.add_location(f"n{i}")
+    for _ in range(rng.randint(0, 2 * n)):
+        a, b = rng.randrange(n), rng.randrange(n)
+        if a != b:
+            graph.add_path(f"n{a}", f"n{b}", 1)
+    return graph
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(80):
+        graph = random_graph(rng)
+        index = graph.connectivity()
+        base = count_components(graph.adjacency)
+        assert index.component_count == base
+        
+        # Removing an isolated location removes its component too
+        expected_points = {
+            node for node, neighbors in graph.adjacency.items()
+            if count_components(graph.adjacency, removed_node=node) > base - (not neighbors)
+        }
+        assert set(index.articulation_points()) == expected_points
+        
+        expected_bridges = {
+            frozenset((u, v))
+            for u, neighbors in graph.adjacency.items() for v, _ in neighbors
+            if count_components(graph.adjacency, removed_edge=(u, v)) > base
+        }
+        assert {frozenset(bridge) for bridge in index.bridges()} == expected_bridges
+        
+        for _ in range(5):
+            a, b = f"n{rng.randrange(len(graph.adjacency))}", f"n{rng.randrange(len(graph.adjacency))}"
+            assert graph.is_reachable(a, b) == (b in graph.bfs_traversal(a))
+
+
+def test_parallel_paths_are_not_bridges():
+    graph = CampusGraph()
+    graph.add_path("A", "B", 1)
+    graph.add_path("A", "B", 2)
+    graph.add_path("B", "C", 1)
+    assert {frozenset(bridge) for bridge in graph.connectivity().bridges()} == {frozenset(("B", "C"))}
+    assert graph.connectivity().articulation_points() == ["B"]
+
+
+def test_long_corridor_does_not_recurse():
+    graph = CampusGraph()
+    graph.bulk_load([(f"c{i}", 0, 0) for i in range(50001)],
+                    [(f"c{i}", f"c{i + 1}", 1) for i in range(50000)])
+    index = graph.connectivity()
+    assert len(index.bridges()) == 50000
+    assert index.component_count == 1
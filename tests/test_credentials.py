@@ -0,0 +1,43 @@
+# Credential store tests: lazy loading survives len() and pickling
+
+import pickle
+
+from data_structures.credentials import CredentialStore
+
+
+def make_store():
+    store = CredentialStore()
+    store.insert("admin", "hash-a", "admin@giki.edu.pk", "admin")
+    store.insert("op", "hash-b")
+    return store
+
+
+def test_len_does_not_decode_records():
+    store = pickle.loads(pickle.dumps(make_store()))
+    assert len(store) == 2
+    assert store._records is None
+    assert store.find("admin", "hash-a")
+    assert not store.find("op", "wrong")
+
+
+def test_count_survives_a_second_round_trip_without_decoding():
+    store = pickle.loads(pickle.dumps(pickle.loads(pickle.dumps(make_store()))))
+    assert len(store) == 2 and store._records is None
+
+
+def test_old_pickles_without_a_count_still_load():
+    store = make_store()
+    state = store.__getstate__()
+    del state["count"]
+    old = CredentialStore.__new__(CredentialStore)
+    old.__setstate__(state)
+    assert len(old) == 2
+    assert old.username_exists("op")
+
+
+def test_count_tracks_changes_after_loading():
+    store = pickle.loads(pickle.dumps(make_store()))
+    store.insert("guard", "hash-c")
+    store.remove("op")
+    assert len(store) == 2
+    assert len(pickle.loads(pickle.dumps(store))) == 2
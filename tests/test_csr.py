@@ -0,0 +1,68 @@
+# k-shortest-paths tests: Yen's routes against every simple path
+
+import random
+
+import pytest
+
+from data_structures.csr import TREE_CACHE_SIZE
+from data_structures.graph import CampusGraph, create_giki_campus_graph
+
+
+def simple_path_lengths(graph, start, end):
+    """Lengths of all loopless routes, shortest parallel edge per location sequence"""
+    best = {}
+    
+    def extend(node, path, distance):
+        if node == end:
+            key = tuple(path)
+            best[key] = min(best.get(key, float('inf')), distance)
+            return
+        for neighbor, weight in graph.adjacency[node]:
+            if neighbor not in path:
+                path.append(neighbor)
+                extend(neighbor, path, distance + weight)
+                path.pop()
+    
+    extend(start, [start], 0)
+    return sorted(best.values())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_k_shortest_paths_match_enumeration(seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        n = rng.randint(2, 9)
+        graph = CampusGraph()
+        for i in range(n):
+            graph.add_location(f"n{i}")
+        for _ in range(rng.randint(0, 2 * n)):
+            a, b = rng.sample(range(n), 2)
+            graph.add_path(f"n{a}", f"n{b}", rng.randint(1, 9))
+        start, end = f"n{rng.randrange(n)}", f"n{rng.randrange(n)}"
+        
+        routes = list(graph.k_shortest_paths(start, end))
+        assert [distance for distance, _ in routes] == simple_path_lengths(graph, start, end)
+        assert len({tuple(path) for _, path in routes}) == len(routes)
+        for distance, path in routes:
+            assert path[0] == start and path[-1] == end
+            assert len(set(path)) == len(path)
+            assert sum(graph._path_weight(a, b) for a, b in zip(path, path[1:])) == pytest.approx(distance)
+
+
+def test_first_route_is_dijkstra():
+    graph = create_giki_campus_graph()
+    distance, path = next(graph.k_shortest_paths("Main Gate", "H3"))
+    assert distance == pytest.approx(graph.dijkstra("Main Gate", "H3")[0])
+    assert path[0] == "Main Gate" and path[-1] == "H3"
+
+
+def test_unknown_location_has_no_routes():
+    assert list(create_giki_campus_graph().k_shortest_paths("Main Gate", "Nowhere")) == []
+
+
+def test_tree_cache_is_bounded():
+    graph = create_giki_campus_graph()
+    csr = graph.csr()
+    for root in range(len(csr)):
+        csr.shortest_path_tree(root)
+    assert len(csr._trees) == TREE_CACHE_SIZE
@@ -0,0 +1,87 @@
+# Assignment solver and dispatch tests: compared against brute force
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from data_structures.dispatch import PRIORITY_WEIGHTS, dispatch_guards, solve_assignment
+from data_structures.graph import CampusGraph, create_giki_campus_graph
+
+
+def brute_force_cost(cost: np.ndarray) -> float:
+    """Cheapest assignment of the smaller side, trying every permutation"""
+    if cost.shape[0] > cost.shape[1]:
+        cost = cost.T
+    n, m = cost.shape
+    return min(sum(cost[i, cols[i]] for i in range(n)) for cols in itertools.permutations(range(m), n))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        n, m = rng.randint(1, 6), rng.randint(1, 6)
+        cost = np.array([[float(rng.randint(0, 20)) for _ in range(m)] for _ in range(n)])
+        rows, cols = solve_assignment(cost)
+        assert len(rows) == min(n, m)
+        assert len(set(rows)) == len(rows) and len(set(cols)) == len(cols)
+        assert list(rows) == sorted(rows)
+        assert cost[rows, cols].sum() == pytest.approx(brute_force_cost(cost))
+
+
+def test_infinite_costs_only_when_unavoidable():
+    rng = random.Random(7)
+    for _ in range(200):
+        n, m = rng.randint(1, 5), rng.randint(1, 5)
+        cost = np.array([[float(rng.randint(0, 20)) if rng.random() > 0.3 else np.inf
+                          for _ in range(m)] for _ in range(n)])
+        rows, cols = solve_assignment(cost)
+        best = brute_force_cost(cost)
+        if np.isfinite(best):
+            assert cost[rows, cols].sum() == pytest.approx(best)
+
+
+def test_empty_matrix():
+    rows, cols = solve_assignment(np.zeros((0, 3)))
+    assert len(rows) == len(cols) == 0
+
+
+class FakeAlert:
+    def __init__(self, alert_id, priority, location):
+        self.alert_id, self.priority, self.location = alert_id, priority, location
+    
+    def key(self):
+        return (self.priority, self.alert_id)
+
+
+def test_dispatch_matches_brute_force_on_dijkstra_distances():
+    graph = create_giki_campus_graph()
+    locations = graph.get_all_locations()
+    rng = random.Random(3)
+    for _ in range(30):
+        guards = [(f"g{i}", rng.choice(locations)) for i in range(rng.randint(1, 5))]
+        alerts = [FakeAlert(i, rng.randint(1, 3), rng.choice(locations)) for i in range(rng.randint(1, 6))]
+        dispatch = dispatch_guards(graph, guards, alerts)
+        
+        # Only the most urgent alerts are covered when guards run short
+        covered = sorted(alerts, key=FakeAlert.key)[:len(guards)]
+        assert [alert for alert, _, _, _ in dispatch] == covered
+        for alert, _, post, distance in dispatch:
+            assert distance == pytest.approx(graph.dijkstra(post, alert.location)[0])
+        
+        cost = np.array([[graph.dijkstra(post, alert.location)[0] * PRIORITY_WEIGHTS[alert.priority]
+                          for alert in covered] for _, post in guards])
+        total = sum(distance * PRIORITY_WEIGHTS[alert.priority] for alert, _, _, distance in dispatch)
+        assert total == pytest.approx(brute_force_cost(cost))
+    assert graph._path_table is None
+
+
+def test_dispatch_skips_unreachable_pairs():
+    graph = CampusGraph()
+    for name in ("A", "B", "C"):
+        graph.add_location(name)
+    graph.add_path("A", "B", 5)
+    dispatch = dispatch_guards(graph, [("g", "A")], [FakeAlert(1, 1, "C")])
+    assert dispatch == []
@@ -0,0 +1,146 @@
+# Escalation tests: timer wheel and escalator driven by an injected clock
+
+import random
+
+import pytest
+
+from data_structures.timer_wheel import TimerWheel
+from utils.escalation import AlertEscalator
+from utils.journal import JournalStore
+from utils.persistence import AlertJournalAdapter, EventJournalAdapter
+
+
+START = 1_700_000_000.0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_timers_expire_on_the_first_advance_past_their_deadline(seed):
+    rng = random.Random(seed)
+    # Small levels, so timers cascade through every level and past the range
+    wheel = TimerWheel(tick=1.0, slots=(8, 8, 8), start=0.0)
+    now = 0.0
+    timers = {}         # payload -> Timer
+    deadlines = {}      # payload -> tick it is due
+    cancelled = set()
+    for step in range(3000):
+        if rng.random() < 0.3:
+            delay = rng.choice([rng.uniform(0, 10), rng.uniform(0, 100), rng.uniform(0, 2000)])
+            timers[step] = wheel.schedule(now, delay, step)
+            # Expiry is tick-granular and at least one tick away
+            deadlines[step] = max(int(now + delay), int(now) + 1)
+        if timers and rng.random() < 0.05:
+            victim = rng.choice(list(timers))
+            assert wheel.cancel(timers.pop(victim))
+            del deadlines[victim]
+            cancelled.add(victim)
+        now += rng.choice([0.3, 1.0, 2.5, 17.0])
+        for payload in wheel.advance(now):
+            assert payload not in cancelled
+            assert deadlines.pop(payload) <= int(now)
+            del timers[payload]
+        # Nothing still pending is overdue, so every timer fired on time
+        assert all(deadline > int(now) for deadline in deadlines.values())
+        assert len(wheel) == len(timers)
+
+
+def test_cancelled_timer_never_fires():
+    wheel = TimerWheel(tick=1.0, start=0.0)
+    timer = wheel.schedule(0.0, 5.0, "alert")
+    assert wheel.cancel(timer) and not timer.active
+    assert wheel.cancel(timer) is False
+    assert wheel.advance(100.0) == []
+    assert len(wheel) == 0
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def stores(tmp_path):
+    alert_store = JournalStore(AlertJournalAdapter(), tmp_path, background=False)
+    event_store = JournalStore(EventJournalAdapter(data_dir=tmp_path), tmp_path, background=False)
+    yield alert_store, event_store
+    alert_store.close()
+    event_store.close()
+
+
+def add_alert(store, priority, message, when):
+    return store.execute("add_alert", priority, message, "Main Gate", int(when * 1_000_000_000))
+
+
+def test_unacknowledged_alerts_escalate_one_level_per_deadline(stores, tmp_path):
+    alert_store, event_store = stores
+    clock = FakeClock(START)
+    escalator = AlertEscalator(alert_store, deadlines={3: 600, 2: 300}, event_store=event_store, clock=clock)
+    alert_id = add_alert(alert_store, 3, "Motion", START)
+    
+    clock.now = START + 599
+    assert escalator.tick() == []
+    clock.now = START + 601
+    assert escalator.tick() == [alert_id]
+    assert alert_store.state.get_alert(alert_id).priority == 2
+    # The next level's deadline starts from the escalation
+    clock.now = START + 890
+    assert escalator.tick() == []
+    clock.now = START + 902
+    assert escalator.tick() == [alert_id]
+    assert alert_store.state.get_alert(alert_id).priority == 1
+    clock.now = START + 5000
+    assert escalator.tick() == []
+    assert escalator.pending() == 0
+    assert "Alert 0 auto-escalated to level 1" in event_store.state.get_all_events()
+    
+    # Escalations are journaled
+    alert_store.close()
+    reopened = JournalStore(AlertJournalAdapter(), tmp_path, background=False)
+    assert reopened.state.get_alert(alert_id).priority == 1
+    reopened.close()
+
+
+def test_acknowledged_and_resolved_alerts_are_left_alone(stores):
+    alert_store, _ = stores
+    clock = FakeClock(START)
+    escalator = AlertEscalator(alert_store, deadlines={3: 600}, clock=clock)
+    acknowledged = add_alert(alert_store, 3, "Door open", START)
+    resolved = add_alert(alert_store, 3, "Window open", START)
+    escalator.tick()
+    
+    alert_store.execute("acknowledge", acknowledged)
+    alert_store.execute("resolve", resolved)
+    assert escalator.cancel(resolved)
+    clock.now = START + 700
+    assert escalator.tick() == []
+    assert alert_store.state.get_alert(acknowledged).priority == 3
+
+
+def test_acknowledgement_after_the_deadline_set_still_wins(stores):
+    alert_store, _ = stores
+    clock = FakeClock(START)
+    escalator = AlertEscalator(alert_store, deadlines={3: 600}, clock=clock)
+    alert_id = add_alert(alert_store, 3, "Motion", START)
+    escalator.tick()
+    # Acknowledged without cancelling the timer, e.g. from another terminal
+    alert_store.execute("acknowledge", alert_id)
+    clock.now = START + 700
+    assert escalator.tick() == []
+    assert alert_store.state.get_alert(alert_id).priority == 3
+
+
+def test_reprioritised_alerts_restart_at_their_new_level(stores):
+    alert_store, _ = stores
+    clock = FakeClock(START)
+    escalator = AlertEscalator(alert_store, deadlines={3: 600, 2: 600}, clock=clock)
+    alert_id = add_alert(alert_store, 3, "Motion", START)
+    escalator.tick()
+    clock.now = START + 300
+    alert_store.execute("change_priority", alert_id, 2)
+    clock.now = START + 700
+    assert escalator.tick() == []
+    clock.now = START + 1301
+    assert escalator.tick() == [alert_id]
+    assert alert_store.state.get_alert(alert_id).priority == 1
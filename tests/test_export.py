@@ -0,0 +1,41 @@
+# Export tests: event exports cover the overflow segments, not just the buffer
+
+from data_structures.linked_list import EventLinkedList
+from utils.export import iter_event_records
+from utils.segments import EventSegmentStore
+
+
+def make_log(tmp_path, count):
+    log = EventLinkedList(max_size=20, overflow=EventSegmentStore(tmp_path, segment_size=100))
+    for i in range(count):
+        log.add_event(f"event {i}", f"2024-01-01 00:{i // 60 % 60:02d}:{i % 60:02d}")
+    return log
+
+
+def test_event_export_covers_overflow(tmp_path):
+    log = make_log(tmp_path, 2500)
+    records = list(iter_event_records(log))
+    assert [record["Event"] for record in records] == [f"event {i}" for i in reversed(range(2500))]
+
+
+def test_event_export_time_window_reaches_evicted_events(tmp_path):
+    log = make_log(tmp_path, 300)
+    records = list(iter_event_records(log, since="2024-01-01 00:00:10", until="2024-01-01 00:00:19"))
+    assert [record["Event"] for record in records] == [f"event {i}" for i in reversed(range(10, 20))]
+
+
+def test_events_added_mid_export_are_not_repeated(tmp_path):
+    log = make_log(tmp_path, 1500)
+    records = iter_event_records(log)
+    first = next(records)
+    for i in range(50):
+        log.add_event(f"late {i}")
+    rest = [record["Event"] for record in records]
+    assert [first["Event"]] + rest == [f"event {i}" for i in reversed(range(1500))]
+
+
+def test_event_export_without_overflow_is_the_buffer(tmp_path):
+    log = EventLinkedList(max_size=5)
+    for i in range(12):
+        log.add_event(f"event {i}")
+    assert [record["Event"] for record in iter_event_records(log)] == [f"event {i}" for i in reversed(range(7, 12))]
@@ -0,0 +1,53 @@
+# Max-flow tests: Dinic's result must equal the brute-force minimum cut
+
+import random
+
+import pytest
+
+from data_structures.flow import FlowNetwork, plan_evacuation
+from data_structures.graph import create_giki_campus_graph
+
+
+def brute_force_min_cut(n, edges, source, sink):
+    """Smallest capacity leaving any node set that holds the source but not the sink"""
+    others = [node for node in range(n) if node not in (source, sink)]
+    best = float('inf')
+    for mask in range(1 << len(others)):
+        side = {source} | {others[i] for i in range(len(others)) if mask >> i & 1}
+        cut = sum(capacity for u, v, capacity, _ in edges if u in side and v not in side)
+        cut += sum(reverse for u, v, _, reverse in edges if v in side and u not in side)
+        best = min(best, cut)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_max_flow_equals_min_cut(seed):
+    rng = random.Random(seed)
+    for _ in range(60):
+        n = rng.randint(2, 8)
+        network = FlowNetwork(n)
+        edges = []
+        for _ in range(rng.randint(0, 15)):
+            u, v = rng.sample(range(n), 2)
+            capacity = rng.randint(0, 10)
+            reverse = rng.choice([0, capacity, rng.randint(0, 5)])
+            network.add_edge(u, v, capacity, reverse)
+            edges.append((u, v, capacity, reverse))
+        flow = network.max_flow(0, n - 1)
+        assert flow == brute_force_min_cut(n, edges, 0, n - 1)
+        assert not network.reachable(0)[n - 1]
+
+
+def test_unbounded_flow():
+    network = FlowNetwork(2)
+    network.add_edge(0, 1, float('inf'))
+    assert network.max_flow(0, 1) == float('inf')
+
+
+def test_evacuation_bottlenecks_bound_the_rate():
+    graph = create_giki_campus_graph()
+    plan = plan_evacuation(graph)
+    assert plan.rate > 0
+    assert sum(plan.exits.values()) == pytest.approx(plan.rate)
+    assert sum(plan.flows.values()) == pytest.approx(plan.rate)
+    assert sum(capacity for _, _, capacity in plan.bottlenecks) == pytest.approx(plan.rate)
@@ -0,0 +1,131 @@
+# Alert queue tests: the indexed heap checked against a sorted list
+
+import pickle
+import random
+
+import pytest
+
+from data_structures.heap import AlertSystem
+
+
+BASE_NS = 1_700_000_000 * 1_000_000_000
+SECOND = 1_000_000_000
+
+
+def check_heap(alerts):
+    """Heap order, position map and indexes are consistent"""
+    heap = alerts.heap
+    for i, alert in enumerate(heap):
+        assert alerts._pos[alert.alert_id] == i
+        for child in (2 * i + 1, 2 * i + 2):
+            if child < len(heap):
+                assert alert.key() <= heap[child].key()
+    assert len(alerts._pos) == len(heap)
+    assert sum(alerts.count_by_priority().values()) == len(heap)
+    for alert in heap:
+        assert alert in alerts.get_alerts_by_priority(alert.priority)
+        assert alert in alerts.get_alerts_by_location(alert.location)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_operations_by_id_match_a_sorted_list(seed):
+    rng = random.Random(seed)
+    alerts = AlertSystem(coalesce_window=0)
+    expected = {}       # alert_id -> (priority, time_ns)
+    for step in range(1500):
+        action = rng.random()
+        if action < 0.5 or not expected:
+            priority, time_ns = rng.randint(1, 3), BASE_NS + rng.randrange(10_000) * SECOND
+            alert_id = alerts.add_alert(priority, f"Motion {step}", rng.choice(["H1", "TUC", "FCSE"]), time_ns)
+            expected[alert_id] = (priority, time_ns)
+        elif action < 0.7:
+            alert_id = rng.choice(list(expected))
+            assert alerts.resolve(alert_id)
+            del expected[alert_id]
+        elif action < 0.85:
+            alert_id = rng.choice(list(expected))
+            priority = rng.randint(1, 3)
+            assert alerts.change_priority(alert_id, priority)
+            expected[alert_id] = (priority, expected[alert_id][1])
+        else:
+            alert_id = rng.choice(list(expected))
+            priority, time_ns = expected[alert_id]
+            assert alerts.escalate(alert_id) == (priority > 1)
+            expected[alert_id] = (max(priority - 1, 1), time_ns)
+        if step % 100 == 0:
+            check_heap(alerts)
+    
+    check_heap(alerts)
+    order = sorted(expected, key=lambda alert_id: (*expected[alert_id], alert_id))
+    assert [alert.alert_id for alert in alerts.get_all_alerts_sorted()] == order
+    assert alerts.peek_highest_priority().alert_id == order[0]
+    assert alerts.resolve(-1) is False and alerts.get_alert(-1) is None
+    
+    restored = pickle.loads(pickle.dumps(alerts))
+    check_heap(restored)
+    assert [alert.alert_id for alert in restored.get_all_alerts_sorted()] == order
+    popped = [restored.get_highest_priority_alert().alert_id for _ in range(len(order))]
+    assert popped == order
+
+
+def test_acknowledge_keeps_the_alert_queued():
+    alerts = AlertSystem(coalesce_window=0)
+    alert_id = alerts.add_alert(2, "Door forced", "Library", BASE_NS)
+    assert alerts.acknowledge(alert_id)
+    assert alerts.get_alert(alert_id).acknowledged
+    assert alerts.count_alerts() == 1
+    assert alerts.acknowledge(alert_id + 1) is False
+
+
+def test_time_range_queries_skip_resolved_alerts():
+    alerts = AlertSystem(coalesce_window=0)
+    ids = [alerts.add_alert(3, f"Ping {i}", "H2", BASE_NS + i * SECOND) for i in range(10)]
+    alerts.resolve(ids[4])
+    found = alerts.alerts_between(BASE_NS + 2 * SECOND, BASE_NS + 6 * SECOND)
+    assert [alert.alert_id for alert in found] == [ids[2], ids[3], ids[5], ids[6]]
+
+
+def test_repeats_within_the_window_coalesce():
+    alerts = AlertSystem(coalesce_window=60)
+    first = alerts.add_alert(3, "Motion at camera 12", "H1", BASE_NS)
+    # Same template (numbers masked) and location
+    assert alerts.add_alert(3, "Motion at camera 14", "H1", BASE_NS + 30 * SECOND) == first
+    # Sliding: each repeat restarts the window
+    assert alerts.add_alert(3, "Motion at camera 12", "H1", BASE_NS + 80 * SECOND) == first
+    alert = alerts.get_alert(first)
+    assert alert.count == 3 and alert.last_seen_ns == BASE_NS + 80 * SECOND
+    assert alerts.count_alerts() == 1
+    
+    # Other locations and messages, and repeats after the window, are new alerts
+    assert alerts.add_alert(3, "Motion at camera 12", "H2", BASE_NS + 81 * SECOND) != first
+    assert alerts.add_alert(3, "Door forced", "H1", BASE_NS + 82 * SECOND) != first
+    assert alerts.add_alert(3, "Motion at camera 12", "H1", BASE_NS + 141 * SECOND) != first
+    assert alerts.count_alerts() == 4
+
+
+def test_urgent_repeat_raises_priority_and_escalated_alerts_still_coalesce():
+    alerts = AlertSystem(coalesce_window=60)
+    first = alerts.add_alert(3, "Unknown person", "Main Gate", BASE_NS)
+    assert alerts.escalate(first)
+    assert alerts.add_alert(3, "Unknown person", "Main Gate", BASE_NS + SECOND) == first
+    assert alerts.get_alert(first).priority == 2
+    assert alerts.add_alert(1, "Unknown person", "Main Gate", BASE_NS + 2 * SECOND) == first
+    assert alerts.get_alert(first).priority == 1
+    assert alerts.peek_highest_priority().alert_id == first
+    check_heap(alerts)
+
+
+def test_resolved_alerts_do_not_absorb_repeats():
+    alerts = AlertSystem(coalesce_window=60)
+    first = alerts.add_alert(2, "Tailgating", "FME", BASE_NS)
+    alerts.resolve(first)
+    assert alerts.add_alert(2, "Tailgating", "FME", BASE_NS + SECOND) != first
+
+
+def test_coalescing_state_survives_pickling_and_window_changes():
+    alerts = AlertSystem(coalesce_window=60)
+    first = alerts.add_alert(3, "Motion at camera 3", "H4", BASE_NS)
+    restored = pickle.loads(pickle.dumps(alerts))
+    assert restored.add_alert(3, "Motion at camera 3", "H4", BASE_NS + 10 * SECOND) == first
+    restored.set_coalesce_window(0)
+    assert restored.add_alert(3, "Motion at camera 3", "H4", BASE_NS + 11 * SECOND) != first
@@ -0,0 +1,100 @@
+# Journal store tests: snapshot + journal round trips and crash recovery
+
+import pickle
+
+from utils.journal import JournalStore, iter_journal, journal_path, load_state, read_snapshot, snapshot_path
+from utils.persistence import AlertJournalAdapter, GuardJournalAdapter
+
+
+def open_guards(data_dir, **policy):
+    policy.setdefault("background", False)
+    return JournalStore(GuardJournalAdapter(), data_dir, **policy)
+
+
+def test_operations_survive_a_restart(tmp_path):
+    store = open_guards(tmp_path)
+    for guard_id in range(50):
+        store.execute("insert", f"g{guard_id}", guard_id, "Main Gate")
+    for guard_id in range(0, 50, 3):
+        store.execute("delete", guard_id)
+    expected = store.state.inorder()
+    store.close()
+    
+    reopened = open_guards(tmp_path)
+    assert reopened.state.inorder() == expected
+    assert reopened.seq == 50 + 17
+    reopened.close()
+
+
+def test_compaction_writes_a_snapshot_and_keeps_later_records(tmp_path):
+    store = open_guards(tmp_path, max_journal_bytes=2000)
+    for guard_id in range(200):
+        store.execute("insert", f"g{guard_id}", guard_id, "TUC")
+    assert store.journal_size() < 2000
+    state, snap_seq = read_snapshot(snapshot_path(tmp_path, "guards"))
+    assert 0 < snap_seq <= 200
+    # Only records newer than the snapshot stay in the journal
+    assert all(seq > snap_seq for _, seq, _, _, _ in iter_journal(journal_path(tmp_path, "guards")))
+    expected = store.state.inorder()
+    store.close()
+    
+    reopened = open_guards(tmp_path)
+    assert reopened.state.inorder() == expected and reopened.seq == 200
+    reopened.close()
+
+
+def test_background_snapshot_keeps_records_appended_meanwhile(tmp_path):
+    store = open_guards(tmp_path, background=True)
+    for guard_id in range(100):
+        store.execute("insert", f"g{guard_id}", guard_id, "H1")
+    store.snapshot(wait=False)
+    for guard_id in range(100, 150):
+        store.execute("insert", f"g{guard_id}", guard_id, "H1")
+    store.close()
+    
+    reopened = open_guards(tmp_path)
+    assert len(reopened.state) == 150 and reopened.seq == 150
+    reopened.close()
+
+
+def test_torn_tail_is_dropped_and_appends_continue(tmp_path):
+    store = open_guards(tmp_path)
+    for guard_id in range(10):
+        store.execute("insert", f"g{guard_id}", guard_id, "FME")
+    store.close()
+    with open(journal_path(tmp_path, "guards"), "ab") as f:
+        f.write(b"\x0b\x00\x00\x00torn record")
+    
+    reopened = open_guards(tmp_path)
+    assert len(reopened.state) == 10
+    reopened.execute("insert", "late", 99, "FME")
+    reopened.close()
+    state, seq, _ = load_state(GuardJournalAdapter(), tmp_path)
+    assert len(state) == 11 and seq == 11
+
+
+def test_timestamps_are_pinned_so_replay_matches(tmp_path):
+    store = JournalStore(AlertJournalAdapter(), tmp_path, background=False)
+    for i in range(5):
+        store.execute("add_alert", 2, f"Door {i} forced", "Library")
+    expected = [(a.alert_id, a.time_ns, a.count) for a in store.state.get_all_alerts_sorted()]
+    store.close()
+    
+    state, _, _ = load_state(AlertJournalAdapter(), tmp_path)
+    assert [(a.alert_id, a.time_ns, a.count) for a in state.get_all_alerts_sorted()] == expected
+
+
+def test_plain_pickle_from_before_journaling_loads(tmp_path):
+    store = open_guards(tmp_path)
+    store.execute("insert", "g1", 1, "Library")
+    legacy = pickle.dumps(store.state)
+    store.close()
+    snapshot_path(tmp_path, "guards").write_bytes(legacy)
+    journal_path(tmp_path, "guards").unlink()
+    
+    reopened = open_guards(tmp_path)
+    assert reopened.state.find(1).name == "g1" and reopened.seq == 0
+    reopened.execute("insert", "g2", 2, "Library")
+    reopened.close()
+    state, _, _ = load_state(GuardJournalAdapter(), tmp_path)
+    assert len(state) == 2
@@ -17,6 +17,7 @@ from .persistence import (
     load_json,
     create_backup,
     list_backups,
+    prune_backups,
     restore_backup,
     save_checkins,
     load_checkins,
@@ -27,7 +28,46 @@ from .persistence import (
     save_alerts,
     load_alerts,
     save_events,
-    load_events
+    load_events,
+    open_store,
+    open_guard_store,
+    open_alert_store,
+    open_graph_store,
+    open_event_store
+)
+
+from .journal import (
+    JournalAdapter,
+    JournalStore
+)
+
+from .segments import EventSegmentStore
+
+from .escalation import (
+    ESCALATION_DEADLINES,
+    AlertEscalator
+)
+
+from .replication import (
+    JournalReplicator,
+    replication_lag
+)
+
+from .warmstart import (
+    WarmSnapshot,
+    WarmStartLoader,
+    LazySections,
+    write_warm_snapshot,
+    load_core_state
+)
+
+from .graph_loader import (
+    CAMPUS_MAP_FILE,
+    CoordinateSnapper,
+    load_geojson,
+    load_csv,
+    campus_map_fingerprint,
+    load_campus_graph
 )
 
 from .camera import (
@@ -42,6 +82,20 @@ from .camera import (
     delete_user_photos
 )
 
+from .export import (
+    EXPORT_DIR,
+    CHECKIN_FIELDS,
+    ALERT_FIELDS,
+    EVENT_FIELDS,
+    iter_checkin_records,
+    iter_alert_records,
+    iter_event_records,
+    write_ndjson,
+    write_csv,
+    export_records,
+    iter_export_lines
+)
+
 from .sorting import (
     insertion_sort,
     merge_sort,
@@ -62,16 +116,41 @@ __all__ = [
     
     # Persistence
     'save_pickle', 'load_pickle', 'save_json', 'load_json',
-    'create_backup', 'list_backups', 'restore_backup',
+    'create_backup', 'list_backups', 'prune_backups', 'restore_backup',
     'save_checkins', 'load_checkins', 'save_logins', 'load_logins',
     'save_guards', 'load_guards', 'save_alerts', 'load_alerts',
     'save_events', 'load_events',
+    'open_store', 'open_guard_store', 'open_alert_store', 'open_graph_store', 'open_event_store',
+    
+    # Journal
+    'JournalAdapter', 'JournalStore',
+    
+    # Event overflow segments
+    'EventSegmentStore',
+    
+    # Escalation
+    'ESCALATION_DEADLINES', 'AlertEscalator',
+    
+    # Replication
+    'JournalReplicator', 'replication_lag',
+    
+    # Warm start
+    'WarmSnapshot', 'WarmStartLoader', 'LazySections', 'write_warm_snapshot', 'load_core_state',
+    
+    # Campus map loading
+    'CAMPUS_MAP_FILE', 'CoordinateSnapper', 'load_geojson', 'load_csv',
+    'campus_map_fingerprint', 'load_campus_graph',
     
     # Camera
     'initialize_face_recognizer', 'detect_faces', 'save_face_image',
     'train_face_recognizer', 'load_face_recognizer', 'recognize_face',
     'get_registered_users', 'get_user_photo_count', 'delete_user_photos',
     
+    # Export
+    'EXPORT_DIR', 'CHECKIN_FIELDS', 'ALERT_FIELDS', 'EVENT_FIELDS',
+    'iter_checkin_records', 'iter_alert_records', 'iter_event_records',
+    'write_ndjson', 'write_csv', 'export_records', 'iter_export_lines',
+    
     # Sorting
     'insertion_sort', 'merge_sort', 'quick_sort',
     'binary_search', 'linear_search',
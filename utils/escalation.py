@@ -0,0 +1,130 @@
+# Time-Driven Alert Escalation for IntruWatch
+#
+# An AlertEscalator keeps one timer per open, unacknowledged alert in a
+# hierarchical timer wheel. When a deadline passes and the alert is still
+# open and unacknowledged, it is escalated one level through the alert
+# store (so the change is journaled) and a timer for the next level is
+# scheduled. Acknowledging or resolving an alert cancels its timer.
+#
+# The queue is read under the alert store's lock, and the escalation itself
+# is the journaled escalate_if_pending operation, which re-checks the alert
+# inside the store so an acknowledgement can never be overridden.
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from data_structures.timer_wheel import Timer, TimerWheel
+
+
+# Priority -> seconds an alert may stay unacknowledged at that level
+ESCALATION_DEADLINES = {3: 10 * 60, 2: 10 * 60}
+
+
+class AlertEscalator:
+    """Escalates unacknowledged alerts after per-priority deadlines
+    
+    Args:
+        alert_store: JournalStore holding the AlertSystem
+        deadlines: Priority -> seconds before escalating to the next level
+        event_store: Optional event JournalStore to log escalations to
+        clock: Returns the current wall-clock time in seconds; inject a
+            fake clock for deterministic tests
+        tick: Timer wheel resolution in seconds
+    """
+    
+    def __init__(self, alert_store, deadlines: Dict[int, float] = None,
+                 event_store=None, clock: Callable[[], float] = time.time,
+                 tick: float = 1.0):
+        self.alert_store = alert_store
+        self.deadlines = dict(ESCALATION_DEADLINES if deadlines is None else deadlines)
+        self.event_store = event_store
+        self.clock = clock
+        self.wheel = TimerWheel(tick=tick, start=clock())
+        self._timers: Dict[int, Timer] = {}
+        self._seen = 0              # Alert IDs below this have been considered
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _schedule(self, alert, since: float) -> None:
+        deadline = self.deadlines.get(alert.priority)
+        if deadline is None or alert.acknowledged:
+            return
+        self._timers[alert.alert_id] = self.wheel.schedule_at(
+            since + deadline, (alert.alert_id, alert.priority)
+        )
+    
+    def _discover(self) -> None:
+        """Schedule alerts added since the last call - O(new alerts)
+        
+        Call with the alert store's lock held.
+        """
+        alerts = self.alert_store.state
+        for alert_id in range(self._seen, alerts.alert_count):
+            alert = alerts.get_alert(alert_id)
+            if alert is not None and alert_id not in self._timers:
+                self._schedule(alert, alert.time_ns / 1_000_000_000)
+        self._seen = alerts.alert_count
+    
+    def cancel(self, alert_id: int) -> bool:
+        """Stop tracking an alert, e.g. after it is acknowledged or resolved - O(1)"""
+        with self._lock:
+            timer = self._timers.pop(alert_id, None)
+            return timer is not None and self.wheel.cancel(timer)
+    
+    def tick(self) -> List[int]:
+        """Escalate every alert whose deadline has passed
+        
+        Returns:
+            IDs of the alerts escalated
+        """
+        with self._lock:
+            escalated = []
+            with self.alert_store.lock:
+                self._discover()
+                now = self.clock()
+                for alert_id, priority in self.wheel.advance(now):
+                    self._timers.pop(alert_id, None)
+                    alert = self.alert_store.state.get_alert(alert_id)
+                    if alert is None or alert.acknowledged:
+                        continue
+                    if alert.priority != priority:
+                        # Re-prioritised by an operator: restart the clock at its new level
+                        self._schedule(alert, now)
+                        continue
+                    if self.alert_store.execute("escalate_if_pending", alert_id, priority):
+                        escalated.append((alert_id, alert.priority))
+                        self._schedule(alert, now)
+            
+            if self.event_store is not None:
+                for alert_id, level in escalated:
+                    self.event_store.execute("add_event", f"Alert {alert_id} auto-escalated to level {level}")
+            return [alert_id for alert_id, _ in escalated]
+    
+    def pending(self) -> int:
+        """Number of scheduled escalations"""
+        return len(self.wheel)
+    
+    def start(self, interval: float = 1.0) -> None:
+        """Run tick() on a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.tick()
+                except Exception as e:
+                    print(f"Escalation error: {e}")
+                self._stop.wait(interval)
+        
+        self._thread = threading.Thread(target=run, name="alert-escalator", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,185 @@
+# Streaming Export Utilities for IntruWatch
+#
+# Exporters walk the live structures with generators and write one record at
+# a time, so memory use stays constant no matter how many records there are.
+
+import csv
+import io
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, TextIO, Union
+
+
+EXPORT_DIR = Path("exports")
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+CHECKIN_FIELDS = ["Username", "Designation", "Gender", "Reg/Emp No", "Hostel No"]
+ALERT_FIELDS = ["ID", "Priority", "Time", "Message", "Location", "Count", "Last Seen", "Acknowledged"]
+EVENT_FIELDS = ["Time", "Event"]
+
+# Events read from the overflow segments at a time
+EVENT_PAGE_SIZE = 1000
+
+TimeBound = Optional[Union[datetime, str]]
+
+
+def _time_bound(value: TimeBound) -> Optional[str]:
+    """Normalize a time filter to the stored timestamp string format
+    
+    Stored timestamps are fixed-width, so string comparison orders them.
+    """
+    if isinstance(value, datetime):
+        return value.strftime(TIME_FORMAT)
+    return value
+
+
+def _in_range(timestamp: Optional[str], since: Optional[str], until: Optional[str]) -> bool:
+    if since is None and until is None:
+        return True
+    if timestamp is None:
+        return False
+    if since is not None and timestamp < since:
+        return False
+    if until is not None and timestamp > until:
+        return False
+    return True
+
+
+def iter_checkin_records(checkin_list, designation: str = None) -> Iterator[dict]:
+    """Stream check-in records, optionally filtered by designation"""
+    for node in checkin_list:
+        if designation is not None and node.designation != designation:
+            continue
+        yield {
+            "Username": node.username,
+            "Designation": node.designation,
+            "Gender": node.gender,
+            "Reg/Emp No": node.reg_no if node.designation == "Student" else node.employee_no,
+            "Hostel No": node.room_no
+        }
+
+
+def iter_alert_records(alert_system, priority: int = None, location: str = None,
+                       since: TimeBound = None, until: TimeBound = None) -> Iterator[dict]:
+    """Stream active alerts filtered by priority, location and time range"""
+    if since is not None or until is not None:
+        alerts = alert_system.alerts_between(since, until)
+    elif location is not None:
+        alerts = alert_system.get_alerts_by_location(location)
+    elif priority is not None:
+        alerts = alert_system.get_alerts_by_priority(priority)
+    else:
+        alerts = alert_system
+    for alert in alerts:
+        if priority is not None and alert.priority != priority:
+            continue
+        if location is not None and alert.location != location:
+            continue
+        yield {
+            "ID": alert.alert_id,
+            "Priority": alert.priority,
+            "Time": alert.timestamp,
+            "Message": alert.message,
+            "Location": alert.location,
+            "Count": alert.count,
+            "Last Seen": alert.last_seen,
+            "Acknowledged": alert.acknowledged
+        }
+
+
+def iter_event_records(event_log, since: TimeBound = None,
+                       until: TimeBound = None) -> Iterator[dict]:
+    """Stream logged events, newest first, filtered by time range
+    
+    Covers the full history: events evicted from the in-memory buffer are
+    read back from the overflow segments one page at a time.
+    """
+    since, until = _time_bound(since), _time_bound(until)
+    # Offsets count from the newest event, so skip events added mid-export
+    total = event_log.total
+    read = 0
+    while True:
+        page = event_log.get_history(offset=event_log.total - total + read, limit=EVENT_PAGE_SIZE)
+        if not page:
+            return
+        read += len(page)
+        for node in page:
+            # Events pickled before timestamps were recorded have none
+            timestamp = getattr(node, "timestamp", None)
+            if not _in_range(timestamp, since, until):
+                continue
+            yield {"Time": timestamp, "Event": node.data}
+
+
+def write_ndjson(records: Iterable[dict], fp: TextIO) -> int:
+    """Write records as newline-delimited JSON
+    
+    Returns:
+        Number of records written
+    """
+    count = 0
+    for record in records:
+        fp.write(json.dumps(record, default=str))
+        fp.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(records: Iterable[dict], fp: TextIO, fieldnames: List[str]) -> int:
+    """Write records as CSV with a header row
+    
+    Returns:
+        Number of records written
+    """
+    writer = csv.DictWriter(fp, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for record in records:
+        writer.writerow(record)
+        count += 1
+    return count
+
+
+def export_records(records: Iterable[dict], path: Union[str, Path], fmt: str = "ndjson",
+                   fieldnames: List[str] = None) -> int:
+    """Stream records to a file in NDJSON or CSV format
+    
+    Returns:
+        Number of records written
+    """
+    if fmt not in ("ndjson", "csv"):
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == "csv" and fieldnames is None:
+        raise ValueError("CSV export requires fieldnames")
+    
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as fp:
+        if fmt == "csv":
+            return write_csv(records, fp, fieldnames)
+        return write_ndjson(records, fp)
+
+
+def iter_export_lines(records: Iterable[dict], fmt: str = "ndjson",
+                      fieldnames: List[str] = None) -> Iterator[str]:
+    """Yield an export line by line, e.g. for a chunked HTTP response"""
+    if fmt == "ndjson":
+        for record in records:
+            yield json.dumps(record, default=str) + "\n"
+        return
+    if fmt != "csv":
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fieldnames is None:
+        raise ValueError("CSV export requires fieldnames")
+    
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,184 @@
+# Campus Map Loading for IntruWatch
+#
+# Builds a CampusGraph from the real walkway network instead of the
+# hardcoded campus:
+#
+#   GeoJSON   Point features with a "name" property are named locations;
+#             LineString / MultiLineString features are walkways, split into
+#             one path per segment (optional "capacity" in people per minute)
+#   CSV       a node list (name, lat, lon) and an edge list
+#             (from, to[, distance][, capacity]); a blank distance is computed
+#
+# Coordinates closer than a snap distance are merged into one location, so
+# walkways drawn separately still meet at shared junctions. Path lengths are
+# haversine distances in meters, and the graph is built in one bulk pass.
+
+import csv
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from data_structures.graph import CampusGraph, create_giki_campus_graph, haversine
+
+from .persistence import DATA_DIR
+from .warmstart import file_fingerprint
+
+
+CAMPUS_MAP_FILE = DATA_DIR / "campus_map.geojson"
+DEFAULT_SNAP_METERS = 1.0
+
+METERS_PER_DEGREE = 111320.0
+
+
+class CoordinateSnapper:
+    """Merges coordinates within ``snap_meters`` of each other into one location
+    
+    Locations are bucketed in a grid of snap-sized cells, so each lookup
+    only checks the 3x3 cells around a point - O(1) per point.
+    """
+    
+    def __init__(self, snap_meters: float = DEFAULT_SNAP_METERS):
+        self.snap_meters = snap_meters
+        self.coords: Dict[str, Tuple[float, float]] = {}
+        self._cells: Dict[Tuple[int, int], List[str]] = {}
+        self._cell_lat = max(snap_meters, 1e-3) / METERS_PER_DEGREE
+        self._cell_lon = None       # Set from the first latitude seen
+    
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        if self._cell_lon is None:
+            self._cell_lon = self._cell_lat / max(math.cos(math.radians(lat)), 1e-6)
+        return math.floor(lat / self._cell_lat), math.floor(lon / self._cell_lon)
+    
+    def find(self, lat: float, lon: float) -> Optional[str]:
+        """Existing location within the snap distance, if any"""
+        row, col = self._cell(lat, lon)
+        for cell in ((row + dr, col + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)):
+            for name in self._cells.get(cell, ()):
+                if haversine(lat, lon, *self.coords[name]) <= self.snap_meters:
+                    return name
+        return None
+    
+    def add(self, lat: float, lon: float, name: str = None) -> str:
+        """Location for a coordinate, registering it if nothing is close
+        
+        Unnamed coordinates are named after themselves.
+        """
+        existing = self.find(lat, lon)
+        if existing is not None:
+            return existing
+        if name is None:
+            name = f"{lat:.6f},{lon:.6f}"
+        self.coords[name] = (lat, lon)
+        self._cells.setdefault(self._cell(lat, lon), []).append(name)
+        return name
+    
+    def locations(self) -> List[Tuple[str, float, float]]:
+        return [(name, lat, lon) for name, (lat, lon) in self.coords.items()]
+
+
+def load_geojson(source: Union[str, Path, dict], snap_meters: float = DEFAULT_SNAP_METERS) -> CampusGraph:
+    """Build a campus graph from a GeoJSON FeatureCollection or Feature
+    
+    Args:
+        source: Path to a GeoJSON file, or the parsed document
+        snap_meters: Coordinates closer than this become one location
+    """
+    if isinstance(source, dict):
+        data = source
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    features = data["features"] if data.get("type") == "FeatureCollection" else [data]
+    
+    snapper = CoordinateSnapper(snap_meters)
+    # Named points first, so walkway vertices snap onto them
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "Point":
+            lon, lat = geometry["coordinates"][:2]
+            snapper.add(lat, lon, (feature.get("properties") or {}).get("name"))
+    
+    paths = []
+    seen = set()        # Segments drawn by more than one walkway count once
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "LineString":
+            lines = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiLineString":
+            lines = geometry["coordinates"]
+        else:
+            continue
+        capacity = (feature.get("properties") or {}).get("capacity")
+        for line in lines:
+            names = [snapper.add(lat, lon) for lon, lat, *_ in line]
+            for i in range(len(names) - 1):
+                segment = tuple(sorted((names[i], names[i + 1])))
+                if names[i] != names[i + 1] and segment not in seen:
+                    seen.add(segment)
+                    # Measured between the snapped locations, like the CSV loader
+                    length = haversine(*snapper.coords[names[i]], *snapper.coords[names[i + 1]])
+                    paths.append((names[i], names[i + 1], length, capacity))
+    
+    graph = CampusGraph()
+    graph.bulk_load(snapper.locations(), paths)
+    return graph
+
+
+def load_csv(nodes_path: Union[str, Path], edges_path: Union[str, Path],
+             snap_meters: float = DEFAULT_SNAP_METERS) -> CampusGraph:
+    """Build a campus graph from CSV node and edge lists
+    
+    Nodes need ``name``, ``lat`` and ``lon`` columns; edges need ``from`` and
+    ``to`` and may have ``distance`` (meters) and ``capacity`` columns.
+    Nodes snapped onto an earlier one are renamed to it in the edge list.
+    
+    Raises:
+        ValueError: If an edge names an unknown node
+    """
+    snapper = CoordinateSnapper(snap_meters)
+    alias = {}
+    with open(nodes_path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            alias[row["name"]] = snapper.add(float(row["lat"]), float(row["lon"]), row["name"])
+    
+    paths = []
+    with open(edges_path, "r", newline="", encoding="utf-8") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                loc1, loc2 = alias[row["from"]], alias[row["to"]]
+            except KeyError as e:
+                raise ValueError(f"{edges_path}:{line}: unknown node {e}") from None
+            if loc1 == loc2:
+                continue
+            distance = row.get("distance")
+            distance = float(distance) if distance else haversine(*snapper.coords[loc1], *snapper.coords[loc2])
+            capacity = row.get("capacity")
+            paths.append((loc1, loc2, distance, float(capacity) if capacity else None))
+    
+    graph = CampusGraph()
+    graph.bulk_load(snapper.locations(), paths)
+    return graph
+
+
+def campus_map_fingerprint(path: Path = CAMPUS_MAP_FILE) -> tuple:
+    """Changes whenever the map file or the built-in campus changes"""
+    from data_structures import graph as graph_module
+    return file_fingerprint(graph_module.__file__), file_fingerprint(path)
+
+
+def load_campus_graph(path: Path = CAMPUS_MAP_FILE) -> CampusGraph:
+    """Campus graph from the map file if there is one, else the built-in campus
+    
+    A map that fails to load falls back to the built-in campus with the
+    error kept in ``source_error``, so the app can report it.
+    """
+    if Path(path).exists():
+        try:
+            return load_geojson(path)
+        except Exception as e:
+            print(f"Error loading campus map {path}: {e}")
+            graph = create_giki_campus_graph()
+            graph.source_error = f"{path}: {e}"
+            return graph
+    return create_giki_campus_graph()
@@ -0,0 +1,284 @@
+# Snapshot + Journal Persistence for IntruWatch
+#
+# A JournalStore keeps one structure in memory and makes every mutation an
+# O(1) append to data/<name>.journal. The full structure is only pickled
+# when the journal grows past a size or age limit, and that snapshot is
+# written on a background thread. On open, the latest snapshot is loaded
+# and the journal records newer than it are replayed.
+
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple
+
+
+# Journal record header: sequence number, wall-clock time, payload length, CRC32
+RECORD_HEADER = struct.Struct("<QdII")
+
+DEFAULT_MAX_JOURNAL_BYTES = 1024 * 1024
+DEFAULT_MAX_SNAPSHOT_AGE = 15 * 60  # seconds
+
+
+class JournalAdapter:
+    """Binds a data structure to a JournalStore
+    
+    Subclasses set ``name`` and build an empty structure in ``create``.
+    Operations are replayed by calling the structure's method of the same
+    name, so journaled arguments must fully determine the result.
+    """
+    name: str = None
+    
+    def create(self) -> Any:
+        """Build an empty structure"""
+        raise NotImplementedError
+    
+    def migrate(self, state: Any) -> Any:
+        """Upgrade a structure loaded from an older snapshot"""
+        return state
+    
+    def prepare(self, op: str, args: tuple) -> tuple:
+        """Pin non-deterministic arguments (e.g. timestamps) before journaling"""
+        return args
+    
+    def apply(self, state: Any, op: str, args: tuple) -> Any:
+        """Apply one operation to the structure"""
+        return getattr(state, op)(*args)
+
+
+def snapshot_path(data_dir: Path, name: str) -> Path:
+    return Path(data_dir) / f"{name}.pkl"
+
+
+def journal_path(data_dir: Path, name: str) -> Path:
+    return Path(data_dir) / f"{name}.journal"
+
+
+def encode_record(seq: int, op: str, args: tuple, timestamp: float = None) -> bytes:
+    """Serialize one journal record (header + pickled payload)"""
+    payload = pickle.dumps((op, args), protocol=pickle.HIGHEST_PROTOCOL)
+    if timestamp is None:
+        timestamp = time.time()
+    return RECORD_HEADER.pack(seq, timestamp, len(payload), zlib.crc32(payload)) + payload
+
+
+def iter_journal(path: Path, offset: int = 0) -> Iterator[Tuple[int, int, float, str, tuple]]:
+    """Read journal records starting at a byte offset
+    
+    Stops at the first torn or corrupt record, which is what a crash
+    mid-append leaves behind.
+    
+    Yields:
+        Tuples of (end_offset, seq, timestamp, op, args)
+    """
+    path = Path(path)
+    if not path.exists():
+        return
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            seq, timestamp, length, crc = RECORD_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+            op, args = pickle.loads(payload)
+            offset += RECORD_HEADER.size + length
+            yield offset, seq, timestamp, op, args
+
+
+def write_snapshot(path: Path, payload: bytes, seq: int) -> None:
+    """Atomically write a pickled structure followed by its journal position
+    
+    The structure is the first pickle in the file, so plain ``load_pickle``
+    still reads snapshot files; the trailer records the last sequence
+    number the snapshot includes.
+    """
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, 'wb') as f:
+        f.write(payload)
+        pickle.dump({"seq": seq, "time": time.time()}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: Path) -> Tuple[Any, int]:
+    """Load a snapshot file
+    
+    Returns:
+        Tuple of (structure or None, last included sequence number)
+    """
+    path = Path(path)
+    if not path.exists():
+        return None, 0
+    with open(path, 'rb') as f:
+        state = pickle.load(f)
+        try:
+            trailer = pickle.load(f)
+        except EOFError:
+            # Plain pickle written before journaling existed
+            trailer = {"seq": 0}
+    return state, trailer.get("seq", 0)
+
+
+def last_seq(path: Path) -> int:
+    """Sequence number of the last valid record in a journal (0 if empty)"""
+    seq = 0
+    for _, seq, _, _, _ in iter_journal(path):
+        pass
+    return seq
+
+
+def load_state(adapter: JournalAdapter, data_dir: Path,
+               initial: Tuple[Any, int] = None) -> Tuple[Any, int, int]:
+    """Rebuild a structure from its snapshot and journal without opening a store
+    
+    Args:
+        adapter: Adapter for the structure
+        data_dir: Directory holding the snapshot and journal
+        initial: Optional (structure, seq) to start from instead of the
+            snapshot file, e.g. from a warm-start snapshot
+    
+    Returns:
+        Tuple of (structure, last sequence number, valid journal length)
+    """
+    if initial is None:
+        state, seq = read_snapshot(snapshot_path(data_dir, adapter.name))
+    else:
+        state, seq = initial
+    state = adapter.create() if state is None else adapter.migrate(state)
+    
+    end = 0
+    for end, record_seq, _, op, args in iter_journal(journal_path(data_dir, adapter.name)):
+        if record_seq <= seq:
+            continue
+        adapter.apply(state, op, args)
+        seq = record_seq
+    return state, seq, end
+
+
+class JournalStore:
+    """Persistent container: in-memory structure + operation journal + snapshots
+    
+    Compaction runs when the journal exceeds ``max_journal_bytes`` or the
+    last snapshot is older than ``max_snapshot_age`` seconds. ``initial``
+    starts from an already-loaded (structure, seq) instead of the snapshot.
+    """
+    
+    def __init__(self, adapter: JournalAdapter, data_dir: Path,
+                 max_journal_bytes: int = DEFAULT_MAX_JOURNAL_BYTES,
+                 max_snapshot_age: float = DEFAULT_MAX_SNAPSHOT_AGE,
+                 background: bool = True, sync: bool = False,
+                 initial: Tuple[Any, int] = None):
+        self.adapter = adapter
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.max_journal_bytes = max_journal_bytes
+        self.max_snapshot_age = max_snapshot_age
+        self.background = background
+        self.sync = sync
+        
+        self.snapshot_file = snapshot_path(self.data_dir, adapter.name)
+        self.journal_file = journal_path(self.data_dir, adapter.name)
+        
+        self._lock = threading.RLock()
+        self._snapshot_thread: Optional[threading.Thread] = None
+        
+        self.state, self.seq, valid_end = load_state(adapter, self.data_dir, initial)
+        self._journal = open(self.journal_file, 'ab')
+        if self._journal.tell() > valid_end:
+            # Drop a torn tail so new records follow the last good one
+            self._journal.truncate(valid_end)
+            self._journal.seek(valid_end)
+        self._last_snapshot = time.monotonic()
+    
+    @property
+    def lock(self) -> threading.RLock:
+        """Held while operations apply; hold it to read the structure consistently"""
+        return self._lock
+    
+    def execute(self, op: str, *args) -> Any:
+        """Apply an operation to the structure and journal it - O(1) I/O"""
+        with self._lock:
+            args = self.adapter.prepare(op, args)
+            result = self.adapter.apply(self.state, op, args)
+            self.seq += 1
+            self._journal.write(encode_record(self.seq, op, args))
+            self._journal.flush()
+            if self.sync:
+                os.fsync(self._journal.fileno())
+            if self._should_compact():
+                self.snapshot(wait=not self.background)
+            return result
+    
+    def journal_size(self) -> int:
+        """Current journal length in bytes"""
+        with self._lock:
+            return self._journal.tell()
+    
+    def _should_compact(self) -> bool:
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return False
+        if self._journal.tell() >= self.max_journal_bytes:
+            return True
+        return self._journal.tell() > 0 and time.monotonic() - self._last_snapshot >= self.max_snapshot_age
+    
+    def snapshot(self, wait: bool = True) -> None:
+        """Write a full snapshot and drop the journal records it covers
+        
+        The structure is serialized under the lock so it is consistent;
+        with ``wait=False`` the file write and journal rewrite happen on a
+        background thread.
+        """
+        thread = self._snapshot_thread
+        if thread is not None and thread.is_alive():
+            if not wait:
+                return
+            thread.join()
+        with self._lock:
+            payload = pickle.dumps(self.state, protocol=pickle.HIGHEST_PROTOCOL)
+            snap_seq = self.seq
+            snap_offset = self._journal.tell()
+            self._last_snapshot = time.monotonic()
+        
+        if wait:
+            self._write_snapshot(payload, snap_seq, snap_offset)
+        else:
+            self._snapshot_thread = threading.Thread(
+                target=self._write_snapshot, args=(payload, snap_seq, snap_offset),
+                name=f"snapshot-{self.adapter.name}", daemon=True
+            )
+            self._snapshot_thread.start()
+    
+    def _write_snapshot(self, payload: bytes, snap_seq: int, snap_offset: int) -> None:
+        try:
+            write_snapshot(self.snapshot_file, payload, snap_seq)
+        except Exception as e:
+            print(f"Error writing snapshot for {self.adapter.name}: {e}")
+            return
+        
+        # Keep only records appended while the snapshot was being written
+        with self._lock:
+            self._journal.flush()
+            tmp = self.journal_file.with_suffix(".journal.tmp")
+            with open(self.journal_file, 'rb') as src, open(tmp, 'wb') as dst:
+                src.seek(snap_offset)
+                dst.write(src.read())
+            self._journal.close()
+            os.replace(tmp, self.journal_file)
+            self._journal = open(self.journal_file, 'ab')
+    
+    def close(self) -> None:
+        """Wait for any running snapshot and close the journal"""
+        thread = self._snapshot_thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            self._journal.close()
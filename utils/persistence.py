@@ -1,14 +1,47 @@
 # Data Persistence Utilities for IntruWatch
 
-import pickle
+import hashlib
 import json
+import os
+import pickle
+import random
+import shutil
+import threading
+import time
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, BinaryIO, Iterator, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
+from .segments import EventSegmentStore
+from .journal import (
+    JournalAdapter,
+    JournalStore,
+    journal_path,
+    last_seq,
+    load_state,
+    snapshot_path,
+    write_snapshot
+)
+
+try:
+    import zstandard
+except ImportError:  # Optional: chunks fall back to zlib
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: backups are only serialized within one process
+    fcntl = None
 
-DATA_DIR = Path("data")
+
+# A standby terminal points this at its replica directory
+DATA_DIR = Path(os.environ.get("INTRUWATCH_DATA_DIR", "data"))
 BACKUP_DIR = Path("backups")
+EVENT_SEGMENT_DIR = "event_segments"
 
 
 def ensure_directories():
@@ -30,11 +63,11 @@ def save_pickle(data: Any, filename: str) -> bool:
         return False
 
 
-def load_pickle(filename: str) -> Optional[Any]:
-    """Load data from pickle file"""
+def load_pickle(filename: str, data_dir: Path = None) -> Optional[Any]:
+    """Load data from pickle file (in DATA_DIR unless data_dir is given)"""
     ensure_directories()
     try:
-        filepath = DATA_DIR / f"{filename}.pkl"
+        filepath = Path(data_dir or DATA_DIR) / f"{filename}.pkl"
         if filepath.exists():
             with open(filepath, 'rb') as f:
                 return pickle.load(f)
@@ -71,44 +104,310 @@ def load_json(filename: str) -> Optional[dict]:
         return None
 
 
-def create_backup(filename: str) -> bool:
-    """Create timestamped backup of data file"""
+# ----------------------------------------------------------------------------
+# Incremental backups
+#
+# Backups are split with content-defined chunking (gear rolling hash), so an
+# edit near the start of a file only changes the chunks around it. Chunks are
+# compressed and stored once under backups/chunks/ by SHA-256 of their
+# content; each backup is a small JSON manifest listing its chunks in order.
+# ----------------------------------------------------------------------------
+
+CHUNK_DIR = BACKUP_DIR / "chunks"
+MANIFEST_DIR = BACKUP_DIR / "manifests"
+BACKUP_LOCK_FILE = BACKUP_DIR / "backup.lock"
+
+BACKUP_RETENTION = 20          # Manifests kept per file by create_backup
+CHUNK_MIN_SIZE = 2 * 1024
+CHUNK_MAX_SIZE = 64 * 1024
+CHUNK_MASK_BITS = 13           # ~8 KB average chunk
+READ_SIZE = 64 * 1024
+
+_GEAR_WINDOW = 64              # Bytes that influence the 64-bit gear hash
+_GEAR_MASK = np.uint64(((1 << CHUNK_MASK_BITS) - 1) << (64 - CHUNK_MASK_BITS))
+_GEAR = np.array([random.Random(0x1E7A + i).getrandbits(64) for i in range(256)], dtype=np.uint64)
+_SCAN_BLOCK = 8 * 1024         # Bytes hashed per vectorized pass
+
+# Held while a backup writes its chunks and manifest, so pruning never
+# collects chunks that only an unfinished manifest will reference
+_BACKUP_LOCK = threading.Lock()
+
+
+@contextmanager
+def _backup_lock():
+    """Serialize backups, pruning and restores across threads and processes
+
+    The thread lock covers this process; an flock on BACKUP_LOCK_FILE
+    covers other processes sharing the backup directory, such as the
+    replicator CLI or a standby terminal. Without fcntl (Windows) only one
+    process may back up a directory at a time.
+    """
+    with _BACKUP_LOCK:
+        if fcntl is None:
+            yield
+            return
+        BACKUP_DIR.mkdir(exist_ok=True)
+        with open(BACKUP_LOCK_FILE, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _compress(data: bytes) -> Tuple[str, bytes]:
+    """Compress a chunk, preferring zstd when it is installed"""
+    if zstandard is not None:
+        return "zst", zstandard.ZstdCompressor(level=3).compress(data)
+    return "zz", zlib.compress(data, 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    """Decompress a chunk written by _compress"""
+    if codec == "zst":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to restore this backup")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _gear_hashes(data: np.ndarray) -> np.ndarray:
+    """Gear hash at every position of a byte array
+
+    h[i] = sum(GEAR[data[i - k]] << k for k < 64) mod 2^64, the value the
+    rolling update h = (h << 1) + GEAR[byte] reaches at i. Built by doubling
+    the summed window, so 64 bytes take six vector passes.
+    """
+    h = _GEAR[data]
+    width = 1
+    while width < _GEAR_WINDOW:
+        h[width:] += h[:-width] << np.uint64(width)     # uint64 wraps mod 2^64
+        width *= 2
+    return h
+
+
+def _find_cut(buf: bytearray) -> int:
+    """Return the length of the next chunk at the start of buf
+
+    buf holds at least CHUNK_MAX_SIZE bytes unless the source is exhausted.
+    """
+    limit = min(len(buf), CHUNK_MAX_SIZE)
+    if limit <= CHUNK_MIN_SIZE:
+        return limit
+    
+    # Scan in blocks so a typical chunk does not hash the whole buffer; each
+    # block starts a window early so its first hashes are complete
+    pos = CHUNK_MIN_SIZE
+    while pos < limit:
+        end = min(pos + _SCAN_BLOCK, limit)
+        start = pos - _GEAR_WINDOW + 1
+        h = _gear_hashes(np.frombuffer(buf, dtype=np.uint8, count=end - start, offset=start))
+        hits = np.flatnonzero((h[_GEAR_WINDOW - 1:] & _GEAR_MASK) == 0)
+        if hits.size:
+            return pos + int(hits[0]) + 1
+        pos = end
+    return limit
+
+
+def _iter_chunks(stream: BinaryIO) -> Iterator[bytes]:
+    """Stream content-defined chunks from a binary file object"""
+    buf = bytearray()
+    eof = False
+    while True:
+        while not eof and len(buf) < CHUNK_MAX_SIZE:
+            block = stream.read(READ_SIZE)
+            if block:
+                buf += block
+            else:
+                eof = True
+        if not buf:
+            return
+        cut = _find_cut(buf)
+        yield bytes(buf[:cut])
+        del buf[:cut]
+
+
+def _chunk_path(digest: str, codec: str) -> Path:
+    return CHUNK_DIR / digest[:2] / f"{digest}.{codec}"
+
+
+def _find_chunk(digest: str) -> Optional[Path]:
+    """Locate a stored chunk regardless of the codec it was written with"""
+    for codec in ("zst", "zz"):
+        path = _chunk_path(digest, codec)
+        if path.exists():
+            return path
+    return None
+
+
+def _store_chunk(chunk: bytes) -> Tuple[str, bool]:
+    """Store a chunk if it is new
+
+    Returns:
+        Tuple of (sha256 hex digest, whether the chunk was written)
+    """
+    digest = hashlib.sha256(chunk).hexdigest()
+    if _find_chunk(digest) is not None:
+        return digest, False
+    
+    codec, payload = _compress(chunk)
+    path = _chunk_path(digest, codec)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp, path)
+    return digest, True
+
+
+def _read_manifest(path: Path) -> dict:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def create_backup(filename: str, keep: Optional[int] = BACKUP_RETENTION) -> bool:
+    """Create an incremental, deduplicated backup of a data file
+
+    Only chunks not already in the chunk store are compressed and written.
+    Older backups beyond ``keep`` are pruned (pass None to keep all).
+    """
     ensure_directories()
     try:
-        source = DATA_DIR / f"{filename}.pkl"
-        if source.exists():
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = BACKUP_DIR / f"{filename}_{timestamp}.pkl"
+        with _backup_lock():
+            source = DATA_DIR / f"{filename}.pkl"
+            if not source.exists():
+                return False
+            
+            file_hash = hashlib.sha256()
+            chunks = []
+            size = 0
+            new_chunks = 0
             with open(source, 'rb') as src:
-                with open(backup_path, 'wb') as dst:
-                    dst.write(src.read())
+                for chunk in _iter_chunks(src):
+                    file_hash.update(chunk)
+                    digest, written = _store_chunk(chunk)
+                    chunks.append(digest)
+                    size += len(chunk)
+                    new_chunks += written
+            
+            created = datetime.now()
+            manifest = {
+                "filename": filename,
+                "created": created.isoformat(),
+                "size": size,
+                "sha256": file_hash.hexdigest(),
+                "new_chunks": new_chunks,
+                "chunks": chunks
+            }
+            manifest_dir = MANIFEST_DIR / filename
+            manifest_dir.mkdir(parents=True, exist_ok=True)
+            manifest_path = manifest_dir / f"{filename}_{created.strftime('%Y%m%d_%H%M%S_%f')}.json"
+            tmp = manifest_path.with_suffix(".tmp")
+            with open(tmp, 'w') as f:
+                json.dump(manifest, f)
+            os.replace(tmp, manifest_path)
+            
+            if keep is not None:
+                _prune_backups(filename, keep)
             return True
-        return False
     except Exception as e:
         print(f"Error creating backup for {filename}: {e}")
         return False
 
 
 def list_backups(filename: str) -> list:
-    """List all backups for a given filename"""
+    """List all backups for a given filename, newest first
+
+    Includes backup manifests and legacy full-copy ``.pkl`` backups.
+    """
     ensure_directories()
-    pattern = f"{filename}_*.pkl"
-    return sorted(BACKUP_DIR.glob(pattern), reverse=True)
+    backups = []
+    manifest_dir = MANIFEST_DIR / filename
+    if manifest_dir.is_dir():
+        with os.scandir(manifest_dir) as entries:
+            backups.extend(Path(e.path) for e in entries if e.name.endswith(".json"))
+    backups.extend(BACKUP_DIR.glob(f"{filename}_*.pkl"))
+    return sorted(backups, key=lambda p: p.name, reverse=True)
+
+
+def prune_backups(filename: str, keep: int = BACKUP_RETENTION) -> int:
+    """Delete all but the newest ``keep`` backup manifests for a file
+
+    Chunks no longer referenced by any manifest are garbage collected;
+    this waits for backups in progress, in this or another process, whose
+    manifests are not written yet.
+
+    Returns:
+        Number of manifests removed
+    """
+    with _backup_lock():
+        return _prune_backups(filename, keep)
+
+
+def _prune_backups(filename: str, keep: int) -> int:
+    """prune_backups for a caller already holding the backup lock"""
+    manifests = [p for p in list_backups(filename) if p.suffix == ".json"]
+    stale = manifests[keep:]
+    if not stale:
+        return 0
+    for path in stale:
+        path.unlink()
+    
+    referenced = set()
+    for path in MANIFEST_DIR.glob("*/*.json"):
+        referenced.update(_read_manifest(path)["chunks"])
+    for chunk_file in CHUNK_DIR.glob("*/*"):
+        if chunk_file.name.split(".")[0] not in referenced:
+            chunk_file.unlink()
+    return len(stale)
 
 
 def restore_backup(backup_path: Path, filename: str) -> bool:
-    """Restore data from a backup file"""
+    """Restore data from a backup manifest (or a legacy full-copy backup)
+
+    Chunks are decompressed and written one at a time, and the result is
+    checked against the manifest hash before replacing the live file. Holds
+    the backup lock, so a concurrent prune cannot delete chunks mid-restore.
+    """
+    ensure_directories()
+    tmp = DATA_DIR / f"{filename}.pkl.restore"
     try:
-        if backup_path.exists():
+        with _backup_lock():
+            backup_path = Path(backup_path)
+            if not backup_path.exists():
+                return False
+            
             dest = DATA_DIR / f"{filename}.pkl"
-            with open(backup_path, 'rb') as src:
-                with open(dest, 'wb') as dst:
-                    dst.write(src.read())
+            
+            if backup_path.suffix != ".json":
+                with open(backup_path, 'rb') as src, open(tmp, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp, dest)
+                return True
+            
+            manifest = _read_manifest(backup_path)
+            file_hash = hashlib.sha256()
+            with open(tmp, 'wb') as dst:
+                for digest in manifest["chunks"]:
+                    chunk_file = _find_chunk(digest)
+                    if chunk_file is None:
+                        raise FileNotFoundError(f"missing chunk {digest}")
+                    codec = chunk_file.suffix.lstrip(".")
+                    with open(chunk_file, 'rb') as f:
+                        chunk = _decompress(codec, f.read())
+                    file_hash.update(chunk)
+                    dst.write(chunk)
+            
+            if file_hash.hexdigest() != manifest["sha256"]:
+                raise ValueError("restored data does not match backup checksum")
+            os.replace(tmp, dest)
             return True
-        return False
     except Exception as e:
         print(f"Error restoring backup: {e}")
         return False
+    finally:
+        # Left over only when the restore failed part-way
+        tmp.unlink(missing_ok=True)
 
 
 # Specific save/load functions for IntruWatch data
@@ -118,46 +417,190 @@ def save_checkins(checkin_list) -> bool:
     return save_pickle(checkin_list, "checkins")
 
 
-def load_checkins():
+def load_checkins(data_dir: Path = None):
     """Load check-in linked list"""
-    return load_pickle("checkins")
+    return load_pickle("checkins", data_dir)
 
 
 def save_logins(login_list) -> bool:
-    """Save login linked list"""
+    """Save operator credential store"""
     return save_pickle(login_list, "logins")
 
 
-def load_logins():
-    """Load login linked list"""
-    return load_pickle("logins")
+def load_logins(data_dir: Path = None):
+    """Load operator credential store, migrating a legacy login linked list"""
+    logins = load_pickle("logins", data_dir)
+    if logins is not None and hasattr(logins, "head"):
+        from data_structures import CredentialStore
+        logins = CredentialStore.from_linked_list(logins)
+    return logins
+
+
+# Journaled stores for structures that change on every interaction
+
+class GuardJournalAdapter(JournalAdapter):
+    """Guard tree journaled as insert(name, guard_id, duty)/delete(guard_id) operations"""
+    name = "guards"
+    
+    def create(self):
+        from data_structures import GuardTree
+        return GuardTree()
+    
+    def migrate(self, state):
+        from data_structures import GuardNode, GuardTree
+        if isinstance(state, GuardNode):
+            # Unbalanced BST pickled before the AVL tree
+            state = GuardTree.from_node(None if state.guard_id is None else state)
+        return state
+
+
+class AlertJournalAdapter(JournalAdapter):
+    """Alert queue journaled as add_alert, acknowledge, resolve, escalate
+    (or escalate_if_pending for timed escalations) and clear operations
+    """
+    name = "alerts"
+    
+    def create(self):
+        from data_structures import AlertSystem
+        return AlertSystem()
+    
+    def prepare(self, op: str, args: tuple) -> tuple:
+        if op == "add_alert" and len(args) < 4:
+            args = tuple(args) + (time.time_ns(),)
+        return args
+
+
+class GraphJournalAdapter(JournalAdapter):
+    """Campus graph journaled as close_path, reopen_path, set_weight and
+    set_capacity operations
+    
+    The graph is built from the campus map (or the built-in campus). When
+    that source changes, it is rebuilt and the operator's changes carried over.
+    """
+    name = "campus_graph"
+    
+    def create(self):
+        from .graph_loader import campus_map_fingerprint, load_campus_graph
+        graph = load_campus_graph()
+        graph.source = campus_map_fingerprint()
+        return graph
+    
+    def migrate(self, state):
+        from .graph_loader import campus_map_fingerprint
+        if state.source == campus_map_fingerprint():
+            return state
+        graph = self.create()
+        graph.carry_changes(state)
+        return graph
+
+
+class EventJournalAdapter(JournalAdapter):
+    """Event log journaled as add_event(data, timestamp) operations
+    
+    Events evicted from the ring buffer spill into segment files under
+    <data dir>/event_segments.
+    """
+    name = "events"
+    
+    def __init__(self, max_size: int = 20, data_dir: Path = None):
+        self.max_size = max_size
+        self.segment_dir = Path(data_dir or DATA_DIR) / EVENT_SEGMENT_DIR
+    
+    def create(self):
+        from data_structures import EventLinkedList
+        return EventLinkedList(max_size=self.max_size, overflow=EventSegmentStore(self.segment_dir))
+    
+    def migrate(self, state):
+        state.overflow = EventSegmentStore(self.segment_dir)
+        return state
+    
+    def prepare(self, op: str, args: tuple) -> tuple:
+        if op == "add_event" and len(args) < 2:
+            args = tuple(args) + (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+        return args
+
+
+def open_store(adapter: JournalAdapter, **policy) -> JournalStore:
+    """Open a journaled store in the data directory
+    
+    Keyword arguments (max_journal_bytes, max_snapshot_age, background,
+    sync) set the compaction policy.
+    """
+    ensure_directories()
+    return JournalStore(adapter, DATA_DIR, **policy)
+
+
+def open_guard_store(**policy) -> JournalStore:
+    """Open the journaled guard BST"""
+    return open_store(GuardJournalAdapter(), **policy)
+
+
+def open_alert_store(**policy) -> JournalStore:
+    """Open the journaled alert system"""
+    return open_store(AlertJournalAdapter(), **policy)
+
+
+def open_graph_store(**policy) -> JournalStore:
+    """Open the journaled campus graph"""
+    return open_store(GraphJournalAdapter(), **policy)
+
+
+def open_event_store(max_size: int = 20, **policy) -> JournalStore:
+    """Open the journaled event log"""
+    return open_store(EventJournalAdapter(max_size), **policy)
+
+
+def _save_journaled(state, filename: str) -> bool:
+    """Write a full snapshot that supersedes the current journal"""
+    ensure_directories()
+    try:
+        seq = last_seq(journal_path(DATA_DIR, filename))
+        write_snapshot(snapshot_path(DATA_DIR, filename), pickle.dumps(state), seq)
+        return True
+    except Exception as e:
+        print(f"Error saving {filename}: {e}")
+        return False
+
+
+def _load_journaled(adapter: JournalAdapter, data_dir: Path = None):
+    """Rebuild a structure from its snapshot plus journal, or None if absent"""
+    ensure_directories()
+    data_dir = Path(data_dir or DATA_DIR)
+    try:
+        if not (snapshot_path(data_dir, adapter.name).exists() or
+                journal_path(data_dir, adapter.name).exists()):
+            return None
+        return load_state(adapter, data_dir)[0]
+    except Exception as e:
+        print(f"Error loading {adapter.name}: {e}")
+        return None
 
 
 def save_guards(guard_tree) -> bool:
     """Save guard BST"""
-    return save_pickle(guard_tree, "guards")
+    return _save_journaled(guard_tree, "guards")
 
 
-def load_guards():
+def load_guards(data_dir: Path = None):
     """Load guard BST"""
-    return load_pickle("guards")
+    return _load_journaled(GuardJournalAdapter(), data_dir)
 
 
 def save_alerts(alert_system) -> bool:
     """Save alert system"""
-    return save_pickle(alert_system, "alerts")
+    return _save_journaled(alert_system, "alerts")
 
 
-def load_alerts():
+def load_alerts(data_dir: Path = None):
     """Load alert system"""
-    return load_pickle("alerts")
+    return _load_journaled(AlertJournalAdapter(), data_dir)
 
 
 def save_events(event_list) -> bool:
     """Save event log"""
-    return save_pickle(event_list, "events")
+    return _save_journaled(event_list, "events")
 
 
-def load_events():
+def load_events(data_dir: Path = None):
     """Load event log"""
-    return load_pickle("events")
+    return _load_journaled(EventJournalAdapter(data_dir=data_dir), data_dir)
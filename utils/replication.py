@@ -0,0 +1,272 @@
+# Hot-Standby Replication for IntruWatch
+#
+# A JournalReplicator tails the primary's journals and appends every new
+# record, in sequence order and CRC-checked, to the same journal in a
+# replica directory (which may be a mounted share). When the primary
+# compacts, its new snapshot is copied and checksum-verified, and replica
+# journal records it covers are dropped. The replica directory is always a
+# valid data directory, so a standby terminal started with
+# INTRUWATCH_DATA_DIR pointing at it loads through the normal load_*
+# functions and can take over without a restore.
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .journal import (
+    encode_record,
+    iter_journal,
+    journal_path,
+    read_snapshot,
+    snapshot_path
+)
+from .warmstart import file_fingerprint
+
+
+JOURNALED_FILES = ("guards", "alerts", "events", "campus_graph")
+SNAPSHOT_FILES = ("logins", "checkins")
+SEGMENT_DIRS = ("event_segments",)
+
+
+def _copy_verified(source: Path, dest: Path) -> None:
+    """Copy a file atomically and verify the copy's SHA-256"""
+    digest = hashlib.sha256()
+    tmp = dest.with_suffix(dest.suffix + ".tmp")
+    with open(source, 'rb') as src, open(tmp, 'wb') as dst:
+        while True:
+            block = src.read(64 * 1024)
+            if not block:
+                break
+            digest.update(block)
+            dst.write(block)
+        dst.flush()
+        os.fsync(dst.fileno())
+    
+    check = hashlib.sha256()
+    with open(tmp, 'rb') as f:
+        for block in iter(lambda: f.read(64 * 1024), b""):
+            check.update(block)
+    if check.digest() != digest.digest():
+        tmp.unlink()
+        raise IOError(f"checksum mismatch copying {source.name}")
+    os.replace(tmp, dest)
+
+
+def _journal_position(data_dir: Path, name: str) -> tuple:
+    """Last sequence number and record time held by a data directory"""
+    seq, timestamp = 0, None
+    for _, record_seq, record_time, _, _ in iter_journal(journal_path(data_dir, name)):
+        seq, timestamp = record_seq, record_time
+    if seq == 0:
+        seq = read_snapshot(snapshot_path(data_dir, name))[1]
+    return seq, timestamp
+
+
+def replication_lag(source_dir: Path, replica_dir: Path,
+                    names: Iterable[str] = JOURNALED_FILES) -> Dict[str, dict]:
+    """Compare journal positions of a primary and its replica
+    
+    Works from the files alone, so a standby (or the command line) can
+    report lag without a replicator; this reads every journal in full.
+    """
+    lag = {}
+    for name in names:
+        primary_seq, primary_time = _journal_position(Path(source_dir), name)
+        replica_seq, replica_time = _journal_position(Path(replica_dir), name)
+        seconds = 0.0
+        if primary_seq > replica_seq and primary_time is not None:
+            seconds = max(0.0, primary_time - (replica_time or primary_time))
+        lag[name] = {
+            "Primary Seq": primary_seq,
+            "Replica Seq": replica_seq,
+            "Records Behind": max(0, primary_seq - replica_seq),
+            "Seconds Behind": round(seconds, 3)
+        }
+    return lag
+
+
+class JournalReplicator:
+    """Ships journals from a primary data directory to a replica directory"""
+    
+    def __init__(self, source_dir: Path, replica_dir: Path,
+                 names: Iterable[str] = JOURNALED_FILES,
+                 snapshot_files: Iterable[str] = SNAPSHOT_FILES,
+                 segment_dirs: Iterable[str] = SEGMENT_DIRS):
+        self.source_dir = Path(source_dir)
+        self.replica_dir = Path(replica_dir)
+        self.replica_dir.mkdir(parents=True, exist_ok=True)
+        self.names = tuple(names)
+        self.snapshot_files = tuple(snapshot_files)
+        self.segment_dirs = tuple(segment_dirs)
+        
+        self._offsets: Dict[str, int] = {name: 0 for name in self.names}
+        self._inodes: Dict[str, int] = {}
+        self._seqs: Dict[str, int] = {}
+        self._times: Dict[str, Optional[float]] = {}    # Time of the last record replicated
+        for name in self.names:
+            self._seqs[name], self._times[name] = _journal_position(self.replica_dir, name)
+        self._primary: Dict[str, tuple] = {}    # Last (seq, time) seen on the primary
+        self._fingerprints: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_sync: Optional[float] = None
+    
+    def _sync_snapshot(self, name: str) -> None:
+        """Copy the primary snapshot after it changes and trim the replica journal"""
+        source = snapshot_path(self.source_dir, name)
+        fingerprint = file_fingerprint(source)
+        if fingerprint is None or fingerprint == self._fingerprints.get(name):
+            return
+        
+        dest = snapshot_path(self.replica_dir, name)
+        _copy_verified(source, dest)
+        self._fingerprints[name] = fingerprint
+        snap_seq = read_snapshot(dest)[1]
+        
+        replica_journal = journal_path(self.replica_dir, name)
+        tmp = replica_journal.with_suffix(".journal.tmp")
+        with open(tmp, 'wb') as f:
+            for _, seq, timestamp, op, args in iter_journal(replica_journal):
+                if seq > snap_seq:
+                    f.write(encode_record(seq, op, args, timestamp))
+        os.replace(tmp, replica_journal)
+        self._seqs[name] = max(self._seqs[name], snap_seq)
+        if snap_seq > self._primary.get(name, (0, None))[0]:
+            self._primary[name] = (snap_seq, None)
+    
+    def _sync_journal(self, name: str) -> int:
+        """Append primary records newer than the replica's position"""
+        source = journal_path(self.source_dir, name)
+        if not source.exists():
+            return 0
+        stat = source.stat()
+        if stat.st_ino != self._inodes.get(name) or stat.st_size < self._offsets[name]:
+            # The primary compacted and replaced its journal
+            self._inodes[name] = stat.st_ino
+            self._offsets[name] = 0
+        
+        applied = 0
+        with open(journal_path(self.replica_dir, name), 'ab') as replica:
+            for end, seq, timestamp, op, args in iter_journal(source, self._offsets[name]):
+                self._primary[name] = (seq, timestamp)
+                if seq > self._seqs[name] + 1:
+                    # Records were compacted away before we saw them;
+                    # wait for the snapshot that covers them
+                    break
+                self._offsets[name] = end
+                if seq <= self._seqs[name]:
+                    continue
+                replica.write(encode_record(seq, op, args, timestamp))
+                self._seqs[name] = seq
+                self._times[name] = timestamp
+                applied += 1
+            replica.flush()
+            os.fsync(replica.fileno())
+        return applied
+    
+    def _sync_segments(self, directory: str) -> None:
+        """Copy append-only segment files that changed since the last pass"""
+        source_dir = self.source_dir / directory
+        if not source_dir.is_dir():
+            return
+        dest_dir = self.replica_dir / directory
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        for source in sorted(source_dir.iterdir()):
+            key = f"{directory}/{source.name}"
+            fingerprint = file_fingerprint(source)
+            if fingerprint is not None and fingerprint != self._fingerprints.get(key):
+                _copy_verified(source, dest_dir / source.name)
+                self._fingerprints[key] = fingerprint
+    
+    def sync_once(self) -> Dict[str, int]:
+        """Run one replication pass
+        
+        Returns:
+            Number of journal records applied per structure
+        """
+        with self._lock:
+            applied = {}
+            for name in self.names:
+                self._sync_snapshot(name)
+                applied[name] = self._sync_journal(name)
+            for name in self.snapshot_files:
+                source = self.source_dir / f"{name}.pkl"
+                fingerprint = file_fingerprint(source)
+                if fingerprint is not None and fingerprint != self._fingerprints.get(name):
+                    _copy_verified(source, self.replica_dir / f"{name}.pkl")
+                    self._fingerprints[name] = fingerprint
+            for directory in self.segment_dirs:
+                self._sync_segments(directory)
+            self.last_sync = time.time()
+            return applied
+    
+    def lag(self) -> Dict[str, dict]:
+        """Records and seconds the replica is behind, per structure
+        
+        Read from the positions tracked by the last pass, so no files are
+        touched; the primary position is as of that pass.
+        """
+        with self._lock:
+            lag = {}
+            for name in self.names:
+                replica_seq, replica_time = self._seqs[name], self._times[name]
+                primary_seq, primary_time = self._primary.get(name, (replica_seq, replica_time))
+                primary_seq = max(primary_seq, replica_seq)
+                seconds = 0.0
+                if primary_seq > replica_seq and primary_time is not None:
+                    seconds = max(0.0, primary_time - (replica_time or primary_time))
+                lag[name] = {
+                    "Primary Seq": primary_seq,
+                    "Replica Seq": replica_seq,
+                    "Records Behind": primary_seq - replica_seq,
+                    "Seconds Behind": round(seconds, 3)
+                }
+            return lag
+    
+    def start(self, interval: float = 1.0) -> None:
+        """Replicate continuously on a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.sync_once()
+                except Exception as e:
+                    print(f"Replication error: {e}")
+                self._stop.wait(interval)
+        
+        self._thread = threading.Thread(target=run, name="journal-replicator", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop background replication, e.g. before the standby takes over"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Replicate IntruWatch journals to a standby directory")
+    parser.add_argument("source", help="Primary data directory")
+    parser.add_argument("replica", help="Replica data directory")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between passes")
+    cli_args = parser.parse_args()
+    
+    replicator = JournalReplicator(cli_args.source, cli_args.replica)
+    try:
+        while True:
+            replicator.sync_once()
+            behind = {name: info["Records Behind"] for name, info in replicator.lag().items()}
+            print(f"{time.strftime('%H:%M:%S')} lag: {behind}")
+            time.sleep(cli_args.interval)
+    except KeyboardInterrupt:
+        pass
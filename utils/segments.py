@@ -0,0 +1,86 @@
+# Append-Only Event Segments for IntruWatch
+#
+# Events evicted from the in-memory ring buffer are appended to NDJSON
+# segment files of a fixed number of events each. An event's global index
+# determines its segment, so any page of history is read from at most a
+# couple of files without scanning the rest.
+
+import json
+from pathlib import Path
+from typing import List, Tuple
+
+
+class EventSegmentStore:
+    """Overflow store for EventLinkedList"""
+    
+    def __init__(self, directory: Path, segment_size: int = 1000):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self._handle = None
+        self._handle_segment = None
+        self.next_index = self._scan_next_index()
+    
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"events_{segment:08d}.ndjson"
+    
+    def _scan_next_index(self) -> int:
+        """Index after the last stored event (only the newest segment is read)"""
+        segments = sorted(self.directory.glob("events_*.ndjson"))
+        if not segments:
+            return 0
+        next_index = int(segments[-1].stem.split("_")[1]) * self.segment_size
+        for index, _, _ in self._read_segment(segments[-1]):
+            next_index = index + 1
+        return next_index
+    
+    @staticmethod
+    def _read_segment(path: Path):
+        with open(path, 'r', encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn final line from a crash mid-append
+                    continue
+                yield record["i"], record["t"], record["e"]
+    
+    def append(self, index: int, node) -> None:
+        """Persist an evicted event - O(1)
+        
+        Indexes already stored are skipped, so replaying a journal that
+        evicts the same events again does not duplicate them.
+        """
+        if index < self.next_index:
+            return
+        segment = index // self.segment_size
+        if segment != self._handle_segment:
+            if self._handle is not None:
+                self._handle.close()
+            self._handle = open(self._segment_path(segment), 'a', encoding="utf-8")
+            self._handle_segment = segment
+        self._handle.write(json.dumps({"i": index, "t": node.timestamp, "e": node.data}) + "\n")
+        self._handle.flush()
+        self.next_index = index + 1
+    
+    def read(self, start: int, stop: int) -> List[Tuple[str, str]]:
+        """Events with start <= index < stop, oldest first, as (data, timestamp)"""
+        events = []
+        if start >= stop:
+            return events
+        for segment in range(start // self.segment_size, (stop - 1) // self.segment_size + 1):
+            path = self._segment_path(segment)
+            if not path.exists():
+                continue
+            events.extend(
+                (data, timestamp)
+                for index, timestamp, data in self._read_segment(path)
+                if start <= index < stop
+            )
+        return events
+    
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._handle_segment = None
@@ -0,0 +1,301 @@
+# Warm-Start Snapshot for IntruWatch
+#
+# All core state needed at startup is kept in one file, data/warmstart.bin:
+#
+#   magic (8 bytes) | version (u32) | table length (u32) | pickled table | sections
+#
+# The table maps each section name to (offset, length, crc32, fingerprint).
+# The file is memory-mapped and a section is unpickled only when it is
+# requested and its fingerprint still matches the source it was built from;
+# otherwise the section is rebuilt from the source and the file rewritten.
+# Sections nobody has requested are carried over byte for byte.
+
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .persistence import DATA_DIR
+
+
+WARM_SNAPSHOT_FILE = DATA_DIR / "warmstart.bin"
+WARM_SNAPSHOT_MAGIC = b"IWWARM\x00\x00"
+WARM_SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<8sII")
+
+
+def file_fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    """Cheap change detector for a source file: (size, mtime in ns)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_warm_snapshot(path: Path, sections: Dict[str, Tuple[Any, Any]],
+                        raw: Dict[str, Tuple[Any, bytes]] = None) -> None:
+    """Write a warm-start snapshot
+    
+    Args:
+        path: Destination file
+        sections: Section name -> (fingerprint, value)
+        raw: Section name -> (fingerprint, already pickled value)
+    """
+    path = Path(path)
+    payloads = dict(raw or {})
+    for name, (fingerprint, value) in sections.items():
+        payloads[name] = (fingerprint, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    
+    # Offsets depend on the table size, so lay out relative to the data start
+    table = {}
+    offset = 0
+    for name, (fingerprint, data) in payloads.items():
+        table[name] = (offset, len(data), zlib.crc32(data), fingerprint)
+        offset += len(data)
+    table_bytes = pickle.dumps(table, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(WARM_SNAPSHOT_MAGIC, WARM_SNAPSHOT_VERSION, len(table_bytes)))
+        f.write(table_bytes)
+        for _, data in payloads.values():
+            f.write(data)
+    os.replace(tmp, path)
+
+
+class WarmSnapshot:
+    """Read-only, memory-mapped view of a warm-start snapshot"""
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+        self._map = None
+        self._table: Dict[str, tuple] = {}
+        self._data_start = 0
+        self._open()
+    
+    def _open(self) -> None:
+        try:
+            self._file = open(self.path, 'rb')
+            if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+                self.close()
+                return
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            self.close()
+            return
+        
+        magic, version, table_len = _HEADER.unpack_from(self._map, 0)
+        if magic != WARM_SNAPSHOT_MAGIC or version != WARM_SNAPSHOT_VERSION:
+            self.close()
+            return
+        start = _HEADER.size
+        self._table = pickle.loads(self._map[start:start + table_len])
+        self._data_start = start + table_len
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._table
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table)
+    
+    def fingerprint(self, name: str) -> Any:
+        return self._table[name][3]
+    
+    def raw(self, name: str) -> bytes:
+        """Pickled bytes of one section, copied out of the mapping"""
+        offset, length, _, _ = self._table[name]
+        start = self._data_start + offset
+        return self._map[start:start + length]
+    
+    def get(self, name: str) -> Any:
+        """Unpickle one section straight from the mapping"""
+        offset, length, crc, _ = self._table[name]
+        start = self._data_start + offset
+        view = memoryview(self._map)[start:start + length]
+        try:
+            if zlib.crc32(view) != crc:
+                raise ValueError(f"warm-start section {name} is corrupt")
+            return pickle.loads(view)
+        finally:
+            view.release()
+    
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._table = {}
+
+
+class WarmStartLoader:
+    """Loads startup sections from the warm snapshot, rebuilding stale ones
+    
+    Every ``load`` call is timed so startup cost can be broken down per
+    section. Call ``save`` after loading to refresh the snapshot if anything
+    had to be rebuilt; it captures only the sections loaded since the last
+    save and copies the rest from the current file.
+    """
+    
+    def __init__(self, path: Path = WARM_SNAPSHOT_FILE):
+        self.path = Path(path)
+        self._snapshot: Optional[WarmSnapshot] = None
+        self._sections: Dict[str, tuple] = {}   # Loaded since the last save
+        self._stale = False
+        self.timings: List[dict] = []
+    
+    def _view(self) -> WarmSnapshot:
+        if self._snapshot is None:
+            self._snapshot = WarmSnapshot(self.path)
+        return self._snapshot
+    
+    def load(self, name: str, fingerprint: Any, build: Callable[[], Any],
+             restore: Callable[[Any], Any] = None,
+             capture: Callable[[Any], Any] = None) -> Any:
+        """Return a section's value, from the snapshot when it is fresh
+        
+        Args:
+            name: Section name
+            fingerprint: Value identifying the source state (e.g. file_fingerprint)
+            build: Builds the section value from its source
+            restore: Optional hook turning a snapshot value into the live object
+            capture: Optional hook turning the live object back into the
+                value to snapshot, evaluated when the snapshot is saved
+        """
+        started = time.perf_counter()
+        source = "rebuilt"
+        value = None
+        snapshot = self._view()
+        if name in snapshot and snapshot.fingerprint(name) == fingerprint:
+            try:
+                value = snapshot.get(name)
+                source = "snapshot"
+            except Exception as e:
+                print(f"Error reading warm-start section {name}: {e}")
+        if source == "rebuilt":
+            value = build()
+            self._stale = True
+        
+        result = restore(value) if restore else value
+        self._sections[name] = (fingerprint, value, result, capture)
+        self.timings.append({
+            "Section": name,
+            "Source": source,
+            "Load (ms)": round((time.perf_counter() - started) * 1000, 3)
+        })
+        return result
+    
+    def save(self, force: bool = False) -> bool:
+        """Rewrite the snapshot if any section was rebuilt"""
+        if not (self._stale or force):
+            return False
+        try:
+            snapshot = self._view()
+            carried = {
+                name: (snapshot.fingerprint(name), snapshot.raw(name))
+                for name in snapshot if name not in self._sections
+            }
+            sections = {
+                name: (fingerprint, capture(live) if capture else value)
+                for name, (fingerprint, value, live, capture) in self._sections.items()
+            }
+            snapshot.close()
+            self._snapshot = None
+            write_warm_snapshot(self.path, sections, carried)
+            self._sections = {}
+            self._stale = False
+            return True
+        except Exception as e:
+            print(f"Error writing warm-start snapshot: {e}")
+            return False
+
+
+class LazySections(Mapping):
+    """Read-only mapping whose values are loaded on first access
+    
+    Each section is loaded through ``loader`` once, and the snapshot is
+    saved straight after if the section had to be rebuilt.
+    """
+    
+    def __init__(self, loader: WarmStartLoader, sections: Dict[str, Callable[[], Any]]):
+        self.loader = loader
+        self._sections = sections
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, name: str) -> Any:
+        with self._lock:
+            if name not in self._values:
+                self._values[name] = self._sections[name]()
+                self.loader.save()
+            return self._values[name]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+    
+    def __len__(self) -> int:
+        return len(self._sections)
+    
+    def loaded(self, name: str) -> bool:
+        return name in self._values
+
+
+
+def load_core_state(path: Path = WARM_SNAPSHOT_FILE) -> Tuple[LazySections, WarmStartLoader]:
+    """Core startup state, loaded section by section from the warm snapshot
+    
+    Sections: logins, check-ins and the journaled guard, alert, campus
+    graph and event stores. Nothing is read until a section is first
+    accessed, so pages that never touch e.g. the campus graph never pay for
+    it. Stores are re-opened at the journal position recorded in the
+    snapshot, so only newer journal records are replayed.
+    
+    Returns:
+        Tuple of (lazy state mapping, loader with per-section timings)
+    """
+    from data_structures import CheckInLinkedList, CredentialStore
+    from .journal import load_state, snapshot_path
+    from .persistence import (
+        AlertJournalAdapter, EventJournalAdapter, GraphJournalAdapter, GuardJournalAdapter,
+        load_checkins, load_logins, open_store
+    )
+    
+    loader = WarmStartLoader(path)
+    sections = {
+        "login_list": lambda: loader.load(
+            "logins", file_fingerprint(DATA_DIR / "logins.pkl"),
+            lambda: load_logins() or CredentialStore()
+        ),
+        "checkin_list": lambda: loader.load(
+            "checkins", file_fingerprint(DATA_DIR / "checkins.pkl"),
+            lambda: load_checkins() or CheckInLinkedList()
+        )
+    }
+    
+    stores = (
+        ("guard_store", GuardJournalAdapter()),
+        ("alert_store", AlertJournalAdapter()),
+        # Rebuilt from the campus map by the adapter when the map changes
+        ("graph_store", GraphJournalAdapter()),
+        ("event_store", EventJournalAdapter(max_size=20))
+    )
+    for key, adapter in stores:
+        sections[key] = lambda a=adapter: loader.load(
+            a.name, file_fingerprint(snapshot_path(DATA_DIR, a.name)),
+            lambda: load_state(a, DATA_DIR)[:2],
+            restore=lambda value: open_store(a, initial=value),
+            capture=lambda store: (store.state, store.seq)
+        )
+    
+    return LazySections(loader, sections), loader